@@ -4,6 +4,9 @@ import json
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
+from cleaned_store import CleanedDataStore, default_store_root
+from dates import day_numbers_to_datetimes
+from repo_paths import DATA_DIR
 
 class AadhaarAnalyticsEngine:
     """
@@ -11,8 +14,9 @@ class AadhaarAnalyticsEngine:
     Analyzes nationwide Aadhaar data to identify patterns, trends, and generate policy recommendations
     """
     
-    def __init__(self, data_path="data/aadhaar_data.json"):
+    def __init__(self, data_path=DATA_DIR / "aadhaar_data.json", store_root=None):
         self.data_path = Path(data_path)
+        self.store = CleanedDataStore(store_root or default_store_root())
         self.load_data()
         
     def load_data(self):
@@ -22,14 +26,30 @@ class AadhaarAnalyticsEngine:
         
         self.summary = data['summary']
         self.states = pd.DataFrame(data['states'])
+        # Ratios are null for states without classified pincodes
+        self.states[['ruralRatio', 'urbanRatio']] = self.states[['ruralRatio', 'urbanRatio']].astype('float64')
         self.districts = pd.DataFrame(data['districts'])
         self.time_series = pd.DataFrame(data['timeSeries'])
         
         # Convert date column
         self.time_series['date'] = pd.to_datetime(self.time_series['date'])
         
+        # The JSON only carries the last 90 days; use the full daily history when
+        # the cleaned store is available, reading just the columns needed
+        if self.store.exists('enrolment'):
+            self.time_series = self.load_store_time_series()
+        
         print(f"✓ Loaded data: {len(self.states)} states, {len(self.districts)} districts")
     
+    def load_store_time_series(self):
+        """Daily national enrolments from the cleaned store"""
+        age_cols = ['age_0_5', 'age_5_17', 'age_18_greater']
+        enrol = self.store.read('enrolment', columns=['date'] + age_cols)
+        
+        daily = enrol.groupby('date')[age_cols].sum().sum(axis=1)
+        print(f"✓ Loaded {len(daily)} days of enrolments from cleaned store")
+        return pd.DataFrame({'date': day_numbers_to_datetimes(daily.index), 'enrolments': daily.to_numpy()})
+    
     def compute_saturation_levels(self):
         """Compute Aadhaar saturation by age groups"""
         print("\n" + "="*80)
@@ -124,8 +144,9 @@ class AadhaarAnalyticsEngine:
         print("="*80)
         
         # Calculate weighted rural/urban ratios
-        total_rural = (self.states['ruralRatio'] * self.states['enrolments']).sum() / self.states['enrolments'].sum()
-        total_urban = 100 - total_rural
+        rated = self.states.dropna(subset=['ruralRatio'])
+        total_rural = (rated['ruralRatio'] * rated['enrolments']).sum() / max(rated['enrolments'].sum(), 1)
+        total_urban = 100 - total_rural if len(rated) else 0
         
         # Identify states with significant variance
         high_rural = self.states[self.states['ruralRatio'] > 75].sort_values('enrolments', ascending=False)
@@ -223,9 +244,11 @@ class AadhaarAnalyticsEngine:
         for idx, row in critical_hubs.head(10).iterrows():
             print(f"   {row['district']}, {row['state']}: {row['enrolments']:,} enrolments")
         
+        # Districts without coordinates carry null, not NaN, into the JSON report
+        top_hubs = critical_hubs.head(10).astype(object)
         return {
             "cluster_distribution": self.districts['cluster'].value_counts().to_dict(),
-            "critical_hubs": critical_hubs.head(10).to_dict('records')
+            "critical_hubs": top_hubs.where(top_hubs.notna(), None).to_dict('records')
         }
     
     def generate_state_recommendations(self):
@@ -307,7 +330,7 @@ class AadhaarAnalyticsEngine:
         }
         
         # Save report
-        output_path = Path("data/analytics_report.json")
+        output_path = DATA_DIR / "analytics_report.json"
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(report, f, indent=2, ensure_ascii=False)
         
@@ -0,0 +1,131 @@
+import json
+import os
+import shutil
+import pandas as pd
+from pathlib import Path
+from urllib.parse import unquote
+from dates import day_numbers_to_months
+from repo_paths import REPO_ROOT
+
+# Explicit compact dtypes for every column the store may hold. Pincodes and
+# counts are nullable: a blank cell is stored as missing, which sums like 0
+# and classifies as an unknown pincode, as in the other processing modes
+STORE_DTYPES = {
+    'date': 'int32',  # Day number, see dates.py
+    'district': 'category',
+    'pincode': 'Int32',
+    'age_0_5': 'Int32',
+    'age_5_17': 'Int32',
+    'age_18_greater': 'Int32',
+    'demo_age_5_17': 'Int32',
+    'demo_age_17_': 'Int32',
+    'bio_age_5_17': 'Int32',
+    'bio_age_17_': 'Int32',
+}
+
+# Hive-style partition columns, outermost first
+PARTITION_COLS = ['state', 'month']
+
+# Cleaning counts of a dataset, kept next to its partitions. Parquet readers
+# skip files starting with '_'
+STATS_FILE = '_cleaning.json'
+
+
+class CleanedDataStore:
+    """
+    Canonical cleaned Aadhaar records, written once per refresh as Parquet
+    partitioned by state and month (<root>/<dataset>/state=.../month=...).
+    Readers select only the columns and partitions they need.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def dataset_path(self, data_type):
+        return self.root / data_type
+
+    def exists(self, data_type):
+        """True if the dataset has been written to the store"""
+        return self.dataset_path(data_type).is_dir()
+
+    def begin(self, data_type):
+        """Start rewriting a dataset; shards are written into a staging directory"""
+        staging = self.root / f".{data_type}.staging"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        return staging
+
+    def write_shard(self, staging, df):
+        """Append the cleaned rows of one shard to a staging directory"""
+        if df is None or df.empty:
+            return
+
+        df = df.copy()
+        for col, dtype in STORE_DTYPES.items():
+            if col in df.columns:
+                df[col] = df[col].astype(dtype)
+        df['state'] = df['state'].astype(str)
+        df['month'] = day_numbers_to_months(df['date'])
+
+        df.to_parquet(staging, partition_cols=PARTITION_COLS, index=False)
+
+    def write_stats(self, staging, stats):
+        """Record the cleaning counts (rows read, written, dropped) of a staged dataset"""
+        with open(Path(staging) / STATS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=2)
+
+    def stats(self, data_type):
+        """Cleaning counts recorded when a dataset was written, {} if there are none"""
+        path = self.dataset_path(data_type) / STATS_FILE
+        if not path.exists():
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def commit(self, data_type, staging):
+        """Swap a fully written staging directory in place of the live dataset"""
+        target = self.dataset_path(data_type)
+        retired = self.root / f".{data_type}.retired"
+        shutil.rmtree(retired, ignore_errors=True)
+        if target.exists():
+            os.replace(target, retired)
+        os.replace(staging, target)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    def read(self, data_type, columns=None, states=None, months=None):
+        """
+        Read a dataset, loading only `columns` and the partitions for
+        `states` / `months` (lists of canonical names and 'YYYY-MM' strings).
+        """
+        if not self.exists(data_type):
+            return None
+
+        filters = []
+        if states is not None:
+            filters.append(('state', 'in', list(states)))
+        if months is not None:
+            filters.append(('month', 'in', list(months)))
+
+        df = pd.read_parquet(
+            self.dataset_path(data_type),
+            columns=columns,
+            filters=filters or None,
+        )
+
+        # Categories from different files arrive in file order; sort them so
+        # grouped output is ordered the same as for plain string columns
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].cat.set_categories(sorted(df[col].cat.categories))
+        return df
+
+    def states(self, data_type):
+        """Canonical state names present in a dataset (from partition names only)"""
+        if not self.exists(data_type):
+            return []
+        return sorted(unquote(p.name.split('=', 1)[1]) for p in self.dataset_path(data_type).glob('state=*'))
+
+
+def default_store_root():
+    """Location of the store shared by every offline script"""
+    return REPO_ROOT / 'cleaned_store'
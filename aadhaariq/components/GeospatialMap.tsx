@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { translations } from '../translations';
 import { Language, AadhaarData } from '../types';
 import { INDIA_STATES_DATA } from '../data/realData';
@@ -18,10 +18,10 @@ interface DistrictData {
   anomaly_score: number;
 }
 
-interface AllDistrictData {
-  [state: string]: {
-    [district: string]: DistrictData;
-  };
+// One district as returned by /api/districts/bbox
+interface DistrictRecord extends DistrictData {
+  state: string;
+  district: string;
 }
 
 interface StateCentroid {
@@ -40,6 +40,22 @@ interface StateCoordinates {
   [state: string]: StateCentroid;
 }
 
+// Lookup key for a state name, so the assets' upper-case keys (older files
+// spell some states differently, e.g. "THE DADRA ... DAMAN AND DIU") match the
+// names in the dashboard data
+const stateKey = (name: string): string =>
+  name.toUpperCase().replace(/&/g, ' AND ').replace(/[^0-9A-Z]+/g, ' ').trim().replace(/^THE /, '');
+
+// Static copies of the map assets, used when the API is not reachable (e.g. a
+// static build deployed without the backend)
+const STATIC_ASSETS = '/assets';
+
+const fetchJson = (url: string, init?: RequestInit) =>
+  fetch(url, init).then(res => {
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    return res.json();
+  });
+
 interface MapProps {
   lang: Language;
   selectedState?: string | null;
@@ -49,26 +65,22 @@ interface MapProps {
 const GeospatialMap: React.FC<MapProps> = ({ lang, selectedState, onSelect }) => {
   const t = translations[lang];
   const [viewMode, setViewMode] = useState<'states' | 'districts'>('states');
-  const [districtData, setDistrictData] = useState<AllDistrictData>({});
+  const [districtRecords, setDistrictRecords] = useState<DistrictRecord[]>([]);
   const [stateCoordinates, setStateCoordinates] = useState<StateCoordinates>({});
   const [currentStateForDistricts, setCurrentStateForDistricts] = useState<string | null>(null);
   const [mapMode, setMapMode] = useState<'activity' | 'saturation'>('activity');
   const [saturationData, setSaturationData] = useState<any[]>([]);
 
-  // Load district data and state centroids
+  // Load state centroids and saturation data
   useEffect(() => {
-    // Load state centroids
-    fetch('/assets/state_centroids.json')
-      .then(res => res.json())
-      .then(setStateCoordinates)
+    // Load state centroids, from the static asset if the API is unavailable
+    fetchJson(`${API_BASE_URL}/api/assets/state_centroids.json`)
+      .catch(() => fetchJson(`${STATIC_ASSETS}/state_centroids.json`))
+      .then((centroids: StateCoordinates) => setStateCoordinates(
+        Object.fromEntries(Object.entries(centroids).map(([name, centroid]) => [stateKey(name), centroid]))
+      ))
       .catch(err => console.error('Failed to load state centroids:', err));
 
-    // Load district data
-    fetch('/assets/district_data.json')
-      .then(res => res.json())
-      .then(setDistrictData)
-      .catch(err => console.error('Failed to load district data:', err));
-
     // Load saturation data
     fetch(`${API_BASE_URL}/api/ml/saturation`)
       .then(res => res.json())
@@ -79,11 +91,66 @@ const GeospatialMap: React.FC<MapProps> = ({ lang, selectedState, onSelect }) =>
       });
   }, []);
 
+  // district_data.json, fetched once if the API is unavailable
+  const staticDistricts = useRef<Promise<DistrictRecord[]> | null>(null);
+
+  // The same answer as /api/districts/bbox, filtered from the static asset
+  const staticDistrictsWithin = (latMin: number, latMax: number, lngMin: number, lngMax: number) => {
+    if (!staticDistricts.current) {
+      staticDistricts.current = fetchJson(`${STATIC_ASSETS}/district_data.json`)
+        .then((byState: { [state: string]: { [district: string]: DistrictData } }) =>
+          Object.entries(byState).flatMap(([state, districts]) =>
+            Object.entries(districts).map(([district, data]) => ({ ...data, state, district }))
+          ))
+        .catch(err => {
+          staticDistricts.current = null;
+          throw err;
+        });
+    }
+    return staticDistricts.current.then(records => records.filter(d =>
+      d.lat >= latMin && d.lat <= latMax && d.lng >= lngMin && d.lng <= lngMax
+    ));
+  };
+
+  // Load only the districts inside the drilled-down state's bounds
+  useEffect(() => {
+    const coords = currentStateForDistricts ? stateCoordinates[stateKey(currentStateForDistricts)] : undefined;
+    if (!coords) {
+      setDistrictRecords([]);
+      return;
+    }
+
+    const { latMin, latMax, lngMin, lngMax } = coords.bounds;
+    const params = new URLSearchParams({
+      min_lat: String(latMin),
+      max_lat: String(latMax),
+      min_lng: String(lngMin),
+      max_lng: String(lngMax)
+    });
+    const controller = new AbortController();
+    fetchJson(`${API_BASE_URL}/api/districts/bbox?${params}`, { signal: controller.signal })
+      .catch(err => {
+        if (err.name === 'AbortError') throw err;
+        return staticDistrictsWithin(latMin, latMax, lngMin, lngMax);
+      })
+      .then((records: DistrictRecord[]) => {
+        // The static fallback is not aborted with the request
+        if (!controller.signal.aborted) setDistrictRecords(records);
+      })
+      .catch(err => {
+        if (err.name !== 'AbortError') {
+          console.error('Failed to load district data:', err);
+          setDistrictRecords([]);
+        }
+      });
+    return () => controller.abort();
+  }, [currentStateForDistricts, stateCoordinates]);
+
   // Sync with global state selection
   useEffect(() => {
     if (selectedState && selectedState !== "All India") {
-      const normalizedStateName = selectedState.toUpperCase();
-      if (districtData[normalizedStateName]) {
+      const normalizedStateName = stateKey(selectedState);
+      if (stateCoordinates[normalizedStateName]) {
         setCurrentStateForDistricts(selectedState);
         setViewMode('districts');
       }
@@ -91,7 +158,7 @@ const GeospatialMap: React.FC<MapProps> = ({ lang, selectedState, onSelect }) =>
       setViewMode('states');
       setCurrentStateForDistricts(null);
     }
-  }, [selectedState, districtData]);
+  }, [selectedState, stateCoordinates]);
 
   const handleBackToStates = () => {
     setViewMode('states');
@@ -105,7 +172,7 @@ const GeospatialMap: React.FC<MapProps> = ({ lang, selectedState, onSelect }) =>
   };
 
   const stateMapData = INDIA_STATES_DATA.map(state => {
-    const coords = stateCoordinates[state.state.toUpperCase()] || { lat: 22, lng: 82, bounds: { latMin: 0, latMax: 0, lngMin: 0, lngMax: 0 }, zoomScale: 2 };
+    const coords = stateCoordinates[stateKey(state.state)] || { lat: 22, lng: 82, bounds: { latMin: 0, latMax: 0, lngMin: 0, lngMax: 0 }, zoomScale: 2 };
     return {
       ...state,
       lat: coords.lat,
@@ -113,23 +180,26 @@ const GeospatialMap: React.FC<MapProps> = ({ lang, selectedState, onSelect }) =>
     };
   });
 
-  const districtMapData = currentStateForDistricts && districtData[currentStateForDistricts.toUpperCase()]
-    ? Object.entries(districtData[currentStateForDistricts.toUpperCase()]).map(([name, data]: [string, any]) => ({
-      name,
-      lat: (data as DistrictData).lat,
-      lng: (data as DistrictData).lng,
-      offices: (data as DistrictData).offices,
-      enrollments: (data as DistrictData).enrollments,
-      updates: (data as DistrictData).updates,
-      child_enrollments: (data as DistrictData).child_enrollments,
-      density: (data as DistrictData).density,
-      anomaly_score: (data as DistrictData).anomaly_score
-    }))
+  // The bounding box also catches border districts of neighbouring states
+  const districtMapData = currentStateForDistricts
+    ? districtRecords
+      .filter(d => stateKey(d.state) === stateKey(currentStateForDistricts))
+      .map(d => ({
+        name: d.district,
+        lat: d.lat,
+        lng: d.lng,
+        offices: d.offices,
+        enrollments: d.enrollments,
+        updates: d.updates,
+        child_enrollments: d.child_enrollments,
+        density: d.density,
+        anomaly_score: d.anomaly_score
+      }))
     : [];
 
   // Calculate dynamic density metrics for the current state
   const densityMetrics = React.useMemo(() => {
-    if (!currentStateForDistricts || !districtData[currentStateForDistricts.toUpperCase()]) {
+    if (!currentStateForDistricts) {
       return {
         low: '<10/office',
         medium: '10-20/office',
@@ -138,8 +208,7 @@ const GeospatialMap: React.FC<MapProps> = ({ lang, selectedState, onSelect }) =>
       };
     }
 
-    const districts = Object.values(districtData[currentStateForDistricts.toUpperCase()]) as DistrictData[];
-    const densities = districts.map(d => d.density).sort((a, b) => a - b);
+    const densities = districtMapData.map(d => d.density).sort((a, b) => a - b);
 
     if (densities.length === 0) {
       return {
@@ -161,7 +230,7 @@ const GeospatialMap: React.FC<MapProps> = ({ lang, selectedState, onSelect }) =>
       high: `${q2.toFixed(1)}-${q3.toFixed(1)}/office`,
       veryHigh: `>${q3.toFixed(1)}/office`
     };
-  }, [currentStateForDistricts, districtData]);
+  }, [currentStateForDistricts, districtRecords]);
 
   const getStateTrace = () => {
     if (mapMode === 'saturation') {
@@ -403,13 +472,13 @@ const GeospatialMap: React.FC<MapProps> = ({ lang, selectedState, onSelect }) =>
             layout={{
               geo: {
                 scope: 'asia',
-                center: viewMode === 'districts' && currentStateForDistricts && stateCoordinates[currentStateForDistricts.toUpperCase()]
-                  ? { lat: stateCoordinates[currentStateForDistricts.toUpperCase()].lat, lon: stateCoordinates[currentStateForDistricts.toUpperCase()].lng }
+                center: viewMode === 'districts' && currentStateForDistricts && stateCoordinates[stateKey(currentStateForDistricts)]
+                  ? { lat: stateCoordinates[stateKey(currentStateForDistricts)].lat, lon: stateCoordinates[stateKey(currentStateForDistricts)].lng }
                   : { lat: 23.5, lon: 82.5 },
                 projection: {
                   type: 'mercator',
-                  scale: viewMode === 'districts' && currentStateForDistricts && stateCoordinates[currentStateForDistricts.toUpperCase()]
-                    ? stateCoordinates[currentStateForDistricts.toUpperCase()].zoomScale
+                  scale: viewMode === 'districts' && currentStateForDistricts && stateCoordinates[stateKey(currentStateForDistricts)]
+                    ? stateCoordinates[stateKey(currentStateForDistricts)].zoomScale
                     : 3.0,
                   // Improved zoom range for better detail
                   scalerange: [1.5, 25]
@@ -468,9 +537,9 @@ const GeospatialMap: React.FC<MapProps> = ({ lang, selectedState, onSelect }) =>
             onClick={(event: any) => {
               if (viewMode === 'states' && event.points && event.points[0]) {
                 const stateName = event.points[0].customdata.fullName;
-                const normalizedStateName = stateName.toUpperCase();
+                const normalizedStateName = stateKey(stateName);
 
-                if (districtData[normalizedStateName]) {
+                if (stateCoordinates[normalizedStateName]) {
                   setCurrentStateForDistricts(stateName);
                   setViewMode('districts');
                 }
@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import {
     AreaChart,
     Area,
@@ -11,31 +11,31 @@ import {
 } from 'recharts';
 import { TrendingUp } from 'lucide-react';
 import GlossaryTerm from './GlossaryTerm';
-
-interface VelocityDataPoint {
-    date: string;
-    enrollments: number;
+import { API_BASE_URL } from '../src/config';
+
+interface VelocitySummary {
+    totalUrban: number;
+    totalRural: number;
+    urbanDataPoints: number;
+    ruralDataPoints: number;
+    dateRange: {
+        start: string;
+        end: string;
+    };
 }
 
-interface VelocityData {
-    urban: VelocityDataPoint[];
-    rural: VelocityDataPoint[];
-    summary: {
-        totalUrban: number;
-        totalRural: number;
-        urbanDataPoints: number;
-        ruralDataPoints: number;
-        dateRange: {
-            start: string;
-            end: string;
-        };
-    };
+// Counts aligned to the index's shared date axis (null = no data that day)
+interface VelocityColumns {
+    urban: (number | null)[];
+    rural: (number | null)[];
+    summary: VelocitySummary;
 }
 
-interface UrbanRuralFullData {
-    allIndia: VelocityData;
-    states: { [key: string]: VelocityData };
+interface VelocityIndex {
+    dates: string[];
+    allIndia: VelocityColumns;
     stateList: string[];
+    shards: { [key: string]: string };
 }
 
 interface ChartDataPoint {
@@ -44,6 +44,16 @@ interface ChartDataPoint {
     rural: number;
 }
 
+// Static copy of the velocity assets, used when the API is not reachable (e.g. a
+// static build deployed without the backend); shard paths are relative to it
+const STATIC_ASSETS = '/assets/urban_rural';
+
+const fetchJson = (url: string) =>
+    fetch(url).then(res => {
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        return res.json();
+    });
+
 interface VelocityProps {
     externalState?: string | null;
     lang?: 'EN' | 'HI';
@@ -51,35 +61,32 @@ interface VelocityProps {
 }
 
 const UrbanRuralVelocityChart: React.FC<VelocityProps> = ({ externalState, lang = 'EN', onSelect }) => {
-    const [fullData, setFullData] = useState<UrbanRuralFullData | null>(null);
+    const [index, setIndex] = useState<VelocityIndex | null>(null);
     const [selectedState, setSelectedState] = useState<string>(externalState || 'All India');
     const [data, setData] = useState<ChartDataPoint[]>([]);
-    const [summary, setSummary] = useState<VelocityData['summary'] | null>(null);
+    const [summary, setSummary] = useState<VelocitySummary | null>(null);
     const [loading, setLoading] = useState(true);
 
-    // Sync with external state
+    // State shards fetched so far, and the state the latest request was for
+    const shardCache = useRef(new Map<string, VelocityColumns>());
+    const requestedState = useRef<string>('All India');
+
+    // Sync with external state (also shows the initial state once the index is loaded)
     useEffect(() => {
-        if (fullData) {
+        if (index) {
             const stateToSet = externalState || 'All India';
             setSelectedState(stateToSet);
             updateViewWithState(stateToSet);
         }
-    }, [externalState, fullData]);
+    }, [externalState, index]);
 
     useEffect(() => {
         const loadData = async () => {
             try {
-                const response = await fetch('/assets/urban_rural_velocity.json');
-                const rawData: UrbanRuralFullData = await response.json();
-                setFullData(rawData);
-
-                // Initialize with correct state
-                const initialState = externalState || 'All India';
-                const stateData = initialState === 'All India'
-                    ? rawData.allIndia
-                    : (rawData.states[initialState] || rawData.allIndia);
-
-                processStateData(stateData);
+                // Only the index (date axis + All India series) is needed for first paint
+                const velocityIndex: VelocityIndex = await fetchJson(`${API_BASE_URL}/api/urban-rural`)
+                    .catch(() => fetchJson(`${STATIC_ASSETS}/index.json`));
+                setIndex(velocityIndex);
                 setLoading(false);
             } catch (error) {
                 console.error('Failed to load urban/rural velocity data:', error);
@@ -90,62 +97,52 @@ const UrbanRuralVelocityChart: React.FC<VelocityProps> = ({ externalState, lang
         loadData();
     }, []);
 
-    const processStateData = (stateData: VelocityData) => {
-        // Merge urban and rural data by date
-        const dateMap = new Map<string, ChartDataPoint>();
-
-        stateData.urban.forEach(item => {
-            dateMap.set(item.date, {
-                date: item.date,
-                urban: item.enrollments,
-                rural: 0
-            });
-        });
-
-        stateData.rural.forEach(item => {
-            const existing = dateMap.get(item.date);
-            if (existing) {
-                existing.rural = item.enrollments;
-            } else {
-                dateMap.set(item.date, {
-                    date: item.date,
-                    urban: 0,
-                    rural: item.enrollments
-                });
+    const processColumns = (velocityIndex: VelocityIndex, columns: VelocityColumns) => {
+        // Dates are already chronological; skip days this series has no data for,
+        // but keep days with a recorded count of zero
+        const chartData: ChartDataPoint[] = [];
+        velocityIndex.dates.forEach((date, i) => {
+            const urban = columns.urban[i];
+            const rural = columns.rural[i];
+            if (urban !== null || rural !== null) {
+                chartData.push({ date, urban: urban ?? 0, rural: rural ?? 0 });
             }
         });
 
-        // Helper to parse DD-MM-YYYY
-        const parseDate = (dateStr: string) => {
-            const [d, m, y] = dateStr.split('-').map(Number);
-            return new Date(y, m - 1, d);
-        };
-
-        // Convert to array and sort by date
-        const chartData = Array.from(dateMap.values()).sort((a, b) =>
-            parseDate(a.date).getTime() - parseDate(b.date).getTime()
-        );
-
         setData(chartData);
-        setSummary(stateData.summary);
+        setSummary(columns.summary);
     };
 
-    const updateViewWithState = (state: string) => {
-        if (!fullData) return;
+    const updateViewWithState = async (state: string) => {
+        if (!index) return;
+        requestedState.current = state;
 
-        if (state === 'All India') {
-            processStateData(fullData.allIndia);
-        } else {
-            // Case-insensitive matching as a safety measure
-            const stateData = fullData.states[state] ||
-                Object.values(fullData.states).find((_, i) => fullData.stateList[i].toLowerCase() === state.toLowerCase());
+        // Case-insensitive matching as a safety measure
+        const stateName = state === 'All India'
+            ? undefined
+            : index.stateList.find(name => name.toLowerCase() === state.toLowerCase());
 
-            if (stateData) {
-                processStateData(stateData);
-            } else {
-                processStateData(fullData.allIndia);
+        if (!stateName) {
+            processColumns(index, index.allIndia);
+            return;
+        }
+
+        let columns = shardCache.current.get(stateName);
+        if (!columns) {
+            try {
+                columns = (await fetchJson(`${API_BASE_URL}/api/urban-rural/${encodeURIComponent(stateName)}`)
+                    .catch(() => fetchJson(`${STATIC_ASSETS}/${index.shards[stateName]}`))) as VelocityColumns;
+                shardCache.current.set(stateName, columns);
+            } catch (error) {
+                console.error(`Failed to load urban/rural velocity data for ${stateName}:`, error);
+                columns = index.allIndia;
             }
         }
+
+        // Ignore shards that arrive after the user has moved on to another state
+        if (requestedState.current === state) {
+            processColumns(index, columns);
+        }
     };
 
     const handleStateChange = (event: React.ChangeEvent<HTMLSelectElement>) => {
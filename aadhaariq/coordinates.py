@@ -0,0 +1,142 @@
+import json
+import re
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from state_names import StateCanonicalizer
+
+# Every spelling of a state, upper case or not, resolves to one name
+_state_canonicalizer = StateCanonicalizer(invalid_states=set(), fold_case=True)
+
+# India bounds: Lat 8°N to 35°N, Lng 68°E to 97°E
+LAT_BOUNDS = (8, 35)
+LNG_BOUNDS = (68, 97)
+
+# Degrees, minutes and seconds once the DMS marks are blanked out; anything
+# after the seconds is ignored
+_DMS_PATTERN = r'^\s*(?P<degrees>\S+)(?:\s+(?P<minutes>\S+))?(?:\s+(?P<seconds>\S+))?'
+
+
+def parse_coordinates(values):
+    """
+    Convert a column of coordinates, given either as decimal degrees or as
+    DMS such as 17°57'17.7", to decimal degrees in one vectorized pass.
+
+    Returns (degrees, failures): values that cannot be parsed become NaN and
+    `failures` counts the non-empty ones among them.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype('float64'), 0
+
+    text = values.astype('string').str.strip()
+    present = text.notna() & (text != '')
+    degrees = pd.to_numeric(text.astype(object), errors='coerce').astype('float64')
+
+    pending = present & degrees.isna()
+    if pending.any():
+        cleaned = text[pending].str.replace('"', '', regex=False).str.replace(r"['°]", ' ', regex=True)
+        parts = cleaned.str.extract(_DMS_PATTERN)
+        numbers = parts.apply(lambda col: pd.to_numeric(col.astype(object), errors='coerce'))
+
+        # A part that is present but not a number fails the whole value
+        failed = (parts.notna() & numbers.isna()).any(axis=1) | parts['degrees'].isna()
+        dms = numbers['degrees'] + numbers['minutes'].fillna(0) / 60 + numbers['seconds'].fillna(0) / 3600
+        degrees[pending] = dms.where(~failed, np.nan)
+
+    failures = int((present & degrees.isna()).sum())
+    return degrees, failures
+
+
+def in_india(lat, lng):
+    """Boolean mask of decimal coordinates inside India's bounding box"""
+    return (
+        (lat >= LAT_BOUNDS[0]) & (lat <= LAT_BOUNDS[1]) &
+        (lng >= LNG_BOUNDS[0]) & (lng <= LNG_BOUNDS[1])
+    )
+
+
+def name_key(name):
+    """Matching key for a place name: upper case, punctuation and repeated spaces dropped"""
+    return ' '.join(re.sub(r'[^0-9A-Z]+', ' ', str(name).upper()).split())
+
+
+def state_key(state):
+    """name_key() of the canonical name of a state, whatever spelling it is given in"""
+    return name_key(_state_canonicalizer.canonicalize(state) or state)
+
+
+def is_flat(centroids):
+    """Whether district centroids are in the older {DISTRICT: {lat, lng}} format"""
+    return any('lat' in entry for entry in centroids.values())
+
+
+class CentroidIndex:
+    """
+    District centroids from district_centroids.json ({STATE: {DISTRICT:
+    {lat, lng}}}), looked up by (state, district): first by the exact
+    upper-case names, then by name_key() of both. A district is never
+    matched in another state, since the same name in two states is two
+    places; anything else resolves to None rather than to made-up
+    coordinates.
+
+    A file in the older flat format ({DISTRICT: {lat, lng}}) has no states,
+    so every district is matched on its name alone and reported as 'name'.
+    """
+
+    def __init__(self, centroids):
+        self.exact = {}
+        for state, districts in centroids.items():
+            for district, c in districts.items():
+                self.exact[(state_key(state), district)] = (round(c['lat'], 4), round(c['lng'], 4))
+
+        # Keys are visited in sorted order so a key shared by two spellings always maps the same way
+        self.normalized = {}
+        for state, district in sorted(self.exact):
+            self.normalized.setdefault((state, name_key(district)), self.exact[(state, district)])
+
+        # Only filled for a flat file, which gives no state to match within
+        self.names = {}
+
+    @classmethod
+    def from_names(cls, centroids):
+        """Index flat {DISTRICT: {lat, lng}} centroids, matched on the district name only"""
+        index = cls({})
+        for district in sorted(centroids):
+            c = centroids[district]
+            index.names.setdefault(name_key(district), (round(c['lat'], 4), round(c['lng'], 4)))
+        return index
+
+    @classmethod
+    def load(cls, path):
+        """Index a centroid file in either format; a missing file gives an empty index"""
+        path = Path(path)
+        if not path.exists():
+            print(f"Warning: {path} not found, district coordinates unavailable")
+            return cls({})
+        with open(path, 'r', encoding='utf-8') as f:
+            centroids = json.load(f)
+        if is_flat(centroids):
+            print(f"Warning: {path} is keyed by district name only, matching districts by name; "
+                  f"rerun preprocess_geo.py to match them within their state")
+            return cls.from_names(centroids)
+        return cls(centroids)
+
+    def __len__(self):
+        return len(self.exact) or len(self.names)
+
+    def match(self, state, district):
+        """(lat, lng, how) for a district of a state; how is 'exact', 'normalized', 'name' or 'unmatched'"""
+        if district is None or pd.isna(district) or state is None or pd.isna(state):
+            return None, None, 'unmatched'
+        state = state_key(state)
+        exact = self.exact.get((state, str(district).strip().upper()))
+        if exact is not None:
+            return exact[0], exact[1], 'exact'
+        normalized = self.normalized.get((state, name_key(district)))
+        if normalized is not None:
+            return normalized[0], normalized[1], 'normalized'
+        by_name = self.names.get(name_key(district))
+        if by_name is not None:
+            return by_name[0], by_name[1], 'name'
+        return None, None, 'unmatched'
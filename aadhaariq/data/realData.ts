@@ -19,8 +19,10 @@ export interface AadhaarDistrictData {
     state: string;
     district: string;
     enrolments: number;
-    lat: number;
-    lng: number;
+    lat: number | null;
+    lng: number | null;
+    // 'name' is only given when district_centroids.json is in the flat format without states
+    geoMatch?: 'exact' | 'normalized' | 'name' | 'unmatched';
 }
 
 export interface AadhaarTimeSeries {
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+# Raw UIDAI dumps write dates as dd-mm-yyyy
+RAW_DATE_FORMAT = '%d-%m-%Y'
+
+# Day numbers count days since 1970-01-01 and fit in int32
+_MISSING = np.iinfo(np.int64).min
+
+
+def parse_day_numbers(values, fmt=RAW_DATE_FORMAT):
+    """
+    Parse a column of date strings into nullable int32 day numbers.
+    Each distinct string is parsed once; unparseable values become <NA>.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return datetimes_to_day_numbers(values)
+
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), format=fmt, errors='coerce')
+    days = np.where(parsed.isna(), _MISSING, parsed.to_numpy('datetime64[D]').astype('int64'))
+
+    # codes == -1 (missing values) index the trailing sentinel
+    lookup = np.append(days, _MISSING)
+    return _as_day_series(lookup[codes], values.index, values.name)
+
+
+def datetimes_to_day_numbers(values):
+    """Convert a datetime64 column into nullable int32 day numbers"""
+    values = pd.Series(values)
+    days = values.to_numpy('datetime64[D]').astype('int64')
+    days = np.where(values.isna().to_numpy(), _MISSING, days)
+    return _as_day_series(days, values.index, values.name)
+
+
+def _as_day_series(days, index, name):
+    missing = days == _MISSING
+    array = pd.arrays.IntegerArray(np.where(missing, 0, days).astype('int32'), missing)
+    return pd.Series(array, index=index, name=name)
+
+
+def day_numbers_to_datetimes(days):
+    """Day numbers back to datetime64 values"""
+    return pd.to_datetime(np.asarray(days, dtype='int64'), unit='D')
+
+
+def format_day_numbers(days, fmt='%Y-%m-%d'):
+    """Format day numbers as strings, formatting each distinct day once"""
+    days = np.asarray(days, dtype='int64')
+    uniques, inverse = np.unique(days, return_inverse=True)
+    labels = day_numbers_to_datetimes(uniques).strftime(fmt).to_numpy(dtype=object)
+    return labels[inverse].tolist()
+
+
+def day_numbers_to_months(days):
+    """'YYYY-MM' month labels for an array of day numbers"""
+    days = np.asarray(days, dtype='int64')
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(str)
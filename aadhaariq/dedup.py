@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# Columns that identify a record within a dataset
+IDENTITY_COLUMNS = ['date', 'state', 'district', 'pincode']
+
+# Integer identity columns, hashed as int64 so large values never round
+INTEGER_COLUMNS = ('date', 'pincode')
+
+
+def record_fingerprints(df, data_type):
+    """
+    64-bit fingerprint of each row's identity (date, state, district, pincode)
+    salted with the dataset name. Counts are not part of the identity, so a
+    later record for the same identity is a duplicate whatever its counts.
+    The hash depends only on values, so it is stable across chunks, shards,
+    processes and runs.
+    """
+    identity = pd.DataFrame(index=df.index)
+    for col in IDENTITY_COLUMNS:
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if col in INTEGER_COLUMNS:
+            # Same integer whether the chunk parsed the column as int, float or nullable;
+            # missing values hash as -1, which no date or pincode takes
+            values = pd.to_numeric(values, errors='coerce').astype('Int64').fillna(-1).astype('int64')
+        elif not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype('category')
+        identity[col] = values
+
+    salt = pd.util.hash_array(np.array([data_type], dtype=object))[0]
+    return pd.util.hash_pandas_object(identity, index=False).to_numpy() ^ salt
+
+
+class FingerprintSet:
+    """
+    Compact set of 64-bit record fingerprints kept as one sorted uint64 array
+    (8 bytes per record), so it can span every chunk and shard of a dataset.
+    """
+
+    def __init__(self, fingerprints=None):
+        self.values = np.empty(0, dtype=np.uint64)
+        if fingerprints is not None:
+            self.values = np.unique(np.asarray(fingerprints, dtype=np.uint64))
+
+    def __len__(self):
+        return len(self.values)
+
+    def contains(self, fingerprints):
+        """Boolean mask of fingerprints already in the set"""
+        if not len(self.values):
+            return np.zeros(len(fingerprints), dtype=bool)
+        idx = np.searchsorted(self.values, fingerprints)
+        idx[idx == len(self.values)] = 0
+        return self.values[idx] == fingerprints
+
+    def add_new(self, fingerprints):
+        """Add a batch; returns a mask of its first occurrences not seen before"""
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        _, first = np.unique(fingerprints, return_index=True)
+        fresh = np.zeros(len(fingerprints), dtype=bool)
+        fresh[first] = True
+        fresh &= ~self.contains(fingerprints)
+
+        if fresh.any():
+            self.values = np.union1d(self.values, fingerprints[fresh])
+        return fresh
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from repo_paths import PINCODE_MAPPING_CSV, CACHE_DIR
+
+# BO = Branch Office = Rural
+# SO = Sub Office, HO = Head Office = Urban
+OFFICE_CLASSIFICATION = {'BO': 'Rural', 'SO': 'Urban', 'HO': 'Urban'}
+
+# Class codes; -1 = no classified office for the pincode
+CLASSIFICATIONS = ['Rural', 'Urban']
+
+# Bumped whenever from_mapping changes what it stores, so saved indexes are rebuilt
+INDEX_VERSION = 3
+
+ARRAYS = {
+    'pincodes': 'int32',
+    'classification': 'int8',
+    'state': 'int16',
+    'district': 'int16',
+}
+
+
+def default_index_root():
+    return CACHE_DIR / 'pincode_index'
+
+
+def _source_stat(csv_path):
+    stat = Path(csv_path).stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _source_digest(csv_path):
+    sha = hashlib.sha256()
+    with open(csv_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class PincodeIndex:
+    """
+    Pincode attributes as a sorted int32 pincode array with parallel arrays
+    of class, state and district codes. Saved as .npy files that load
+    memory-mapped, so opening the index costs milliseconds.
+    """
+
+    def __init__(self, arrays, states, districts, source=None):
+        self.pincodes = arrays['pincodes']
+        self.classification = arrays['classification']
+        self.state = arrays['state']
+        self.district = arrays['district']
+        self.states = list(states)
+        self.districts = list(districts)
+        self.source = source or {}
+
+    def __len__(self):
+        return len(self.pincodes)
+
+    @classmethod
+    def from_mapping(cls, csv_path=PINCODE_MAPPING_CSV):
+        """
+        Build the index from the post office table. Each pincode takes the
+        state and district of its last classified office (or of its last
+        office if none is classified), matching the old per-row dict.
+        """
+        df = pd.read_csv(csv_path, usecols=['pincode', 'officetype', 'district', 'statename'])
+
+        pincodes = pd.to_numeric(df['pincode'], errors='coerce')
+        statenames = df['statename']
+        valid = (pincodes % 1 == 0).to_numpy()
+        classification = df['officetype'].astype(str).str.strip().str.upper().map(OFFICE_CLASSIFICATION)
+
+        table = pd.DataFrame({
+            'pincode': pincodes[valid].astype('int64').to_numpy(),
+            'classified': classification[valid].notna().to_numpy(),
+            'classification': classification[valid].to_numpy(),
+            # State names are stored as spelled in the mapping; a missing state
+            # name is kept as 'nan', as str() produced before
+            'state': statenames.astype(str).str.strip().where(statenames.notna(), 'nan')[valid].to_numpy(),
+            'district': df['district'][valid].astype(object).fillna('').astype(str).str.strip().str.upper().to_numpy(),
+        })
+
+        # Stable sort so the last (classified) office of each pincode comes last
+        order = np.lexsort((table['classified'].to_numpy(), table['pincode'].to_numpy()))
+        table = table.iloc[order].drop_duplicates('pincode', keep='last')
+
+        state_codes, state_names = pd.factorize(table['state'], sort=True)
+        district_codes, district_names = pd.factorize(table['district'], sort=True)
+        class_codes = pd.Categorical(table['classification'], categories=CLASSIFICATIONS).codes
+
+        arrays = {
+            'pincodes': table['pincode'].to_numpy(),
+            'classification': class_codes,
+            'state': state_codes,
+            'district': district_codes,
+        }
+        arrays = {name: np.asarray(values).astype(ARRAYS[name]) for name, values in arrays.items()}
+        return cls(arrays, state_names, district_names)
+
+    def save(self, root):
+        """Write the index atomically into `root`"""
+        root = Path(root)
+        staging = root.with_name(root.name + '.staging')
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        for name in ARRAYS:
+            np.save(staging / f"{name}.npy", getattr(self, name))
+        with open(staging / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump({'states': self.states, 'districts': self.districts, 'source': self.source}, f)
+
+        retired = root.with_name(root.name + '.retired')
+        shutil.rmtree(retired, ignore_errors=True)
+        if root.exists():
+            os.replace(root, retired)
+        os.replace(staging, root)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    @classmethod
+    def load(cls, root=None, mmap=True):
+        """Open a saved index, memory-mapping its arrays"""
+        root = Path(root or default_index_root())
+        with open(root / 'meta.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        arrays = {name: np.load(root / f"{name}.npy", mmap_mode='r' if mmap else None) for name in ARRAYS}
+        return cls(arrays, meta['states'], meta['districts'], meta.get('source'))
+
+    @classmethod
+    def load_or_build(cls, csv_path=PINCODE_MAPPING_CSV, root=None):
+        """Open the saved index, rebuilding it only if the mapping file has changed"""
+        root = Path(root or default_index_root())
+        stat = _source_stat(csv_path)
+
+        index = cls.load(root) if (root / 'meta.json').exists() else None
+        if index is not None and index.source.get('version') == INDEX_VERSION:
+            if all(index.source.get(key) == value for key, value in stat.items()):
+                return index
+
+            # Touched but unchanged content: just refresh the recorded stat
+            digest = _source_digest(csv_path)
+            if index.source.get('sha256') == digest:
+                index.source = {**stat, 'sha256': digest, 'version': INDEX_VERSION}
+                with open(root / 'meta.json', 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                meta['source'] = index.source
+                with open(root / 'meta.json', 'w', encoding='utf-8') as f:
+                    json.dump(meta, f)
+                return index
+        else:
+            digest = _source_digest(csv_path)
+
+        print(f"Building pincode index from {csv_path}...")
+        index = cls.from_mapping(csv_path)
+        index.source = {**stat, 'sha256': digest, 'version': INDEX_VERSION}
+        index.save(root)
+        return cls.load(root)
+
+    def find(self, pincodes):
+        """
+        Row of each pincode in the index by binary search, or -1 if absent.
+        Accepts a scalar (returns an int) or any array-like of pincodes.
+        """
+        scalar = np.ndim(pincodes) == 0
+        keys = pd.to_numeric(pd.Series(np.atleast_1d(pincodes)), errors='coerce').to_numpy(dtype='float64')
+        valid = np.isfinite(keys) & (keys % 1 == 0)
+        keys = np.where(valid, keys, -1).astype('int64')
+
+        rows = np.searchsorted(self.pincodes, keys)
+        if len(self.pincodes):
+            rows = np.minimum(rows, len(self.pincodes) - 1)
+            valid &= np.asarray(self.pincodes)[rows] == keys
+        else:
+            valid[:] = False
+        rows = np.where(valid, rows, -1)
+        return int(rows[0]) if scalar else rows
+
+    def classify(self, pincodes):
+        """int8 class code (index into CLASSIFICATIONS) of each pincode, -1 if unknown or unclassified"""
+        rows = np.atleast_1d(self.find(pincodes))
+        found = rows >= 0
+        return np.where(found, np.asarray(self.classification)[np.where(found, rows, 0)], -1).astype('int8')
+
+    def lookup(self, pincodes):
+        """
+        Classification, state and district of pincodes. A scalar gives a dict
+        (None if unknown); an array gives a frame of categorical columns with
+        missing values for unknown pincodes or unclassified offices.
+        """
+        rows = self.find(pincodes)
+        if np.ndim(rows) == 0:
+            if rows < 0:
+                return None
+            code = int(self.classification[rows])
+            return {
+                'classification': CLASSIFICATIONS[code] if code >= 0 else None,
+                'state': self.states[self.state[rows]],
+                'district': self.districts[self.district[rows]],
+            }
+
+        found = rows >= 0
+        safe = np.where(found, rows, 0)
+
+        def column(codes, names):
+            codes = np.where(found, np.asarray(codes)[safe], -1)
+            return pd.Categorical.from_codes(codes.astype('int64'), categories=names)
+
+        return pd.DataFrame({
+            'classification': column(self.classification, CLASSIFICATIONS),
+            'state': column(self.state, self.states),
+            'district': column(self.district, self.districts),
+        })
@@ -0,0 +1,282 @@
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from repo_paths import (
+    REPO_ROOT, ENROLMENT_DIR, DEMOGRAPHIC_DIR, BIOMETRIC_DIR,
+    DISTRICT_LAT_LONG_CSV, PINCODE_MAPPING_CSV, DATA_DIR, ASSETS_DIR, CACHE_DIR,
+)
+
+AADHAARIQ_DIR = REPO_ROOT / 'aadhaariq'
+BACKEND_DIR = REPO_ROOT / 'backend'
+STORE_DIR = REPO_ROOT / 'cleaned_store'
+
+# Written by preprocess_geo.py for process_real_data.py and process_district_data.py
+DISTRICT_GEO_PATH = DATA_DIR / 'district_centroids.json'
+
+# Modules imported by every stage; editing one reruns everything
+SHARED_MODULES = [
+    AADHAARIQ_DIR / name
+    for name in ('repo_paths.py', 'state_names.py', 'dates.py', 'dedup.py', 'cleaned_store.py')
+]
+
+STATE_PATH = CACHE_DIR / 'pipeline.json'
+LOG_DIR = CACHE_DIR / 'logs'
+
+
+class Stage:
+    """One offline script with the files it reads and the files it writes"""
+
+    def __init__(self, name, script, inputs, outputs, args=()):
+        self.name = name
+        self.script = script
+        self.inputs = [script, *SHARED_MODULES, *inputs]
+        self.outputs = list(outputs)
+        self.args = list(args)
+
+    def reads_from(self, other):
+        """True if this stage reads something the other stage writes"""
+        return any(
+            path == output or output in path.parents
+            for path in self.inputs for output in other.outputs
+        )
+
+
+STAGES = [
+    Stage(
+        'build_store', AADHAARIQ_DIR / 'process_real_data.py',
+        inputs=[ENROLMENT_DIR, DEMOGRAPHIC_DIR, BIOMETRIC_DIR],
+        outputs=[STORE_DIR],
+        args=['--build-store', '--incremental', '--store-only'],
+    ),
+    Stage(
+        'process_real_data', AADHAARIQ_DIR / 'process_real_data.py',
+        inputs=[
+            AADHAARIQ_DIR / 'pincode_index.py', AADHAARIQ_DIR / 'coordinates.py', PINCODE_MAPPING_CSV,
+            DISTRICT_GEO_PATH, STORE_DIR,
+        ],
+        outputs=[DATA_DIR / 'aadhaar_data.json'],
+        args=['--from-store'],
+    ),
+    Stage(
+        'analytics_engine', AADHAARIQ_DIR / 'analytics_engine.py',
+        inputs=[DATA_DIR / 'aadhaar_data.json', STORE_DIR],
+        outputs=[DATA_DIR / 'analytics_report.json'],
+    ),
+    Stage(
+        'process_district_data', BACKEND_DIR / 'process_district_data.py',
+        inputs=[BACKEND_DIR / 'preprocess_geo.py', DISTRICT_GEO_PATH, STORE_DIR],
+        outputs=[ASSETS_DIR / 'district_data.json'],
+    ),
+    Stage(
+        'process_urban_rural', BACKEND_DIR / 'process_urban_rural.py',
+        inputs=[AADHAARIQ_DIR / 'pincode_index.py', PINCODE_MAPPING_CSV, STORE_DIR],
+        outputs=[ASSETS_DIR / 'urban_rural_velocity.json', ASSETS_DIR / 'urban_rural'],
+    ),
+    Stage(
+        'preprocess_geo', BACKEND_DIR / 'preprocess_geo.py',
+        inputs=[AADHAARIQ_DIR / 'coordinates.py', DISTRICT_LAT_LONG_CSV],
+        outputs=[ASSETS_DIR / 'state_centroids.json', DISTRICT_GEO_PATH],
+    ),
+]
+
+
+
+# Files up to this size are fingerprinted by content; larger ones (the raw
+# CSV dumps) by size and mtime only, so rewriting one with the same size
+# within the filesystem's mtime resolution goes unnoticed (use --force)
+CONTENT_HASH_MAX_BYTES = 1024 * 1024
+
+
+def file_digest(path):
+    """Fingerprint entry of one file: its content hash when small, else its size and mtime"""
+    stat = path.stat()
+    if stat.st_size <= CONTENT_HASH_MAX_BYTES:
+        return [str(path), stat.st_size, hashlib.sha256(path.read_bytes()).hexdigest()]
+    return [str(path), stat.st_size, stat.st_mtime_ns]
+
+
+def path_digest(paths):
+    """Fingerprint of a set of files and directories (see CONTENT_HASH_MAX_BYTES)"""
+    entries = []
+    for path in paths:
+        if path.is_file():
+            files = [path]
+        elif path.is_dir():
+            # Skip hidden entries such as the store's staging directories
+            files = sorted(
+                p for p in path.rglob('*')
+                if p.is_file() and not any(part.startswith('.') for part in p.relative_to(path).parts)
+            )
+        else:
+            entries.append([str(path), None])
+            continue
+        entries.extend(file_digest(f) for f in files)
+    return hashlib.sha256(json.dumps(entries).encode('utf-8')).hexdigest()
+
+
+def load_state():
+    if STATE_PATH.exists():
+        with open(STATE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(state):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = STATE_PATH.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, STATE_PATH)
+
+
+def dependencies(stages):
+    """Stage name -> names of the selected stages it reads outputs from"""
+    return {
+        stage.name: [other.name for other in stages if other is not stage and stage.reads_from(other)]
+        for stage in stages
+    }
+
+
+def check_acyclic(deps):
+    """Raise ValueError naming the stages of a dependency cycle, if there is one"""
+    remaining = {name: set(upstream) for name, upstream in deps.items()}
+    while remaining:
+        ready = [name for name, upstream in remaining.items() if not upstream & remaining.keys()]
+        if not ready:
+            break
+        for name in ready:
+            del remaining[name]
+    if not remaining:
+        return
+
+    # Every remaining stage waits on another remaining one: walk back until a stage repeats
+    path = [next(iter(remaining))]
+    while path.count(path[-1]) < 2:
+        path.append(next(d for d in sorted(remaining[path[-1]]) if d in remaining))
+    cycle = path[path.index(path[-1]):]
+    raise ValueError(f"Stages depend on each other in a cycle: {' -> '.join(cycle)}")
+
+
+def run_stage(stage):
+    """Run a stage's script in its own directory, logging its output; returns (ok, seconds)"""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log_path = LOG_DIR / f"{stage.name}.log"
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        result = subprocess.run(
+            [sys.executable, str(stage.script), *stage.args],
+            cwd=stage.script.parent,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            env={**os.environ, 'PYTHONUNBUFFERED': '1', 'PYTHONIOENCODING': 'utf-8'},
+        )
+    return result.returncode == 0, time.perf_counter() - start
+
+
+def run_pipeline(stages, jobs=None, force=False):
+    """Run stages in dependency order, in parallel where possible; returns {name: (status, seconds)}"""
+    deps = dependencies(stages)
+    # Without a cycle every stage becomes ready once its upstream stages finish
+    check_acyclic(deps)
+    state = load_state()
+    results = {}
+    by_name = {stage.name: stage for stage in stages}
+    unfinished = {name: set(upstream) for name, upstream in deps.items()}
+    ready = deque(name for name, upstream in unfinished.items() if not upstream)
+    running = {}
+
+    def finish(name, status, seconds):
+        """Record a stage's result and queue the stages waiting only on it"""
+        results[name] = (status, seconds)
+        for other, upstream in unfinished.items():
+            if name in upstream:
+                upstream.discard(name)
+                if not upstream:
+                    ready.append(other)
+
+    with ThreadPoolExecutor(max_workers=jobs or len(stages)) as pool:
+        while ready or running:
+            while ready:
+                name = ready.popleft()
+                stage = by_name[name]
+                if any(results[d][0] in ('failed', 'blocked') for d in deps[name]):
+                    finish(name, 'blocked', 0.0)
+                    print(f"  - {name}: blocked by a failed upstream stage")
+                    continue
+
+                # Upstream stages have finished, so their outputs are final
+                inputs_digest = path_digest(stage.inputs)
+                recorded = state.get(name, {})
+                if (not force and recorded.get('inputs') == inputs_digest
+                        and recorded.get('outputs') == path_digest(stage.outputs)):
+                    finish(name, 'skipped', 0.0)
+                    print(f"  = {name}: inputs unchanged, skipped")
+                    continue
+
+                print(f"  > {name}: running")
+                running[pool.submit(run_stage, stage)] = (stage, inputs_digest)
+
+            if not running:
+                break
+
+            # Block until a stage finishes; only then can new stages become ready
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, inputs_digest = running.pop(future)
+                ok, seconds = future.result()
+                if ok:
+                    state[stage.name] = {'inputs': inputs_digest, 'outputs': path_digest(stage.outputs)}
+                    save_state(state)
+                    finish(stage.name, 'ran', seconds)
+                    print(f"  ✓ {stage.name}: done in {seconds:.1f}s")
+                else:
+                    state.pop(stage.name, None)
+                    save_state(state)
+                    finish(stage.name, 'failed', seconds)
+                    print(f"  ✗ {stage.name}: failed after {seconds:.1f}s, see {LOG_DIR / (stage.name + '.log')}")
+
+    return results
+
+
+if __name__ == "__main__":
+    names = [stage.name for stage in STAGES]
+    parser = argparse.ArgumentParser(description="Refresh every offline AadhaarIQ output, rerunning only stale stages")
+    parser.add_argument("stages", nargs="*", metavar="stage",
+                        help=f"Stages to consider (default: all of {', '.join(names)})")
+    parser.add_argument("--force", action="store_true",
+                        help="Run the selected stages even if their inputs are unchanged")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="Stages run at the same time (0 = as many as can run)")
+    args = parser.parse_args()
+    unknown = sorted(set(args.stages) - set(names))
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    selected = [stage for stage in STAGES if not args.stages or stage.name in args.stages]
+    try:
+        check_acyclic(dependencies(selected))
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("=" * 60)
+    print("AadhaarIQ offline pipeline")
+    print("=" * 60)
+    start = time.perf_counter()
+    results = run_pipeline(selected, jobs=args.jobs or None, force=args.force)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 60)
+    print(f"{'Stage':<28}{'Status':<10}{'Wall clock':>12}")
+    for stage in selected:
+        status, seconds = results[stage.name]
+        print(f"{stage.name:<28}{status:<10}{seconds:>11.1f}s")
+    print(f"{'Total':<38}{elapsed:>11.1f}s")
+    print("=" * 60)
+
+    sys.exit(1 if any(status != 'ran' and status != 'skipped' for status, _ in results.values()) else 0)
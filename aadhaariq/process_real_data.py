@@ -2,12 +2,23 @@ import pandas as pd
 import numpy as np
 import os
 import json
+import argparse
+import hashlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from state_names import STATE_NORMALIZATION, INVALID_STATES, StateCanonicalizer
+from cleaned_store import CleanedDataStore
+from dates import parse_day_numbers, format_day_numbers
+from dedup import FingerprintSet, record_fingerprints
+from pincode_index import PincodeIndex, CLASSIFICATIONS
+from coordinates import CentroidIndex
+from repo_paths import REPO_ROOT
 
 class AadhaarDataProcessor:
     """Process and aggregate Aadhaar data from CSV files"""
     
-    def __init__(self, base_path="."):
+    def __init__(self, base_path=REPO_ROOT):
         self.base_path = Path(base_path)
         self.enrolment_path = self.base_path / "api_data_aadhar_enrolment" / "api_data_aadhar_enrolment"
         self.demographic_path = self.base_path / "api_data_aadhar_demographic" / "api_data_aadhar_demographic"
@@ -17,82 +28,65 @@ class AadhaarDataProcessor:
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # State name normalization mapping
-        self.state_normalization = {
-            # West Bengal variants
-            "WEST BENGAL": "West Bengal",
-            "WESTBENGAL": "West Bengal",
-            "West  Bengal": "West Bengal",
-            "West Bangal": "West Bengal",
-            "West Bengli": "West Bengal",
-            "west Bengal": "West Bengal",
-            "Westbengal": "West Bengal",
-            
-            # Jammu & Kashmir variants
-            "Jammu \u0026 Kashmir": "Jammu and Kashmir",
-            "Jammu And Kashmir": "Jammu and Kashmir",
-            
-            # Odisha variants
-            "ODISHA": "Odisha",
-            "Orissa": "Odisha",
-            "odisha": "Odisha",
-            
-            # Andaman & Nicobar variants
-            "Andaman \u0026 Nicobar Islands": "Andaman and Nicobar Islands",
-            
-            # Dadra & Nagar Haveli variants
-            "Dadra \u0026 Nagar Haveli": "Dadra and Nagar Haveli",
-            "The Dadra And Nagar Haveli And Daman And Diu": "Dadra and Nagar Haveli and Daman and Diu",
-            
-            # Daman & Diu variants
-            "Daman \u0026 Diu": "Daman and Diu",
-            
-            # Chhattisgarh variant
-            "Chhatisgarh": "Chhattisgarh",
-            
-            # Andhra Pradesh variant
-            "andhra pradesh": "Andhra Pradesh",
-            
-            # Tamil Nadu variant
-            "Tamilnadu": "Tamil Nadu",
-            
-            # Uttarakhand variant
-            "Uttaranchal": "Uttarakhand",
-            
-            # Puducherry variant
-            "Pondicherry": "Puducherry",
+        # State name normalization mapping and invalid states to remove
+        # (test data, city names, etc.), shared with the backend scripts
+        self.state_normalization = dict(STATE_NORMALIZATION)
+        self.invalid_states = set(INVALID_STATES)
+        self.state_canonicalizer = StateCanonicalizer(self.state_normalization, self.invalid_states)
+        
+        # Count columns summed by every aggregate, per dataset
+        self.value_columns = {
+            "enrolment": ['age_0_5', 'age_5_17', 'age_18_greater'],
+            "demographic": ['demo_age_5_17', 'demo_age_17_'],
+            "biometric": ['bio_age_5_17', 'bio_age_17_'],
         }
         
-        # Invalid states to remove (test data, city names, etc.)
-        self.invalid_states = {
-            "100000",  # Test entry
-            "BALANAGAR",  # City name
-            "Darbhanga",  # City name  
-            "Jaipur",  # City name
-            "Madanapalle",  # City name
-            "Nagpur",  # City name
-            "Puttenahalli",  # Area name
-            "Raja Annamalai Puram",  # Area name
-        }
-    
-    def normalize_state_name(self, state_name):
-        """Normalize state name to official format"""
-        if pd.isna(state_name):
-            return None
+        # Keys that partial aggregates are grouped on in streaming mode
+        self.partial_keys = ['state', 'district', 'date']
         
-        state_name = str(state_name).strip()
+        # Records dropped as exact repeats of an earlier cleaned row, and for
+        # lacking a date that parses
+        self.duplicates_dropped = 0
+        self.undated_dropped = 0
         
-        # Remove if invalid
-        if state_name in self.invalid_states:
-            return None
+        # Shard manifests and persisted per-shard results for incremental runs:
+        # reduced partials for streaming, cleaned rows for the store build
+        self.cache_dir = self.base_path / ".aadhaar_cache"
+        self.manifest_path = self.cache_dir / "manifest.json"
+        self.store_manifest_path = self.cache_dir / "store_manifest.json"
         
-        # Apply normalization mapping
-        return self.state_normalization.get(state_name, state_name)
+        # Cleaned records shared with the other offline scripts
+        self.store = CleanedDataStore(self.base_path / "cleaned_store")
+        
+        # Post office table classifying pincodes as rural or urban; enrolment
+        # rows carry the class code of their pincode in an 'area' column
+        self.pincode_mapping_path = self.base_path / "pincode mapping" / "pincode_mapping.csv"
+        self.pincode_index = None
+    
+    def load_pincode_index(self):
+        """Open (building if needed) the pincode index; rural/urban ratios stay None without it"""
+        if self.pincode_index is None and self.pincode_mapping_path.exists():
+            self.pincode_index = PincodeIndex.load_or_build(
+                self.pincode_mapping_path, self.cache_dir / "pincode_index")
+        elif self.pincode_index is None:
+            print(f"Warning: {self.pincode_mapping_path} not found, rural/urban ratios unavailable")
+        return self.pincode_index
+    
+    def classify_areas(self, df):
+        """Add the int8 rural/urban code of each row's pincode as an 'area' column (-1 = unknown)"""
+        if df is None or self.pincode_index is None or 'pincode' not in df.columns:
+            return df
+        return df.assign(area=self.pincode_index.classify(df['pincode'].to_numpy()))
+    
+    def normalize_state_name(self, state_name):
+        """Normalize state name to official format"""
+        return self.state_canonicalizer.canonicalize(state_name)
     
     def load_csv_files(self, folder_path):
         """Load and combine all CSV files from a folder"""
-        # Use recursive glob to find files in subdirectories
-        csv_files = list(Path(folder_path).rglob("*.csv"))
+        # Use recursive glob to find files in subdirectories; sorted, as in the
+        # streaming modes, so the same record wins when shards overlap
+        csv_files = sorted(Path(folder_path).rglob("*.csv"))
         if not csv_files:
             print(f"Warning: No CSV files found in {folder_path}")
             return None
@@ -115,115 +109,532 @@ class AadhaarDataProcessor:
         print(f"Combined total: {len(combined_df)} rows\n")
         return combined_df
     
-    def clean_data(self, df, data_type):
-        """Clean and standardize dataframe"""
-        if df is None:
+    def iter_csv_chunks(self, csv_file, chunksize):
+        """Yield a CSV file in chunks of at most `chunksize` rows"""
+        try:
+            yield from pd.read_csv(csv_file, chunksize=chunksize)
+        except Exception as e:
+            print(f"  Error loading {csv_file}: {e}")
+    
+    def iter_clean_chunks(self, csv_file, data_type, chunksize):
+        """Yield (rows_read, chunk, fingerprints) for the cleaned rows of a shard.
+        
+        Rows repeating the (date, state, district, pincode) identity of an
+        earlier row are dropped across all chunks of the shard through one
+        FingerprintSet.
+        """
+        seen = FingerprintSet()
+        for chunk in self.iter_csv_chunks(csv_file, chunksize):
+            rows_read = len(chunk)
+            chunk = self.standardize_rows(chunk, verbose=False)
+            chunk, fingerprints = self.deduplicate(chunk, data_type, seen)
+            yield rows_read, chunk, fingerprints
+    
+    def iter_cleaned_chunks(self, data_type, chunksize=250_000):
+        """Yield the cleaned rows of every raw shard of a dataset chunk by chunk, as build_store() writes them.
+        
+        Shards are read in sorted order and each record identity is kept once
+        across all of them, so the rows are exactly those the store holds.
+        """
+        folder_path = {
+            "enrolment": self.enrolment_path,
+            "demographic": self.demographic_path,
+            "biometric": self.biometric_path,
+        }[data_type]
+        seen = FingerprintSet()
+        for csv_file in sorted(Path(folder_path).rglob("*.csv")):
+            print(f"  Cleaning {csv_file.name}...")
+            for _, chunk, fingerprints in self.iter_clean_chunks(csv_file, data_type, chunksize):
+                yield chunk[seen.add_new(fingerprints)]
+    
+    def aggregate_partial(self, df, data_type):
+        """Reduce cleaned rows to summed counts per (state, district, date), and per area for enrolments"""
+        keys = list(self.partial_keys)
+        if data_type == "enrolment":
+            df = self.classify_areas(df)
+            if 'area' in df.columns:
+                keys.append('area')
+        value_cols = [col for col in self.value_columns[data_type] if col in df.columns]
+        return df.groupby(keys, sort=False, observed=True)[value_cols].sum()
+    
+    def merge_partials(self, partials):
+        """Fold a list of partial aggregates into one"""
+        partials = [p for p in partials if p is not None]
+        if not partials:
+            return None
+        if len(partials) == 1:
+            return partials[0]
+        return pd.concat(partials).groupby(level=list(partials[0].index.names), sort=False).sum()
+    
+    def reduce_shard(self, csv_file, data_type, chunksize):
+        """Map step: parse, clean and partially aggregate a single shard.
+        
+        Returns a dict with the partial aggregate, one 64-bit identity
+        fingerprint per kept row, the rows read, the duplicates dropped within
+        the shard and the unseen state spellings. Results stay small however
+        large the shard is.
+        """
+        # Collect unseen spellings and duplicates per shard so worker processes can report them
+        unseen = self.state_canonicalizer.unseen
+        self.state_canonicalizer.unseen = Counter()
+        self.duplicates_dropped = 0
+        
+        running = None
+        fingerprints = []
+        rows_read = 0
+        for chunk_rows, chunk, chunk_fps in self.iter_clean_chunks(csv_file, data_type, chunksize):
+            rows_read += chunk_rows
+            fingerprints.append(chunk_fps)
+            running = self.merge_partials([running, self.aggregate_partial(chunk, data_type)])
+        
+        shard_unseen = self.state_canonicalizer.unseen
+        self.state_canonicalizer.unseen = unseen
+        duplicates = self.duplicates_dropped
+        
+        fingerprints = np.concatenate(fingerprints) if fingerprints else np.empty(0, dtype=np.uint64)
+        print(f"  Reduced {Path(csv_file).name}: {rows_read} rows -> {len(fingerprints)} clean rows")
+        return {
+            'partial': running,
+            'fingerprints': fingerprints,
+            'rows': rows_read,
+            'duplicates': duplicates,
+            'unseen': shard_unseen,
+        }
+    
+    def duplicate_partial(self, csv_file, data_type, chunksize, fingerprints):
+        """Partial aggregate of the rows of a shard whose fingerprint is in `fingerprints`"""
+        partials = []
+        for _, chunk, chunk_fps in self.iter_clean_chunks(csv_file, data_type, chunksize):
+            mask = np.isin(chunk_fps, fingerprints)
+            if mask.any():
+                partials.append(self.aggregate_partial(chunk[mask], data_type))
+        return self.merge_partials(partials)
+    
+    def combine_shards(self, data_type, csv_files, shard_results, chunksize):
+        """Reduce step: merge per-shard partials into one aggregate frame.
+        
+        Each distinct record is counted once across all shards: a FingerprintSet
+        spanning the shards finds records already kept from an earlier shard,
+        and their contribution is removed from the later shard's partial.
+        """
+        if not shard_results:
+            return None
+        
+        merged = self.merge_partials([result['partial'] for result in shard_results])
+        if merged is None:
+            return None
+        
+        seen = FingerprintSet()
+        corrections = []
+        print(f"  {data_type} duplicates per shard (within / across shards):")
+        for csv_file, result in zip(csv_files, shard_results):
+            fingerprints = result['fingerprints']
+            repeated = fingerprints[~seen.add_new(fingerprints)]
+            print(f"    {Path(csv_file).name}: {result['duplicates']:,} / {len(repeated):,}")
+            if len(repeated):
+                corrections.append(self.duplicate_partial(csv_file, data_type, chunksize, repeated))
+        
+        correction = self.merge_partials(corrections)
+        if correction is not None:
+            dtypes = merged.dtypes.to_dict()
+            merged = merged.sub(correction.reindex(merged.index), fill_value=0).astype(dtypes)
+        
+        rows_read = sum(result['rows'] for result in shard_results)
+        print(f"  {data_type}: {rows_read:,} rows read, {len(seen):,} after cleaning, "
+              f"{len(merged):,} aggregate rows\n")
+        return merged.reset_index()
+    
+    def file_digest(self, path):
+        """SHA-256 of a file, read in 1 MB blocks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def config_digest(self):
+        """Fingerprint of every setting that changes what a shard reduces to"""
+        config = {
+            'version': 7,
+            'state_normalization': self.state_normalization,
+            'invalid_states': sorted(self.invalid_states),
+            'value_columns': self.value_columns,
+            'partial_keys': self.partial_keys,
+            # Cached enrolment partials hold area codes from this mapping
+            'pincode_mapping': self.pincode_index.source.get('sha256') if self.pincode_index else None,
+        }
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def load_manifest(self, path=None):
+        """Load a shard manifest, discarding it if it was built with other settings"""
+        path = path or self.manifest_path
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('config') == self.config_digest():
+                return manifest
+            print("Shard cache was built with different settings, reprocessing all shards")
+        return {'config': self.config_digest(), 'shards': {}}
+    
+    def save_manifest(self, manifest, path=None):
+        """Write a manifest atomically so an interrupted run never leaves it half-written"""
+        path = path or self.manifest_path
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    
+    def shard_key(self, csv_file):
+        """Manifest key of a shard: its path relative to the base path"""
+        return Path(os.path.relpath(csv_file, self.base_path)).as_posix()
+    
+    def cached_shard(self, manifest, csv_file, data_type):
+        """Return the persisted result for an unchanged shard, else None"""
+        entry = manifest['shards'].get(self.shard_key(csv_file))
+        if entry is None or entry['data_type'] != data_type:
+            return None
+        
+        partial_path = self.cache_dir / entry['partial']
+        if not partial_path.exists():
             return None
         
-        print(f"Cleaning {data_type} data...")
+        stat = Path(csv_file).stat()
+        if entry['size'] != stat.st_size:
+            return None
+        if entry['mtime'] != stat.st_mtime:
+            # Touched but maybe not modified: trust the content hash
+            if self.file_digest(csv_file) != entry['sha256']:
+                return None
+            entry['mtime'] = stat.st_mtime
+        
+        return pd.read_pickle(partial_path)
+    
+    def store_shard(self, manifest, csv_file, data_type, result, folder='partials'):
+        """Persist a shard's result under cache_dir/`folder` and record the shard in the manifest"""
+        stat = Path(csv_file).stat()
+        sha256 = self.file_digest(csv_file)
+        partial_name = f"{folder}/{data_type}_{sha256[:20]}.pkl"
+        
+        partial_path = self.cache_dir / partial_name
+        partial_path.parent.mkdir(parents=True, exist_ok=True)
+        pd.to_pickle(result, partial_path)
+        
+        manifest['shards'][self.shard_key(csv_file)] = {
+            'data_type': data_type,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sha256': sha256,
+            'rows': result['rows'],
+            'partial': partial_name,
+        }
+    
+    def prune_manifest(self, manifest, live_keys, folder='partials'):
+        """Forget shards that are no longer on disk and delete their files in cache_dir/`folder`"""
+        referenced = set()
+        for key in list(manifest['shards']):
+            if key not in live_keys:
+                del manifest['shards'][key]
+            else:
+                referenced.add(manifest['shards'][key]['partial'])
+        
+        partials_dir = self.cache_dir / folder
+        if partials_dir.exists():
+            for partial_path in partials_dir.glob('*.pkl'):
+                if f"{folder}/{partial_path.name}" not in referenced:
+                    partial_path.unlink()
+    
+    def stream_datasets(self, chunksize=250_000, workers=1, incremental=False):
+        """Stream every shard of every dataset into (state, district, date) aggregates.
+        
+        Each shard is read in bounded chunks, so peak memory does not grow with
+        the number of shards. With workers > 1 shards are reduced in a process
+        pool and merged here; the result is identical to workers=1. With
+        incremental=True only shards that are new or changed since the last run
+        are parsed; the rest are loaded from the shard cache.
+        """
+        folders = {
+            "enrolment": self.enrolment_path,
+            "demographic": self.demographic_path,
+            "biometric": self.biometric_path,
+        }
+        
+        jobs = []
+        for data_type, folder_path in folders.items():
+            csv_files = sorted(Path(folder_path).rglob("*.csv"))
+            if not csv_files:
+                print(f"Warning: No CSV files found in {folder_path}")
+            jobs.extend((data_type, csv_file) for csv_file in csv_files)
+        
+        results = [None] * len(jobs)
+        if incremental:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            manifest = self.load_manifest()
+            for i, (data_type, csv_file) in enumerate(jobs):
+                results[i] = self.cached_shard(manifest, csv_file, data_type)
+            print(f"Shard cache: {sum(r is not None for r in results)} of {len(jobs)} shards unchanged")
+        
+        pending = [i for i, result in enumerate(results) if result is None]
+        print(f"Streaming {len(pending)} CSV shards ({chunksize:,} rows per chunk, {workers} worker(s))...")
+        
+        if workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {i: pool.submit(self.reduce_shard, jobs[i][1], jobs[i][0], chunksize)
+                           for i in pending}
+                for i, future in futures.items():
+                    results[i] = future.result()
+        else:
+            for i in pending:
+                results[i] = self.reduce_shard(jobs[i][1], jobs[i][0], chunksize)
+        print()
+        
+        if incremental:
+            for i in pending:
+                self.store_shard(manifest, jobs[i][1], jobs[i][0], results[i])
+            self.prune_manifest(manifest, {self.shard_key(csv_file) for _, csv_file in jobs})
+            self.save_manifest(manifest)
+        
+        frames = {}
+        for data_type in folders:
+            shard_jobs = [(job[1], result) for job, result in zip(jobs, results) if job[0] == data_type]
+            for _, result in shard_jobs:
+                self.state_canonicalizer.unseen.update(result['unseen'])
+            frames[data_type] = self.combine_shards(
+                data_type,
+                [csv_file for csv_file, _ in shard_jobs],
+                [result for _, result in shard_jobs],
+                chunksize,
+            )
+        return frames
+    
+    def clean_shard(self, csv_file, data_type, chunksize):
+        """Cleaned rows of a single shard with their identity fingerprints, repeats within the shard dropped"""
+        chunks, fingerprints, rows_read = [], [], 0
+        undated = self.undated_dropped
+        for chunk_rows, chunk, chunk_fps in self.iter_clean_chunks(csv_file, data_type, chunksize):
+            rows_read += chunk_rows
+            chunks.append(chunk)
+            fingerprints.append(chunk_fps)
+        return {
+            'clean': pd.concat(chunks, ignore_index=True) if chunks else None,
+            'fingerprints': np.concatenate(fingerprints) if fingerprints else np.empty(0, dtype=np.uint64),
+            'rows': rows_read,
+            'undated': self.undated_dropped - undated,
+        }
+    
+    def build_store(self, chunksize=250_000, incremental=False):
+        """Parse every raw shard once and write the cleaned rows to the shared store.
+        
+        Shards are read in bounded chunks; records repeated within or across
+        shards are written once, as in clean_data. With incremental=True the
+        cleaned rows of shards unchanged since the last build are loaded from
+        the shard cache instead of being parsed again.
+        """
+        folders = {
+            "enrolment": self.enrolment_path,
+            "demographic": self.demographic_path,
+            "biometric": self.biometric_path,
+        }
         
+        manifest = None
+        if incremental:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            manifest = self.load_manifest(self.store_manifest_path)
+        
+        print(f"Building cleaned store at {self.store.root}...")
+        live_keys = set()
+        for data_type, folder_path in folders.items():
+            csv_files = sorted(Path(folder_path).rglob("*.csv"))
+            if not csv_files:
+                print(f"Warning: No CSV files found in {folder_path}")
+                continue
+            
+            staging = self.store.begin(data_type)
+            seen = FingerprintSet()
+            written = reused = rows_read = undated = 0
+            for csv_file in csv_files:
+                live_keys.add(self.shard_key(csv_file))
+                cleaned = self.cached_shard(manifest, csv_file, data_type) if incremental else None
+                if cleaned is None:
+                    cleaned = self.clean_shard(csv_file, data_type, chunksize)
+                    if incremental:
+                        self.store_shard(manifest, csv_file, data_type, cleaned, folder='store_shards')
+                else:
+                    reused += 1
+                rows_read += cleaned['rows']
+                undated += cleaned['undated']
+                
+                shard_df = cleaned['clean']
+                if shard_df is not None:
+                    shard_df = shard_df[seen.add_new(cleaned['fingerprints'])]
+                self.store.write_shard(staging, shard_df)
+                written += 0 if shard_df is None else len(shard_df)
+            self.store.write_stats(staging, {'rows': rows_read, 'written': written, 'undated': undated})
+            self.store.commit(data_type, staging)
+            print(f"  {data_type}: {written:,} cleaned rows from {len(csv_files)} shards"
+                  + (f" ({reused} unchanged, from cache)" if incremental else ""))
+            if undated:
+                print(f"  {data_type}: {undated:,} records without a valid date left out")
+        
+        if incremental:
+            self.prune_manifest(manifest, live_keys, folder='store_shards')
+            self.save_manifest(manifest, self.store_manifest_path)
+        print()
+    
+    def load_from_store(self, data_type):
+        """Read only the columns the aggregation steps need from the cleaned store"""
+        columns = self.partial_keys + self.value_columns[data_type]
+        if data_type == "enrolment" and self.pincode_index is not None:
+            columns = columns + ['pincode']
+        df = self.store.read(data_type, columns=columns)
+        if df is None:
+            print(f"Warning: {data_type} not found in cleaned store {self.store.root}")
+            return None
+        if 'pincode' in columns:
+            df = self.classify_areas(df).drop(columns='pincode')
+        print(f"Loaded {len(df):,} {data_type} rows from cleaned store")
+        return df
+    
+    def standardize_rows(self, df, verbose=True):
+        """Standardize columns, dates and state names and drop unusable rows"""
         # Standardize column names
         df.columns = [col.lower().strip().replace(' ', '_') for col in df.columns]
         
-        # Convert date fields
+        # Convert date fields to int32 day numbers, parsing each distinct string once
         if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+            df['date'] = parse_day_numbers(df['date'])
         
         # Normalize state names BEFORE removing nulls
         if 'state' in df.columns:
-            df['state'] = df['state'].apply(self.normalize_state_name)
+            df['state'] = self.state_canonicalizer.canonicalize_series(df['state'])
             # Remove rows with invalid/null states
             initial_count = len(df)
             df = df.dropna(subset=['state'])
             removed = initial_count - len(df)
-            if removed > 0:
+            if removed > 0 and verbose:
                 print(f"  Removed {removed} invalid state entries")
         
         # Remove rows with null dates or locations
-        df = df.dropna(subset=['date', 'district'])
+        if 'date' in df.columns:
+            self.undated_dropped += int(df['date'].isna().sum())
+        return df.dropna(subset=['date', 'district'])
+    
+    def deduplicate(self, df, data_type, seen, verbose=False):
+        """Drop rows whose (date, state, district, pincode) identity is already in `seen`.
+        
+        Returns the kept rows and their fingerprints; `seen` is updated in place
+        so it can carry across chunks and shards.
+        """
+        fingerprints = record_fingerprints(df, data_type)
+        fresh = seen.add_new(fingerprints)
+        removed = len(df) - int(fresh.sum())
+        self.duplicates_dropped += removed
+        if removed > 0 and verbose:
+            print(f"  Removed {removed} duplicate records")
+        return df[fresh], fingerprints[fresh]
+    
+    def clean_data(self, df, data_type, verbose=True):
+        """Clean and standardize dataframe"""
+        if df is None:
+            return None
+        
+        if verbose:
+            print(f"Cleaning {data_type} data...")
+        
+        df = self.standardize_rows(df, verbose)
         
         # Remove duplicates
-        df = df.drop_duplicates()
+        df, _ = self.deduplicate(df, data_type, FingerprintSet(), verbose)
+        
+        if data_type == "enrolment":
+            df = self.classify_areas(df)
         
-        print(f"  After cleaning: {len(df)} rows\n")
+        if verbose:
+            print(f"  After cleaning: {len(df)} rows\n")
         return df
     
+    def sum_by_state(self, df, columns, by_area=False):
+        """Sum the given count columns per state (and area, if asked and known) in a single grouped pass"""
+        if df is None:
+            return None
+        
+        present = [col for col in columns if col in df.columns]
+        keys = ['state', 'area'] if by_area and 'area' in df.columns else 'state'
+        return df.groupby(keys, sort=False, observed=True)[present].sum()
+    
+    def area_ratios(self, by_area):
+        """Rural and urban percentages of each state's classified enrolments"""
+        totals = by_area.sum(axis=1).unstack('area', fill_value=0)
+        rural = totals.get(CLASSIFICATIONS.index('Rural'), 0)
+        urban = totals.get(CLASSIFICATIONS.index('Urban'), 0)
+        classified = (rural + urban).replace(0, np.nan)
+        return pd.DataFrame({
+            'ruralRatio': (rural / classified * 100).round(2),
+            'urbanRatio': (urban / classified * 100).round(2),
+        })
+    
     def aggregate_state_data(self, enrol_df, demo_df, bio_df):
         """Aggregate data by state"""
         print("Aggregating state-level statistics...")
         
-        state_stats = []
+        enrol_cols = {
+            'age_0_5': 'enrolment_0_5',
+            'age_5_17': 'enrolment_5_17',
+            'age_18_greater': 'enrolment_18_plus',
+        }
         
-        # Get unique states
-        all_states = set()
-        if enrol_df is not None:
-            all_states.update(enrol_df['state'].unique())
-        if demo_df is not None:
-            all_states.update(demo_df['state'].unique())
-        if bio_df is not None:
-            all_states.update(bio_df['state'].unique())
-        
-        for state in sorted(all_states):
-            stat = {
-                'state': state,
-                'enrolments': 0,
-                'updates': 0,
-                'childEnrolments': 0, 
-                'enrolment_0_5': 0,
-                'enrolment_5_17': 0,
-                'enrolment_18_plus': 0,
-                'biometricUpdates': 0,
-                'demographicUpdates': 0,
-                'ruralRatio': 0,
-                'urbanRatio': 0
-            }
-            
-            # Enrolment data
-            if enrol_df is not None:
-                state_enrol = enrol_df[enrol_df['state'] == state]
-                if not state_enrol.empty:
-                    # Sum age groups
-                    if 'age_0_5' in state_enrol.columns:
-                        val = int(state_enrol['age_0_5'].sum())
-                        stat['enrolment_0_5'] += val
-                        stat['childEnrolments'] += val # Keeping legacy field for compatibility
-                    if 'age_5_17' in state_enrol.columns:
-                        val = int(state_enrol['age_5_17'].sum())
-                        stat['enrolment_5_17'] += val
-                        stat['childEnrolments'] += val
-                    if 'age_18_greater' in state_enrol.columns:
-                        val = int(state_enrol['age_18_greater'].sum())
-                        stat['enrolment_18_plus'] += val
-                    
-                    stat['enrolments'] = stat['enrolment_0_5'] + stat['enrolment_5_17'] + stat['enrolment_18_plus']
-            
-            # Demographic updates
-            if demo_df is not None:
-                state_demo = demo_df[demo_df['state'] == state]
-                if not state_demo.empty:
-                    if 'demo_age_5_17' in state_demo.columns:
-                        stat['demographicUpdates'] += int(state_demo['demo_age_5_17'].sum())
-                    if 'demo_age_17_' in state_demo.columns:
-                        stat['demographicUpdates'] += int(state_demo['demo_age_17_'].sum())
-                    
-                    stat['updates'] += stat['demographicUpdates']
-            
-            # Biometric updates
-            if bio_df is not None:
-                state_bio = bio_df[bio_df['state'] == state]
-                if not state_bio.empty:
-                    if 'bio_age_5_17' in state_bio.columns:
-                        stat['biometricUpdates'] += int(state_bio['bio_age_5_17'].sum())
-                    if 'bio_age_17_' in state_bio.columns:
-                        stat['biometricUpdates'] += int(state_bio['bio_age_17_'].sum())
-                    
-                    stat['updates'] += stat['biometricUpdates']
-            
-            # Calculate rural/urban ratio (Data Not Available in source)
-            stat['ruralRatio'] = None 
-            stat['urbanRatio'] = None
-            
-            state_stats.append(stat)
+        # One grouped pass per dataset
+        per_dataset = []
+        
+        # Enrolments are grouped by (state, area); state totals and area ratios both come from it
+        ratios = None
+        enrol = self.sum_by_state(enrol_df, enrol_cols, by_area=True)
+        if enrol is not None and 'area' in enrol.index.names:
+            ratios = self.area_ratios(enrol)
+            enrol = enrol.groupby(level='state', sort=False).sum()
+        if enrol is not None:
+            per_dataset.append(enrol.rename(columns=enrol_cols))
+        
+        demo = self.sum_by_state(demo_df, self.value_columns['demographic'])
+        if demo is not None:
+            per_dataset.append(demo.sum(axis=1).rename('demographicUpdates').to_frame())
+        
+        bio = self.sum_by_state(bio_df, self.value_columns['biometric'])
+        if bio is not None:
+            per_dataset.append(bio.sum(axis=1).rename('biometricUpdates').to_frame())
+        
+        if not per_dataset:
+            print("  Aggregated 0 states\n")
+            return []
+        
+        # Outer-join so states present in any dataset are kept
+        stats = pd.concat(per_dataset, axis=1, join='outer')
+        for col in ['enrolment_0_5', 'enrolment_5_17', 'enrolment_18_plus',
+                    'biometricUpdates', 'demographicUpdates']:
+            if col not in stats.columns:
+                stats[col] = 0
+        stats = stats.fillna(0).astype('int64').sort_index()
+        
+        stats['enrolments'] = stats['enrolment_0_5'] + stats['enrolment_5_17'] + stats['enrolment_18_plus']
+        stats['updates'] = stats['demographicUpdates'] + stats['biometricUpdates']
+        stats['childEnrolments'] = stats['enrolment_0_5'] + stats['enrolment_5_17']  # Keeping legacy field for compatibility
+        
+        stats = stats.rename_axis('state').reset_index()[[
+            'state', 'enrolments', 'updates', 'childEnrolments',
+            'enrolment_0_5', 'enrolment_5_17', 'enrolment_18_plus',
+            'biometricUpdates', 'demographicUpdates',
+        ]]
+        
+        state_stats = stats.to_dict('records')
+        for stat in state_stats:
+            # Share of enrolments at rural (BO) and urban (SO/HO) pincodes; None
+            # without the pincode mapping or any classified enrolment
+            ratio = ratios.loc[stat['state']] if ratios is not None and stat['state'] in ratios.index else None
+            if ratio is None or pd.isna(ratio['ruralRatio']):
+                stat['ruralRatio'] = None
+                stat['urbanRatio'] = None
+            else:
+                stat['ruralRatio'] = float(ratio['ruralRatio'])
+                stat['urbanRatio'] = float(ratio['urbanRatio'])
         
         print(f"  Aggregated {len(state_stats)} states\n")
         return state_stats
@@ -234,31 +645,36 @@ class AadhaarDataProcessor:
         
         district_stats = []
         
-        # Process enrolment data
+        # Process enrolment data: one grouped pass over every district
         if enrol_df is not None:
-            for (state, district), group in enrol_df.groupby(['state', 'district']):
-                total_enrol = 0
-                if 'age_0_5' in group.columns:
-                    total_enrol += int(group['age_0_5'].sum())
-                if 'age_5_17' in group.columns:
-                    total_enrol += int(group['age_5_17'].sum())
-                if 'age_18_greater' in group.columns:
-                    total_enrol += int(group['age_18_greater'].sum())
-                
-                # Get coordinates (placeholder - would need real geocoding)
-                lat = 20.0 + (hash(district) % 20)
-                lng = 70.0 + (hash(district) % 30)
+            enrol_cols = [col for col in self.value_columns['enrolment'] if col in enrol_df.columns]
+            totals = enrol_df.groupby(['state', 'district'], observed=True)[enrol_cols].sum().sum(axis=1)
+            
+            # Coordinates come from the district centroids written by preprocess_geo.py;
+            # unmatched districts get null coordinates
+            centroids = CentroidIndex.load(self.output_dir / 'district_centroids.json')
+            matches = Counter()
+            for (state, district), total_enrol in totals.items():
+                lat, lng, how = centroids.match(state, district)
+                matches[how] += 1
                 
                 district_stats.append({
                     'state': state,
                     'district': district,
-                    'enrolments': total_enrol,
+                    'enrolments': int(total_enrol),
                     'lat': lat,
-                    'lng': lng
+                    'lng': lng,
+                    'geoMatch': how,
                 })
+            if centroids.names:
+                print(f"  District coordinates: {matches['name']} by district name (flat centroid file), "
+                      f"{matches['unmatched']} unmatched")
+            else:
+                print(f"  District coordinates: {matches['exact']} exact, {matches['normalized']} by normalized name, "
+                      f"{matches['unmatched']} unmatched")
         
         print(f"  Aggregated {len(district_stats)} districts\n")
-        return district_stats[:500]  # Limit to 500 for performance
+        return district_stats
     
     def generate_time_series(self, enrol_df):
         """Generate time series data for forecasting"""
@@ -282,31 +698,54 @@ class AadhaarDataProcessor:
         )
         
         # Convert to JSON-friendly format
-        ts_data = []
-        for _, row in time_series.iterrows():
-            ts_data.append({
-                'date': row['date'].strftime('%Y-%m-%d'),
-                'enrolments': int(row['total_enrolments'])
-            })
+        ts_data = [
+            {'date': date, 'enrolments': int(total)}
+            for date, total in zip(
+                format_day_numbers(time_series['date'], '%Y-%m-%d'),
+                time_series['total_enrolments'],
+            )
+        ]
         
         print(f"  Generated {len(ts_data)} time points\n")
         return ts_data[-90:]  # Last 90 days
     
-    def process_all(self):
-        """Main processing pipeline"""
+    def process_all(self, streaming=False, chunksize=250_000, workers=1, incremental=False, from_store=False):
+        """Main processing pipeline
+        
+        With streaming=True each shard is read in chunks of `chunksize` rows and
+        folded into (state, district, date) aggregates instead of being loaded
+        whole, using `workers` processes; incremental=True additionally reuses
+        the persisted partials of unchanged shards. from_store=True reads the
+        cleaned store written by build_store() instead of the raw CSVs. The
+        aggregation steps below produce the same output either way.
+        """
         print("="*60)
         print("AADHAAR DATA PROCESSING PIPELINE")
         print("="*60 + "\n")
         
-        # Load data
-        enrol_df = self.load_csv_files(self.enrolment_path)
-        demo_df = self.load_csv_files(self.demographic_path)
-        bio_df = self.load_csv_files(self.biometric_path)
+        self.load_pincode_index()
+        
+        if from_store:
+            enrol_df = self.load_from_store("enrolment")
+            demo_df = self.load_from_store("demographic")
+            bio_df = self.load_from_store("biometric")
+        elif streaming:
+            frames = self.stream_datasets(chunksize, workers, incremental)
+            enrol_df = frames["enrolment"]
+            demo_df = frames["demographic"]
+            bio_df = frames["biometric"]
+        else:
+            # Load data
+            enrol_df = self.load_csv_files(self.enrolment_path)
+            demo_df = self.load_csv_files(self.demographic_path)
+            bio_df = self.load_csv_files(self.biometric_path)
+            
+            # Clean data
+            enrol_df = self.clean_data(enrol_df, "enrolment")
+            demo_df = self.clean_data(demo_df, "demographic")
+            bio_df = self.clean_data(bio_df, "biometric")
         
-        # Clean data
-        enrol_df = self.clean_data(enrol_df, "enrolment")
-        demo_df = self.clean_data(demo_df, "demographic")
-        bio_df = self.clean_data(bio_df, "biometric")
+        self.state_canonicalizer.report_unseen()
         
         # Aggregate data
         state_data = self.aggregate_state_data(enrol_df, demo_df, bio_df)
@@ -352,5 +791,38 @@ class AadhaarDataProcessor:
         return output_data
 
 if __name__ == "__main__":
-    processor = AadhaarDataProcessor()
-    processor.process_all()
+    parser = argparse.ArgumentParser(description="Process raw Aadhaar CSV shards into aadhaar_data.json")
+    parser.add_argument("--base-path", default=REPO_ROOT,
+                        help="Directory holding the raw shard folders (defaults to the repository root)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read shards in bounded chunks instead of loading them whole")
+    parser.add_argument("--chunksize", type=int, default=250_000,
+                        help="Rows per chunk in streaming mode")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes reducing shards in parallel (implies --stream, 0 = all cores)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only parse new or changed shards, reusing cached results "
+                             "(with --build-store, the cached cleaned rows; otherwise implies --stream)")
+    parser.add_argument("--build-store", action="store_true",
+                        help="Write the cleaned Parquet store from the raw CSVs, then aggregate from it")
+    parser.add_argument("--store-only", action="store_true",
+                        help="With --build-store, only write the cleaned store and skip the aggregation")
+    parser.add_argument("--from-store", action="store_true",
+                        help="Aggregate from the existing cleaned store instead of the raw CSVs")
+    args = parser.parse_args()
+    
+    if args.store_only and not args.build_store:
+        parser.error("--store-only requires --build-store")
+    
+    workers = args.workers or os.cpu_count()
+    processor = AadhaarDataProcessor(args.base_path)
+    if args.build_store:
+        processor.build_store(chunksize=args.chunksize, incremental=args.incremental)
+    if not args.store_only:
+        processor.process_all(
+            streaming=args.stream or workers > 1 or (args.incremental and not args.build_store),
+            chunksize=args.chunksize,
+            workers=workers,
+            incremental=args.incremental,
+            from_store=args.build_store or args.from_store,
+        )
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+# Every offline script resolves its inputs and outputs from the repository root,
+# so they can be run from any working directory
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Raw UIDAI shards
+ENROLMENT_DIR = REPO_ROOT / 'api_data_aadhar_enrolment' / 'api_data_aadhar_enrolment'
+DEMOGRAPHIC_DIR = REPO_ROOT / 'api_data_aadhar_demographic' / 'api_data_aadhar_demographic'
+BIOMETRIC_DIR = REPO_ROOT / 'api_data_aadhar_biometric' / 'api_data_aadhar_biometric'
+
+# Reference data
+DISTRICT_LAT_LONG_CSV = REPO_ROOT / 'district_lat_long' / 'district_lat_long.csv'
+PINCODE_MAPPING_CSV = REPO_ROOT / 'pincode mapping' / 'pincode_mapping.csv'
+
+# Outputs
+DATA_DIR = REPO_ROOT / 'aadhaariq' / 'data'
+ASSETS_DIR = REPO_ROOT / 'aadhaariq' / 'public' / 'assets'
+CACHE_DIR = REPO_ROOT / '.aadhaar_cache'
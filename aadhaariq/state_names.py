@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from collections import Counter
+
+# State name normalization mapping
+STATE_NORMALIZATION = {
+    # West Bengal variants
+    "WEST BENGAL": "West Bengal",
+    "WESTBENGAL": "West Bengal",
+    "West  Bengal": "West Bengal",
+    "West Bangal": "West Bengal",
+    "West Bengli": "West Bengal",
+    "west Bengal": "West Bengal",
+    "Westbengal": "West Bengal",
+
+    # Jammu & Kashmir variants
+    "Jammu & Kashmir": "Jammu and Kashmir",
+    "Jammu And Kashmir": "Jammu and Kashmir",
+
+    # Odisha variants
+    "ODISHA": "Odisha",
+    "Orissa": "Odisha",
+    "odisha": "Odisha",
+
+    # Andaman & Nicobar variants
+    "Andaman & Nicobar Islands": "Andaman and Nicobar Islands",
+
+    # Dadra & Nagar Haveli variants
+    "Dadra & Nagar Haveli": "Dadra and Nagar Haveli",
+    "The Dadra And Nagar Haveli And Daman And Diu": "Dadra and Nagar Haveli and Daman and Diu",
+
+    # Daman & Diu variants
+    "Daman & Diu": "Daman and Diu",
+
+    # Chhattisgarh variant
+    "Chhatisgarh": "Chhattisgarh",
+
+    # Andhra Pradesh variant
+    "andhra pradesh": "Andhra Pradesh",
+
+    # Tamil Nadu variant
+    "Tamilnadu": "Tamil Nadu",
+
+    # Uttarakhand variant
+    "Uttaranchal": "Uttarakhand",
+
+    # Puducherry variant
+    "Pondicherry": "Puducherry",
+}
+
+# Invalid states to remove (test data, city names, etc.)
+INVALID_STATES = {
+    "100000",  # Test entry
+    "BALANAGAR",  # City name
+    "Darbhanga",  # City name
+    "Jaipur",  # City name
+    "Madanapalle",  # City name
+    "Nagpur",  # City name
+    "Puttenahalli",  # Area name
+    "Raja Annamalai Puram",  # Area name
+}
+
+# Official spellings already seen in the UIDAI dumps (kept as-is)
+CANONICAL_STATES = {
+    "Andaman and Nicobar Islands", "Andhra Pradesh", "Arunachal Pradesh", "Assam",
+    "Bihar", "Chandigarh", "Chhattisgarh", "Dadra and Nagar Haveli",
+    "Dadra and Nagar Haveli and Daman and Diu", "Daman and Diu", "Delhi", "Goa",
+    "Gujarat", "Haryana", "Himachal Pradesh", "Jammu and Kashmir", "Jharkhand",
+    "Karnataka", "Kerala", "Ladakh", "Lakshadweep", "Madhya Pradesh", "Maharashtra",
+    "Manipur", "Meghalaya", "Mizoram", "Nagaland", "Odisha", "Puducherry", "Punjab",
+    "Rajasthan", "Sikkim", "Tamil Nadu", "Telangana", "Tripura", "Uttar Pradesh",
+    "Uttarakhand", "West Bengal",
+}
+
+
+class StateCanonicalizer:
+    """
+    Maps raw state spellings to canonical names through a precomputed lookup table.
+    Whole columns are canonicalized once per distinct value and returned as categoricals.
+    """
+
+    def __init__(self, normalization=None, invalid_states=None, canonical_states=None, fold_case=False):
+        self.normalization = STATE_NORMALIZATION if normalization is None else normalization
+        self.invalid_states = INVALID_STATES if invalid_states is None else invalid_states
+        self.canonical_states = CANONICAL_STATES if canonical_states is None else canonical_states
+        self.fold_case = fold_case
+
+        # Raw spelling -> canonical name (None = drop the row)
+        self.lookup = {}
+        for name in set(self.canonical_states) | set(self.normalization.values()):
+            self.lookup[self._key(name)] = name
+        for raw, name in self.normalization.items():
+            self.lookup[self._key(raw)] = name
+        for raw in self.invalid_states:
+            self.lookup[self._key(raw)] = None
+
+        # Spellings not covered by the table, with the number of rows carrying them
+        self.unseen = Counter()
+
+    def _key(self, name):
+        return name.casefold() if self.fold_case else name
+
+    def canonicalize(self, state_name):
+        """Normalize a single state name to its official format"""
+        if pd.isna(state_name):
+            return None
+
+        state_name = str(state_name).strip()
+        key = self._key(state_name)
+        if key in self.lookup:
+            return self.lookup[key]
+
+        # Unknown spellings pass through unchanged
+        return state_name
+
+    def canonicalize_series(self, series):
+        """Canonicalize a whole column, calling canonicalize() once per distinct value"""
+        codes, uniques = pd.factorize(series)
+
+        canonical = []
+        for raw, count in zip(uniques, np.bincount(codes[codes >= 0], minlength=len(uniques))):
+            name = self.canonicalize(raw)
+            if name is not None and self._key(str(raw).strip()) not in self.lookup:
+                self.unseen[str(raw)] += int(count)
+            canonical.append(name)
+
+        categories = sorted({name for name in canonical if name is not None})
+        position = {name: i for i, name in enumerate(categories)}
+        remap = np.array([position.get(name, -1) if name is not None else -1 for name in canonical] + [-1])
+
+        # codes == -1 (missing values) index the trailing -1
+        return pd.Series(
+            pd.Categorical.from_codes(remap[codes], categories=categories),
+            index=series.index,
+            name=series.name,
+        )
+
+    def report_unseen(self):
+        """Print spellings that were not in the lookup table"""
+        if not self.unseen:
+            return
+        print(f"  Unseen state spellings ({len(self.unseen)}), kept as-is:")
+        for name, count in self.unseen.most_common():
+            print(f"    {name!r}: {count:,} rows")
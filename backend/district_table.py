@@ -0,0 +1,56 @@
+from array import array
+from math import isnan, nan
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+from state_index import canonical_key
+
+
+class DistrictTable:
+    """
+    Column-oriented district table sorted by canonical state key and district.
+    Numeric columns are packed arrays and each state's districts form a
+    contiguous slice, so pages and per-state views are plain index ranges.
+    """
+
+    FIELDS = ('state', 'district', 'enrolments', 'lat', 'lng')
+
+    def __init__(self, records: Sequence[dict]):
+        rows = sorted(records, key=lambda d: (canonical_key(d['state']), d['state'], d['district']))
+
+        self.state = [d['state'] for d in rows]
+        self.district = [d['district'] for d in rows]
+        self.enrolments = array('q', (int(d['enrolments']) for d in rows))
+        # Districts without a matched centroid have null coordinates, stored as NaN
+        self.lat = array('d', (nan if d.get('lat') is None else float(d['lat']) for d in rows))
+        self.lng = array('d', (nan if d.get('lng') is None else float(d['lng']) for d in rows))
+
+        # Sort keys for cursor (keyset) pagination
+        self.keys = [(canonical_key(state), state, district) for state, district in zip(self.state, self.district)]
+
+        # Canonical state key -> (start, stop) slice of the table
+        self.state_slices: Dict[str, Tuple[int, int]] = {}
+        for i, (key, _, _) in enumerate(self.keys):
+            start, _ = self.state_slices.get(key, (i, i))
+            self.state_slices[key] = (start, i + 1)
+
+    def __len__(self):
+        return len(self.state)
+
+    def state_slice(self, state: str) -> Optional[Tuple[int, int]]:
+        """Row range of a state's districts (any known spelling), or None for an unknown state"""
+        return self.state_slices.get(canonical_key(state))
+
+    def position_after(self, cursor: Tuple[str, str, str]) -> int:
+        """Index of the first row sorting after a cursor taken from `keys`"""
+        return bisect_right(self.keys, cursor)
+
+    def rows(self, start: int, stop: int, fields: Sequence[str] = FIELDS) -> List[dict]:
+        """Materialize rows [start, stop) with only the requested fields"""
+        columns = [(field, getattr(self, field)) for field in fields]
+        rows = [{field: column[i] for field, column in columns} for i in range(start, stop)]
+        for field in ('lat', 'lng'):
+            if field in fields:
+                for row in rows:
+                    if isnan(row[field]):
+                        row[field] = None
+        return rows
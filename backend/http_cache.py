@@ -0,0 +1,138 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: responses are gzip-compressed without it
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1000
+
+# Compression levels for bodies compressed ahead of time and on first request
+PRECOMPRESS_LEVELS = {'br': 11, 'gzip': 9}
+ON_DEMAND_LEVELS = {'br': 5, 'gzip': 6}
+
+
+def resource_key(path: str, query_items: Iterable[Tuple[str, str]]) -> str:
+    """Path plus sorted query parameters: equal keys always get the same body within a snapshot"""
+    query = '&'.join(f"{k}={v}" for k, v in sorted(query_items))
+    return f"{path}?{query}" if query else path
+
+
+def make_etag(version: str, key: str) -> str:
+    """Weak validator: the body depends only on the snapshot and the request, not the encoding"""
+    return f'W/"{version}-{hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]}"'
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+def not_modified(if_none_match: Optional[str], if_modified_since: Optional[str],
+                 etag: str, modified_at: float) -> bool:
+    """Whether a conditional GET can be answered with 304 (If-None-Match wins over If-Modified-Since)"""
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        opaque = etag[2:] if etag.startswith('W/') else etag
+        return any(tag == '*' or (tag[2:] if tag.startswith('W/') else tag) == opaque for tag in tags)
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(modified_at) <= since
+    return False
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """'br' or 'gzip' if the client accepts it (brotli only when installed), else None"""
+    accepted = set()
+    for part in (accept_encoding or '').split(','):
+        token, _, params = part.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q=') and q[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        accepted.add(token.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class CompressionCache:
+    """
+    Compressed response bodies keyed by (ETag, encoding) for the
+    active snapshot version, bounded by total size (least recently used
+    first out). activate() switches to a new version and drops every entry
+    of the old one; bodies of any other version are never stored or served.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.version: Optional[str] = None
+        self.entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self.size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def activate(self, version: str):
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self.entries.clear()
+                self.size = 0
+
+    def get(self, version: str, key: str, encoding: str) -> Optional[bytes]:
+        with self._lock:
+            if version != self.version:
+                return None
+            body = self.entries.get((key, encoding))
+            if body is not None:
+                self.entries.move_to_end((key, encoding))
+            return body
+
+    def put(self, version: str, key: str, encoding: str, body: bytes):
+        with self._lock:
+            # A request still finishing on an older snapshot must not evict the new one
+            if version != self.version:
+                return
+            old = self.entries.pop((key, encoding), None)
+            if old is not None:
+                self.size -= len(old)
+            self.entries[(key, encoding)] = body
+            self.size += len(body)
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def compressed(self, version: str, key: str, encoding: str, body: bytes) -> bytes:
+        """The body compressed with `encoding`, compressing it only on the first request"""
+        cached = self.get(version, key, encoding)
+        if cached is None:
+            cached = compress(body, encoding, ON_DEMAND_LEVELS[encoding])
+            self.put(version, key, encoding, cached)
+        return cached
+
+    def precompress(self, version: str, bodies: Iterable[Tuple[str, bytes]]):
+        """Activate a new snapshot version and compress its known bodies ahead of time"""
+        self.activate(version)
+        encodings = ['gzip'] + (['br'] if brotli is not None else [])
+        for key, body in bodies:
+            if len(body) < MIN_COMPRESS_SIZE:
+                continue
+            for encoding in encodings:
+                self.put(version, key, encoding, compress(body, encoding, PRECOMPRESS_LEVELS[encoding]))
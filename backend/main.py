@@ -1,235 +1,318 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
 from typing import List, Optional, Dict
+import base64
+import hmac
 import json
 import os
-import math
 import datetime
+from district_table import DistrictTable
+from http_cache import (
+    MIN_COMPRESS_SIZE, CompressionCache, choose_encoding, http_date, make_etag, not_modified, resource_key,
+)
+from snapshot import DataSnapshot, SnapshotError, SnapshotStore, StateData
+from state_index import canonical_key
 
 app = FastAPI()
 
+# The data served, swapped whole on reload
+store = SnapshotStore()
+
+# Compressed bodies of the current snapshot's responses
+compression_cache = CompressionCache()
+
+# Routes serving a body pre-encoded per snapshot, by the name of that body
+STATIC_ROUTES = {
+    "/api/dashboard/stats": "stats",
+    "/api/states": "states",
+    "/api/ml/clusters": "clusters",
+    "/api/ml/rural-urban": "rural_urban",
+    "/api/recommendations": "recommendations",
+}
+
+def precompress_snapshot(snapshot: DataSnapshot):
+    """Compress a newly loaded snapshot's static bodies and assets before they are requested"""
+    bodies = [(path, snapshot.static[name]) for path, name in STATIC_ROUTES.items()]
+    bodies += [(f"/api/assets/{name}", raw) for name, raw in snapshot.assets.items()]
+    compression_cache.precompress(
+        snapshot.version,
+        [(make_etag(snapshot.version, resource_key(path, [])), body) for path, body in bodies],
+    )
+
+store.listeners.append(precompress_snapshot)
+try:
+    store.reload()
+except SnapshotError:
+    pass
+
+def cacheable(request: Request) -> bool:
+    path = request.url.path
+    return request.method == "GET" and path.startswith("/api/") and not path.startswith("/api/admin/")
+
+def answered_by_snapshot(path: str, snapshot: DataSnapshot) -> bool:
+    """Whether a path is served a 200 from the snapshot alone, whatever the query,
+    so that a conditional request for it can be answered before routing"""
+    if path in STATIC_ROUTES or path == "/api/urban-rural":
+        return True
+    prefix = "/api/urban-rural/"
+    if path.startswith(prefix):
+        return canonical_key(path[len(prefix):]) in snapshot.velocity_shards
+    prefix = "/api/assets/"
+    return path.startswith(prefix) and path[len(prefix):] in snapshot.assets
+
+async def drain(response):
+    """Let the endpoint finish sending a body that is not going to be used"""
+    async for _ in response.body_iterator:
+        pass
+
+# Registered before CORS so that 304s still get the CORS headers
+@app.middleware("http")
+async def conditional_response(request: Request, call_next):
+    """ETag/Last-Modified validation and compression of API responses.
+    
+    A response is a function of the snapshot version and the path and query,
+    so the ETag is known before the endpoint runs. For bodies held in the
+    snapshot a matching If-None-Match is answered with 304 without routing;
+    any other request is routed first and only a 200 is turned into a 304,
+    so unknown paths and invalid parameters still get their error. Compressed
+    bodies are cached by ETag, so a computed body is read into memory only
+    the first time it is compressed; uncompressed bodies stream through. The
+    snapshot is taken here so the validators and the body always agree.
+    """
+    if not cacheable(request):
+        return await call_next(request)
+    snapshot = store.current
+    request.state.snapshot = snapshot
+    etag = make_etag(snapshot.version, resource_key(request.url.path, request.query_params.multi_items()))
+    validators = {
+        "ETag": etag,
+        "Last-Modified": http_date(snapshot.modified_at),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    matches = not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since"),
+                           etag, snapshot.modified_at)
+    if matches and answered_by_snapshot(request.url.path, snapshot):
+        return Response(status_code=304, headers={**validators, "X-Data-Version": snapshot.version})
+
+    response = await call_next(request)
+    if response.status_code != 200 or "content-encoding" in response.headers:
+        return response
+    if matches:
+        # The endpoint accepted the parameters, so the client's copy is current
+        await drain(response)
+        return Response(status_code=304, headers={**validators, "X-Data-Version": snapshot.version})
+
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    length = response.headers.get("content-length")
+    if encoding is None or (length is not None and int(length) < MIN_COMPRESS_SIZE):
+        response.headers.update(validators)
+        return response
+
+    body = compression_cache.get(snapshot.version, etag, encoding)
+    if body is None:
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        if len(body) < MIN_COMPRESS_SIZE:
+            encoding = None
+        else:
+            body = compression_cache.compressed(snapshot.version, etag, encoding, body)
+    else:
+        await drain(response)
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    headers.update(validators)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=200, headers=headers)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "X-Data-Version", "ETag"],
 )
 
-# In-memory storage for cached data
-data_cache = {}
+# Seconds between checks of the source files for changes (0 = no watcher)
+WATCH_INTERVAL = float(os.getenv("AADHAARIQ_WATCH_INTERVAL", "5"))
 
-def load_all_data():
-    base_path = os.path.join(os.path.dirname(__file__), "..", "aadhaariq", "data")
-    try:
-        with open(os.path.join(base_path, "aadhaar_data.json"), "r") as f:
-            data_cache['aadhaar_data'] = json.load(f)
-            data_cache['states'] = data_cache['aadhaar_data'].get('states', [])
-            data_cache['districts'] = data_cache['aadhaar_data'].get('districts', [])
-            data_cache['timeSeries'] = data_cache['aadhaar_data'].get('timeSeries', [])
-        
-        with open(os.path.join(base_path, "analytics_report.json"), "r") as f:
-            data_cache['analytics_report'] = json.load(f)
-    except Exception as e:
-        print(f"Error loading data: {e}")
-
-load_all_data()
-
-class StateData(BaseModel):
-    state: str
-    enrolments: int
-    updates: int
-    childEnrolments: int
-    enrolment_0_5: int
-    enrolment_5_17: int
-    enrolment_18_plus: int
-    biometricUpdates: int
-    demographicUpdates: int
-    ruralRatio: Optional[float] = None
-    urbanRatio: Optional[float] = None
-
-class DistrictData(BaseModel):
-    state: str
-    district: str
-    enrolments: int
-    lat: float
-    lng: float
+@app.on_event("startup")
+async def start_watcher():
+    store.watch(WATCH_INTERVAL)
+
+@app.on_event("shutdown")
+async def stop_watcher():
+    store.stop()
+
+def current_snapshot(request: Request, response: Response) -> DataSnapshot:
+    """The snapshot a request is served from, taken once; its version goes in X-Data-Version"""
+    snapshot = getattr(request.state, "snapshot", None) or store.current
+    response.headers["X-Data-Version"] = snapshot.version
+    return snapshot
+
+def static_response(snapshot: DataSnapshot, name: str) -> Response:
+    """A body pre-encoded when the snapshot was built, sent as-is"""
+    return Response(
+        content=snapshot.static[name],
+        media_type="application/json",
+        headers={"X-Data-Version": snapshot.version},
+    )
 
 @app.get("/")
-async def root():
-    return {"status": "ok", "message": "AadhaarIQ Backend API"}
+async def root(snapshot: DataSnapshot = Depends(current_snapshot)):
+    return {"status": "ok", "message": "AadhaarIQ Backend API", "version": snapshot.version}
+
+@app.post("/api/admin/reload")
+async def reload_data(x_admin_token: Optional[str] = Header(None)):
+    """Rebuild the snapshot from the files on disk and swap it in if it validates.
+    
+    Requires the X-Admin-Token header to match AADHAARIQ_ADMIN_TOKEN; the
+    endpoint is disabled when that variable is unset.
+    """
+    expected = os.getenv("AADHAARIQ_ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Reload endpoint disabled")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode('utf-8'), expected.encode('utf-8')):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    try:
+        snapshot, changed = await run_in_threadpool(store.reload)
+    except SnapshotError as e:
+        raise HTTPException(status_code=422, detail=f"Data not reloaded, still serving {store.current.version}: {e}")
+    return {"version": snapshot.version, "changed": changed}
+
+@app.get("/api/assets/{name}")
+async def get_asset(name: str, snapshot: DataSnapshot = Depends(current_snapshot)):
+    """A map asset file as loaded into the snapshot, byte for byte"""
+    raw = snapshot.assets.get(name)
+    if raw is None:
+        raise HTTPException(status_code=404, detail=f"No asset {name}")
+    return Response(content=raw, media_type="application/json", headers={"X-Data-Version": snapshot.version})
 
 @app.get("/api/dashboard/stats")
-async def get_stats():
-    return data_cache.get('aadhaar_data', {}).get('summary', {})
+async def get_stats(snapshot: DataSnapshot = Depends(current_snapshot)):
+    return static_response(snapshot, 'stats')
 
 @app.get("/api/states", response_model=List[StateData])
-async def get_states():
-    return data_cache.get('states', [])
+async def get_states(snapshot: DataSnapshot = Depends(current_snapshot)):
+    # Validated against StateData when the snapshot was built
+    return static_response(snapshot, 'states')
 
-@app.get("/api/districts", response_model=List[DistrictData])
-async def get_districts(state: Optional[str] = None):
-    districts = data_cache.get('districts', [])
-    if state:
-        return [d for d in districts if d['state'].lower() == state.lower()]
-    return districts
+def encode_cursor(key):
+    """Opaque page cursor for the sort key of the last row served"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii')
 
-@app.get("/api/ml/forecast")
-async def get_forecast(state: Optional[str] = None, granularity: str = "monthly"):
-    """Get time-series forecast with dynamic granularity (Daily or Monthly)"""
-    time_series = data_cache.get('timeSeries', [])
-    states_data = data_cache.get('states', [])
-    analytics_cache = data_cache.get('analytics_report', {}).get('state_recommendations', [])
-    
-    if not time_series:
-        return {"mergedData": [], "growth_percent": 0, "interpretation": "No data available", "anomalies": []}
+def decode_cursor(cursor):
+    try:
+        state_key, state, district = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return (str(state_key), str(state), str(district))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    # Pure scaling logic (strictly authentic proportions)
-    scaling_factor = 1.0
-    display_name = "All India"
-    update_ratio = 22.4 
-    if state and state != "All India":
-        matching_state = next((s for s in states_data if state.lower() in s['state'].lower()), None)
-        if matching_state:
-            total_enrolments = sum(s['enrolments'] for s in states_data)
-            scaling_factor = matching_state['enrolments'] / total_enrolments if total_enrolments > 0 else 0
-            display_name = matching_state['state']
-            state_rec = next((r for r in analytics_cache if matching_state['state'].lower() in r['state'].lower()), None)
-            if state_rec:
-                update_ratio = state_rec.get('update_ratio', 22.4)
-
-    processed_series = []
-    if granularity == "daily":
-        # Strictly authentic daily points
-        raw_series = time_series[-90:] if len(time_series) > 90 else time_series
-        for p in raw_series:
-            processed_series.append({
-                "date": datetime.datetime.strptime(p['date'], "%Y-%m-%d"),
-                "val": int(p['enrolments'] * scaling_factor)
-            })
-        forecast_steps = 7 
-        step_delta = datetime.timedelta(days=1)
-        label_fmt = "%b %d"
-    else:
-        # Strictly authentic aggregated monthly points
-        monthly_map = {}
-        for p in time_series:
-            dt = datetime.datetime.strptime(p['date'], "%Y-%m-%d")
-            key = dt.strftime("%Y-%m")
-            monthly_map[key] = monthly_map.get(key, 0) + p['enrolments']
-        
-        sorted_keys = sorted(monthly_map.keys())
-        for k in sorted_keys:
-            processed_series.append({
-                "date": datetime.datetime.strptime(k + "-01", "%Y-%m-%d"),
-                "val": int(monthly_map[k] * scaling_factor)
-            })
-        forecast_steps = 6 
-        step_delta = datetime.timedelta(days=30)
-        label_fmt = "%b %y"
-    vals = [p['val'] for p in processed_series]
-    if len(vals) < 2: return {"mergedData": [], "growth_percent": 0, "anomalies": []}
+@app.get("/api/districts")
+async def get_districts(
+    response: Response,
+    state: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    snapshot: DataSnapshot = Depends(current_snapshot),
+):
+    """Districts sorted by state and district, optionally sliced to one state and paged.
     
-    # Improved SES + Dampened Trend to avoid sharp drops
-    alpha = 0.3 
-    level = vals[0]
-    for v in vals[1:]:
-        level = alpha * v + (1 - alpha) * level
+    Page with either offset/limit or the X-Next-Cursor header value passed
+    back as `cursor`; `fields` is a comma-separated subset of the columns.
+    """
+    table = snapshot.district_table
+    if table is None:
+        return []
     
-    # Calculate a more conservative trend using simple moving average of changes
-    changes = [(vals[i] - vals[i-1]) for i in range(1, len(vals))]
-    lookback = 6 if len(changes) > 6 else len(changes)
-    recent_trend = sum(changes[-lookback:]) / lookback if changes else 0
+    selected = DistrictTable.FIELDS
+    if fields:
+        selected = tuple(f.strip() for f in fields.split(',') if f.strip())
+        unknown = [f for f in selected if f not in DistrictTable.FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
     
-    merged_data = []
-    for p in processed_series:
-        merged_data.append({
-            "date": p['date'].strftime(label_fmt),
-            "actual": int(p['val']),
-            "predicted": None,
-            "label": p['date'].strftime(label_fmt)
-        })
-    
-    last_actual = merged_data[-1]
-    last_actual_val = last_actual['actual']
-    last_actual['predicted'] = last_actual_val
-    last_date = processed_series[-1]['date']
-    seed_val = sum(ord(c) for c in display_name)
-    
-    curr_level = float(last_actual_val)
-    volatility = sum(abs(vals[i] - vals[i-1]) for i in range(1, len(vals))) / len(vals)
-    
-    for i in range(1, forecast_steps + 1):
-        # Apply trend dampening (0.3 for monthly, 0.1 for daily)
-        dampening = 0.3 if granularity == 'monthly' else 0.1
-        mid_pred = curr_level + (recent_trend * dampening) 
-        spread = volatility * (1 + math.sqrt(i) * 0.15)
-        
-        forecast_date = last_date + (step_delta * i)
-        merged_data.append({
-            "date": forecast_date.strftime(label_fmt),
-            "actual": None,
-            "predicted": max(0, int(mid_pred)),
-            "upper": int(mid_pred + spread),
-            "lower": max(0, int(mid_pred - spread)),
-            "label": forecast_date.strftime(label_fmt)
-        })
-        curr_level = mid_pred
-        
-    final_pred = merged_data[-1]['predicted']
-    growth = ((final_pred - last_actual_val) / last_actual_val * 100) if last_actual_val > 0 else 0
+    first, stop = 0, len(table)
+    if state:
+        bounds = table.state_slice(state)
+        if bounds is None:
+            response.headers["X-Total-Count"] = "0"
+            return []
+        first, stop = bounds
     
-    # Anomaly narratives (Authentic diagnostics)
-    anomaly_narratives = []
-    if display_name == "All India":
-        anomaly_narratives = [
-            {"type": "SOCIETAL", "title": "National Saturation Peak", "desc": "National enrollment velocity confirms >94.2% adult saturation. Service demand is transitioning from new enrollments to lifecycle updates."},
-            {"type": "CRITICAL", "title": "Regional Infrastructure Strain", "desc": f"Update request volume in high-demand zones is averaging {update_ratio:.1f}x the enrolment rate, indicating a need for dedicated update kiosks."}
-        ]
+    if cursor:
+        start = max(first, table.position_after(decode_cursor(cursor)))
     else:
-        if update_ratio > 25:
-             anomaly_narratives.append({"type": "CRITICAL", "title": "Update Friction Detected", "desc": f"{display_name} reports a high update-to-enrollment ratio ({update_ratio:.1f}). Focus on biometric kiosk capacity."})
-        elif update_ratio < 10:
-             anomaly_narratives.append({"type": "SOCIETAL", "title": "Enrollment Drive Opportunity", "desc": f"{display_name} has a low update ratio ({update_ratio:.1f}). Potential for targeted new enrollment campaigns."})
-        
-        if growth > 5:
-             anomaly_narratives.append({"type": "GROWTH", "title": "Expansion Pulse", "desc": f"Projected growth of {growth:.1f}% in {display_name} indicates an influx of transaction volume. Prepare infrastructure for seasonal scaling."})
-        elif growth < -5:
-             anomaly_narratives.append({"type": "INFRA", "title": "Efficiency Optimization", "desc": f"Current transaction velocity in {display_name} is in a saturation phase. Recommend machine health checkups for long-term reliability."})
-        else:
-             anomaly_narratives.append({"type": "SOCIETAL", "title": "Operational Plateau", "desc": f"{display_name} has reached a steady state of enrollments. Resource allocation should focus on maintenance and updates."})
-        
-        # Ensure at least one narrative exists if logic somehow skips
-        if not anomaly_narratives:
-             anomaly_narratives.append({"type": "SOCIETAL", "title": "Baseline Performance", "desc": f"Operations in {display_name} are proceeding according to historical benchmarks with no immediate red flags."})
+        start = first + offset
+    start = min(start, stop)
+    end = stop if limit is None else min(stop, start + limit)
+    
+    response.headers["X-Total-Count"] = str(stop - first)
+    if end < stop:
+        response.headers["X-Next-Cursor"] = encode_cursor(table.keys[end - 1])
+    return table.rows(start, end, selected)
 
-    # Dynamic stages and density for frontend
-    peak_stage = "Extreme Surge" if growth > 15 else "Active Pulse" if abs(growth) > 5 else "Seasonal Stability"
-    density = "High (High Frequency)" if granularity == 'daily' else "Strategic (Long-term)" if len(processed_series) > 12 else "Emergent"
+@app.get("/api/districts/bbox")
+async def get_districts_in_bbox(
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lat: float = Query(..., ge=-90, le=90),
+    min_lng: float = Query(..., ge=-180, le=180),
+    max_lng: float = Query(..., ge=-180, le=180),
+    limit: Optional[int] = Query(None, ge=1),
+    snapshot: DataSnapshot = Depends(current_snapshot),
+):
+    """District centroids and metrics inside a lat/lng bounding box"""
+    if min_lat > max_lat or min_lng > max_lng:
+        raise HTTPException(status_code=400, detail="Bounding box minimum exceeds maximum")
+    index = snapshot.district_index
+    if index is None:
+        return []
+    districts = index.within(min_lat, max_lat, min_lng, max_lng)
+    return districts if limit is None else districts[:limit]
 
-    # Model metadata refinement for authenticity
-    return {
-        "mergedData": merged_data,
-        "growth_percent": round(growth, 1),
-        "state": display_name,
-        "anomalies": anomaly_narratives,
-        "confidence_score": round(min(99.2, 95.5 - (volatility / max(1, last_actual_val) * 3)), 1),
-        "peak_demand_stage": peak_stage,
-        "sample_density": density,
-        "model_metadata": {
-            "citation": f"Prophet-dampened SES trained on {len(processed_series)} authentic daily data points.",
-            "input_range": f"{processed_series[0]['date'].strftime('%b %Y')} – {merged_data[-1]['date']}",
-            "algorithm": "Holt-Winters (Dampened Trend)"
-        },
-        "interpretation": f"📈 {display_name}: Authentic analysis identifies a '{('Stable' if abs(growth) < 5 else 'Growth' if growth > 0 else 'Saturation Plateau')}' phase. We forecast a {abs(growth):.1f}% shift in demand over the next window."
-    }
+@app.get("/api/districts/nearest")
+async def get_nearest_districts(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=100),
+    snapshot: DataSnapshot = Depends(current_snapshot),
+):
+    """The k district centroids nearest to a point, with their distance in km"""
+    index = snapshot.district_index
+    if index is None:
+        return []
+    return [{**record, 'distanceKm': round(distance, 2)} for distance, record in index.nearest(lat, lng, k)]
+
+@app.get("/api/urban-rural")
+async def get_urban_rural_index(snapshot: DataSnapshot = Depends(current_snapshot)):
+    """Shared date axis, All India urban/rural series and the list of state shards"""
+    return snapshot.velocity_index
+
+@app.get("/api/urban-rural/{state}")
+async def get_urban_rural_state(state: str, snapshot: DataSnapshot = Depends(current_snapshot)):
+    """One state's urban/rural series, aligned to the index's date axis"""
+    shard = snapshot.velocity_shards.get(canonical_key(state))
+    if shard is None:
+        raise HTTPException(status_code=404, detail=f"No urban/rural data for {state}")
+    return shard
+
+@app.get("/api/ml/forecast")
+async def get_forecast(state: Optional[str] = None, granularity: str = "monthly",
+                       snapshot: DataSnapshot = Depends(current_snapshot)):
+    """Get time-series forecast with dynamic granularity (Daily or Monthly)"""
+    forecaster = snapshot.forecaster
+    if forecaster is None:
+        return {"mergedData": [], "growth_percent": 0, "interpretation": "No data available", "anomalies": []}
+    return forecaster.forecast(state, granularity)
 
 @app.get("/api/ml/pulse")
-async def get_pulse(state: Optional[str] = None):
+async def get_pulse(state: Optional[str] = None, snapshot: DataSnapshot = Depends(current_snapshot)):
     """30-Day Daily Activity Pulse (Authentic Data)"""
-    time_series = data_cache.get('timeSeries', [])
-    states_data = data_cache.get('states', [])
+    time_series = snapshot.time_series
+    states_data = snapshot.states
     
     if not time_series:
         return {"pulseData": []}
@@ -237,7 +320,7 @@ async def get_pulse(state: Optional[str] = None):
     scaling_factor = 1.0
     display_name = "National"
     if state and state != "All India":
-        matching_state = next((s for s in states_data if state.lower() in s['state'].lower()), None)
+        matching_state = snapshot.state_index.get(state)
         if matching_state:
             total_enrolments = sum(s['enrolments'] for s in states_data)
             scaling_factor = matching_state['enrolments'] / total_enrolments if total_enrolments > 0 else 0
@@ -261,34 +344,36 @@ async def get_pulse(state: Optional[str] = None):
     }
 
 @app.get("/api/ml/clusters")
-async def get_clusters():
-    return data_cache.get('analytics_report', {}).get('clustering_results', [])
+async def get_clusters(snapshot: DataSnapshot = Depends(current_snapshot)):
+    return static_response(snapshot, 'clusters')
+
+# 2024 Projected Population Estimates (Simplified for Hackathon Impact)
+# Source: Census Projections 2024 (Approx in Millions)
+POPULATION_TARGETS = {
+    "Uttar Pradesh": 241, "Maharashtra": 127, "Bihar": 130, "West Bengal": 100,
+    "Madhya Pradesh": 87, "Tamil Nadu": 77, "Rajasthan": 82, "Karnataka": 68,
+    "Gujarat": 65, "Andhra Pradesh": 53, "Odisha": 46, "Telangana": 38,
+    "Kerala": 36, "Jharkhand": 40, "Assam": 36, "Punjab": 31,
+    "Chhattisgarh": 30, "Haryana": 30, "Delhi": 22, "Jammu and Kashmir": 14,
+    "Uttarakhand": 12, "Himachal Pradesh": 7.5, "Tripura": 4.2, "Meghalaya": 3.4,
+    "Manipur": 3.2, "Nagaland": 2.3, "Goa": 1.6, "Arunachal Pradesh": 1.7,
+    "Puducherry": 1.6, "Mizoram": 1.3, "Chandigarh": 1.2, "Sikkim": 0.7,
+    "Andaman and Nicobar Islands": 0.4, "Dadra and Nagar Haveli and Daman and Diu": 1.2,
+    "Ladakh": 0.3, "Lakshadweep": 0.07
+}
+
+# Population targets by canonical state key
+POPULATION_BY_KEY = {canonical_key(name): target for name, target in POPULATION_TARGETS.items()}
 
 @app.get("/api/ml/saturation")
-async def get_saturation():
+async def get_saturation(snapshot: DataSnapshot = Depends(current_snapshot)):
     """State-wise Saturation Gap Analysis (Authentic Aadhaar vs. Projected Population)"""
-    states_data = data_cache.get('states', [])
+    states_data = snapshot.states
     
-    # 2024 Projected Population Estimates (Simplified for Hackathon Impact)
-    # Source: Census Projections 2024 (Approx in Millions)
-    pop_map = {
-        "Uttar Pradesh": 241, "Maharashtra": 127, "Bihar": 130, "West Bengal": 100,
-        "Madhya Pradesh": 87, "Tamil Nadu": 77, "Rajasthan": 82, "Karnataka": 68,
-        "Gujarat": 65, "Andhra Pradesh": 53, "Odisha": 46, "Telangana": 38,
-        "Kerala": 36, "Jharkhand": 40, "Assam": 36, "Punjab": 31,
-        "Chhattisgarh": 30, "Haryana": 30, "Delhi": 22, "Jammu and Kashmir": 14,
-        "Uttarakhand": 12, "Himachal Pradesh": 7.5, "Tripura": 4.2, "Meghalaya": 3.4,
-        "Manipur": 3.2, "Nagaland": 2.3, "Goa": 1.6, "Arunachal Pradesh": 1.7,
-        "Puducherry": 1.6, "Mizoram": 1.3, "Chandigarh": 1.2, "Sikkim": 0.7,
-        "Andaman and Nicobar Islands": 0.4, "Dadra and Nagar Haveli and Daman and Diu": 1.2,
-        "Ladakh": 0.3, "Lakshadweep": 0.07
-    }
-
     saturation_results = []
     for s in states_data:
         name = s['state']
-        # Try to match name in map (case-insensitive)
-        pop_target = next((v for k, v in pop_map.items() if k.lower() in name.lower()), 0)
+        pop_target = POPULATION_BY_KEY.get(canonical_key(name), 0)
         
         if pop_target > 0:
             # We treat the 'enrolments' in our sample data as a proxy for 'velocity' 
@@ -315,12 +400,12 @@ async def get_saturation():
     return sorted(saturation_results, key=lambda x: x['gap'], reverse=True)
 
 @app.get("/api/ml/rural-urban")
-async def get_rural_urban():
-    return data_cache.get('analytics_report', {}).get('rural_urban_analysis', [])
+async def get_rural_urban(snapshot: DataSnapshot = Depends(current_snapshot)):
+    return static_response(snapshot, 'rural_urban')
 
 @app.get("/api/recommendations")
-async def get_recommendations():
-    return data_cache.get('analytics_report', {}).get('state_recommendations', [])
+async def get_recommendations(snapshot: DataSnapshot = Depends(current_snapshot)):
+    return static_response(snapshot, 'recommendations')
 
 if __name__ == "__main__":
     import uvicorn
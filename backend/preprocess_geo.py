@@ -0,0 +1,142 @@
+import pandas as pd
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'aadhaariq'))
+from coordinates import parse_coordinates, in_india
+from state_names import StateCanonicalizer
+from repo_paths import DISTRICT_LAT_LONG_CSV, ASSETS_DIR, DATA_DIR
+
+# Post office state names (upper case, older spellings such as ORISSA) are
+# mapped to the same canonical names as the enrolment data; unknown names,
+# including the UIDAI-specific invalid ones, are kept
+state_canonicalizer = StateCanonicalizer(invalid_states=set(), fold_case=True)
+
+# Per-state, per-district centroids and office counts, read by process_real_data
+# (coordinates) and process_district_data (coordinates and office counts)
+DISTRICT_GEO_PATH = DATA_DIR / 'district_centroids.json'
+
+def normalize_name(name):
+    """Normalize district/state names for matching"""
+    if pd.isna(name):
+        return ""
+    return str(name).strip().upper()
+
+def zoom_scale(max_range):
+    """Map zoom for a state spanning `max_range` degrees: smaller states need higher zoom"""
+    if max_range < 1:
+        return 25
+    elif max_range < 2:
+        return 18
+    elif max_range < 4:
+        return 12
+    elif max_range < 6:
+        return 9
+    return 6
+
+def load_offices():
+    """Read district_lat_long.csv once and keep the offices with valid coordinates inside India"""
+    print("\nLoading district lat/long data...")
+    df = pd.read_csv(DISTRICT_LAT_LONG_CSV)
+    print(f"Loaded {len(df)} records")
+
+    df['lat_decimal'], lat_failures = parse_coordinates(df['latitude'])
+    df['lng_decimal'], lng_failures = parse_coordinates(df['longitude'])
+    print(f"Unparseable coordinates: {lat_failures} latitudes, {lng_failures} longitudes")
+
+    df_valid = df[in_india(df['lat_decimal'], df['lng_decimal'])].reset_index(drop=True)
+    df_valid['statename'] = state_canonicalizer.canonicalize_series(df_valid['statename']).astype(object)
+    print(f"Valid coordinates: {len(df_valid)} ({len(df_valid)/max(len(df), 1)*100:.1f}%)")
+    return df_valid
+
+def aggregate_offices(df):
+    """
+    The single grouped aggregation every output is derived from: per
+    (canonical state, raw district) coordinate sums, extremes, office count and the row
+    where the group first appears.
+    """
+    df = df.assign(row=range(len(df)))
+    # Offices without a district still count towards their state
+    return df.groupby(['statename', 'district'], dropna=False).agg(
+        lat_sum=('lat_decimal', 'sum'),
+        lng_sum=('lng_decimal', 'sum'),
+        lat_min=('lat_decimal', 'min'),
+        lat_max=('lat_decimal', 'max'),
+        lng_min=('lng_decimal', 'min'),
+        lng_max=('lng_decimal', 'max'),
+        offices=('lat_decimal', 'size'),
+        first_row=('row', 'min'),
+    )
+
+def state_centroids_from(groups):
+    """State centroids, bounds and zoom, keyed by upper-case canonical state in order of first appearance"""
+    states = groups.groupby(level='statename').agg(
+        lat_sum=('lat_sum', 'sum'),
+        lng_sum=('lng_sum', 'sum'),
+        lat_min=('lat_min', 'min'),
+        lat_max=('lat_max', 'max'),
+        lng_min=('lng_min', 'min'),
+        lng_max=('lng_max', 'max'),
+        offices=('offices', 'sum'),
+        first_row=('first_row', 'min'),
+    ).sort_values('first_row')
+
+    state_centroids = {}
+    for state, row in states.iterrows():
+        max_range = max(row['lat_max'] - row['lat_min'], row['lng_max'] - row['lng_min'])
+        state_centroids[str(state).strip().upper()] = {
+            'lat': round(row['lat_sum'] / row['offices'], 4),
+            'lng': round(row['lng_sum'] / row['offices'], 4),
+            'bounds': {
+                'latMin': round(row['lat_min'], 4),
+                'latMax': round(row['lat_max'], 4),
+                'lngMin': round(row['lng_min'], 4),
+                'lngMax': round(row['lng_max'], 4)
+            },
+            'zoomScale': zoom_scale(max_range)
+        }
+    return state_centroids
+
+def district_centroids_from(groups):
+    """Nested {STATE: {DISTRICT: {lat, lng, offices}}} centroids, the same name in two states kept apart"""
+    district_centroids = {}
+    for (state, district), row in groups.iterrows():
+        state_norm = normalize_name(state)
+        district_norm = normalize_name(district)
+        if not state_norm or not district_norm:
+            continue
+
+        district_centroids.setdefault(state_norm, {})[district_norm] = {
+            'lat': round(float(row['lat_sum'] / row['offices']), 4),
+            'lng': round(float(row['lng_sum'] / row['offices']), 4),
+            'offices': int(row['offices'])
+        }
+    return district_centroids
+
+def save_json(data, output_path):
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    print(f"✅ Saved {output_path}")
+
+def main():
+    """Main execution"""
+    print("=" * 60)
+    print("Geo Preprocessing: State and District Centroids")
+    print("=" * 60)
+
+    groups = aggregate_offices(load_offices())
+
+    state_centroids = state_centroids_from(groups)
+    district_centroids = district_centroids_from(groups)
+
+    print(f"\nCalculated centroids for {len(state_centroids)} states")
+    print(f"Districts: {sum(len(d) for d in district_centroids.values())}\n")
+
+    save_json(state_centroids, ASSETS_DIR / 'state_centroids.json')
+    save_json(district_centroids, DISTRICT_GEO_PATH)
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -1,109 +1,38 @@
 import pandas as pd
 import json
+import os
+import sys
+import argparse
 from pathlib import Path
 import numpy as np
 
-def normalize_name(name):
-    """Normalize district/state names for matching"""
-    if pd.isna(name):
-        return ""
-    return str(name).strip().upper()
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'aadhaariq'))
+from coordinates import is_flat
+from dates import format_day_numbers
+from process_real_data import AadhaarDataProcessor
+from repo_paths import DISTRICT_LAT_LONG_CSV, ASSETS_DIR
+from preprocess_geo import DISTRICT_GEO_PATH, load_offices, aggregate_offices, district_centroids_from, normalize_name
 
-def dms_to_decimal(dms_str):
-    """Convert DMS (Degrees°Minutes'Seconds\") to decimal degrees"""
-    if pd.isna(dms_str):
-        return None
-    
-    dms_str = str(dms_str).strip()
-    
-    # If already a number, return it
-    try:
-        return float(dms_str)
-    except ValueError:
-        pass
-    
-    # Parse DMS format like "17°57'17.7\""
-    try:
-        # Remove quotes and split by degree symbol
-        parts = dms_str.replace('"', '').replace("'", ' ').replace('°', ' ').split()
-        
-        if len(parts) >= 1:
-            degrees = float(parts[0])
-            minutes = float(parts[1]) if len(parts) > 1 else 0
-            seconds = float(parts[2]) if len(parts) > 2 else 0
-            
-            decimal = degrees + (minutes / 60) + (seconds / 3600)
-            return decimal
-    except:
-        return None
-    
-    return None
-
-def is_valid_coordinate(lat, lng):
-    """Check if coordinates are within India bounds"""
-    lat_decimal = dms_to_decimal(lat)
-    lng_decimal = dms_to_decimal(lng)
-    
-    if lat_decimal is None or lng_decimal is None:
-        return False
-    
-    # India bounds: Lat 8°N to 35°N, Lng 68°E to 97°E
-    return 8 <= lat_decimal <= 35 and 68 <= lng_decimal <= 97
-
-def calculate_district_centroids():
-    """Calculate district centroids from district_lat_long.csv"""
+def load_district_centroids():
+    """
+    District centroids written by preprocess_geo.py, recomputed from
+    district_lat_long.csv when missing, older than the CSV or in the older
+    flat format without states and office counts
+    """
     print("=" * 60)
     print("District Centroids Processing")
     print("=" * 60)
     
-    print("\nLoading district lat/long data...")
-    df = pd.read_csv('../district_lat_long/district_lat_long.csv')
-    
-    print(f"Loaded {len(df)} records")
-    
-    # Filter valid coordinates
-    df_valid = df[df.apply(lambda row: is_valid_coordinate(row['latitude'], row['longitude']), axis=1)]
-    print(f"Valid coordinates: {len(df_valid)} ({len(df_valid)/len(df)*100:.1f}%)")
-    
-    # Group by state and district
-    district_groups = df_valid.groupby(['statename', 'district'])
-    
-    district_centroids = {}
-    
-    for (state, district), group in district_groups:
-        state_norm = normalize_name(state)
-        district_norm = normalize_name(district)
-        
-        if not state_norm or not district_norm:
-            continue
-        
-        # Convert DMS coordinates to decimal
-        lat_decimals = [dms_to_decimal(lat) for lat in group['latitude']]
-        lng_decimals = [dms_to_decimal(lng) for lng in group['longitude']]
-        
-        # Filter out None values
-        lat_decimals = [lat for lat in lat_decimals if lat is not None]
-        lng_decimals = [lng for lng in lng_decimals if lng is not None]
-        
-        if not lat_decimals or not lng_decimals:
-            continue
-        
-        # Calculate centroid from decimal coordinates
-        lat_mean = sum(lat_decimals) / len(lat_decimals)
-        lng_mean = sum(lng_decimals) / len(lng_decimals)
-        
-        # Count offices
-        office_count = len(group)
-        
-        # Store
-        if state_norm not in district_centroids:
-            district_centroids[state_norm] = {}
-        
-        district_centroids[state_norm][district_norm] = {
-            'lat': round(lat_mean, 4),
-            'lng': round(lng_mean, 4),
-            'offices': office_count
-        }
+    district_centroids = None
+    if DISTRICT_GEO_PATH.exists() and DISTRICT_GEO_PATH.stat().st_mtime >= DISTRICT_LAT_LONG_CSV.stat().st_mtime:
+        print(f"\nLoading district centroids from {DISTRICT_GEO_PATH}...")
+        with open(DISTRICT_GEO_PATH, 'r') as f:
+            district_centroids = json.load(f)
+        if is_flat(district_centroids):
+            print(f"{DISTRICT_GEO_PATH} is in the old flat format, recomputing")
+            district_centroids = None
+    if district_centroids is None:
+        district_centroids = district_centroids_from(aggregate_offices(load_offices()))
     
     print(f"\nProcessed {len(district_centroids)} states")
     total_districts = sum(len(districts) for districts in district_centroids.values())
@@ -111,49 +40,118 @@ def calculate_district_centroids():
     
     return district_centroids
 
-def load_enrollment_data():
-    """Load and aggregate enrollment data by district"""
-    print("\nLoading enrollment data...")
-    
-    enrollment_dir = Path('../api_data_aadhar_enrolment/api_data_aadhar_enrolment')
-    csv_files = list(enrollment_dir.glob('*.csv'))
-    
-    district_enrollments = {}
+# Count columns of each dataset
+DATASET_COLUMNS = {
+    'enrolment': ['age_0_5', 'age_5_17', 'age_18_greater'],
+    'demographic': ['demo_age_5_17', 'demo_age_17_'],
+    'biometric': ['bio_age_5_17', 'bio_age_17_'],
+}
+
+def normalize_names(series):
+    """normalize_name() over a whole column, called once per distinct value"""
+    codes, uniques = pd.factorize(series)
+    # codes == -1 (missing values) index the trailing ""
+    normalized = np.array([normalize_name(name) for name in uniques] + [""], dtype=object)
+    return normalized[codes]
+
+def aggregate_by_district(df, data_type, by_date=False):
+    """
+    Sum a dataset's count columns per normalized (state, district), and per
+    day number as well when `by_date` is set
+    """
+    value_columns = DATASET_COLUMNS[data_type]
+    keys = ['state', 'district', 'date'] if by_date else ['state', 'district']
+    grouped = pd.DataFrame({
+        'state': normalize_names(df['state']),
+        'district': normalize_names(df['district']),
+    })
+    if by_date:
+        grouped['date'] = df['date'].to_numpy()
+    for col in value_columns:
+        if col in df.columns:
+            grouped[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('int64').to_numpy()
+        else:
+            grouped[col] = 0
+    
+    grouped = grouped[(grouped['state'] != "") & (grouped['district'] != "")]
+    return grouped.groupby(keys, sort=False)[value_columns].sum()
+
+def load_datasets(workers=1):
+    """
+    Cleaned rows of each dataset (None for a dataset without data), read
+    from the cleaned store. If a dataset with raw shards is missing from the
+    store, every dataset is instead reduced from the raw shards by
+    process_real_data's streaming map-reduce, `workers` shards at a time.
+    That applies the store's cleaning (canonical states, no rows without a
+    date or district, each record identity once), so the sums are the same
+    either way.
+    """
+    processor = AadhaarDataProcessor()
+    folders = {
+        'enrolment': processor.enrolment_path,
+        'demographic': processor.demographic_path,
+        'biometric': processor.biometric_path,
+    }
+    missing = [
+        data_type for data_type, folder in folders.items()
+        if not processor.store.exists(data_type) and any(folder.rglob('*.csv'))
+    ]
+    if not missing:
+        print(f"Reading cleaned store {processor.store.root}...")
+        return {
+            data_type: processor.store.read(data_type, columns=['state', 'district', 'date'] + columns)
+            for data_type, columns in DATASET_COLUMNS.items()
+        }
     
-    for csv_file in csv_files:
-        print(f"Processing {csv_file.name}...")
-        df = pd.read_csv(csv_file)
-        
-        for _, row in df.iterrows():
-            state = normalize_name(row.get('state', ''))
-            district = normalize_name(row.get('district', ''))
-            
-            if not state or not district:
-                continue
-            
-            key = f"{state}|{district}"
-            
-            if key not in district_enrollments:
-                district_enrollments[key] = {
-                    'enrollments': 0,
-                    'updates': 0,
-                    'child_enrollments': 0
-                }
-            
-            # Sum age group columns for total enrollments
-            age_columns = [col for col in df.columns if col.startswith('age_')]
-            total_enrollments = sum([int(row[col]) if pd.notna(row[col]) else 0 for col in age_columns])
-            
-            # Child enrollments (0-5 age group)
-            child_enrollments = int(row.get('age_0_5', 0)) if pd.notna(row.get('age_0_5')) else 0
-            
-            district_enrollments[key]['enrollments'] += total_enrollments
-            district_enrollments[key]['child_enrollments'] += child_enrollments
-            
-            # Note: Updates data might not be in enrollment CSV, will default to 0
+    print(f"{', '.join(missing)} missing from cleaned store {processor.store.root}, reducing the raw shards")
+    frames = processor.stream_datasets(workers=workers)
+    processor.state_canonicalizer.report_unseen()
+    return frames
+
+def load_enrollment_data(workers=1):
+    """
+    Load and aggregate enrollment and update counts by district. Also returns
+    the daily enrolment series as a Series indexed by (state, district, date).
+    """
+    print("\nLoading enrollment data...")
+    frames = load_datasets(workers)
+    
+    # Enrolments are summed once per day; the district totals are summed from that
+    enrolments = None
+    daily_enrolments = pd.Series(dtype='int64')
+    if frames['enrolment'] is not None:
+        daily = aggregate_by_district(frames['enrolment'], 'enrolment', by_date=True)
+        enrolments = daily.groupby(level=['state', 'district'], sort=False).sum()
+        daily_enrolments = daily.sum(axis=1)
+    updates = [
+        aggregate_by_district(frames[data_type], data_type)
+        for data_type in ('demographic', 'biometric') if frames[data_type] is not None
+    ]
+    
+    columns = {}
+    if enrolments is not None:
+        columns['enrollments'] = enrolments.sum(axis=1)
+        columns['child_enrollments'] = enrolments['age_0_5']
+    update_totals = [partial.sum(axis=1) for partial in updates]
+    if update_totals:
+        columns['updates'] = pd.concat(update_totals).groupby(level=['state', 'district'], sort=False).sum()
+    
+    # Districts missing from a dataset count 0 for it
+    totals = pd.DataFrame(columns).reindex(columns=['enrollments', 'updates', 'child_enrollments'])
+    totals = totals.fillna(0).astype('int64')
+    
+    district_enrollments = {
+        f"{state}|{district}": {
+            'enrollments': int(enrollments),
+            'updates': int(update_count),
+            'child_enrollments': int(child),
+        }
+        for (state, district), enrollments, update_count, child in zip(
+            totals.index, totals['enrollments'], totals['updates'], totals['child_enrollments'])
+    }
     
     print(f"Aggregated data for {len(district_enrollments)} district combinations")
-    return district_enrollments
+    return district_enrollments, daily_enrolments
 
 def merge_data(district_centroids, district_enrollments):
     """Merge centroids with enrollment data and calculate metrics"""
@@ -164,6 +162,7 @@ def merge_data(district_centroids, district_enrollments):
     districts_without_data = 0
     
     for state, districts in district_centroids.items():
+        # Every centroid state gets a key, even if none of its districts has data
         merged_data[state] = {}
         
         for district, centroid in districts.items():
@@ -181,10 +180,6 @@ def merge_data(district_centroids, district_enrollments):
                 # Calculate enrollment density (enrollments per office)
                 density = enrollment_info['enrollments'] / centroid['offices'] if centroid['offices'] > 0 else 0
                 
-                # Calculate anomaly score (simple heuristic: deviation from mean density)
-                # Will refine this in the next step
-                anomaly_score = 0  # Placeholder
-                
                 merged_data[state][district] = {
                     'lat': centroid['lat'],
                     'lng': centroid['lng'],
@@ -193,7 +188,7 @@ def merge_data(district_centroids, district_enrollments):
                     'updates': enrollment_info['updates'],
                     'child_enrollments': enrollment_info['child_enrollments'],
                     'density': round(density, 2),
-                    'anomaly_score': anomaly_score
+                    'anomaly_score': 0
                 }
                 
                 districts_with_data += 1
@@ -205,58 +200,108 @@ def merge_data(district_centroids, district_enrollments):
     
     return merged_data
 
-def calculate_anomaly_scores(merged_data):
-    """Calculate anomaly scores based on enrollment density deviation"""
+# Trailing days each day is compared against, the fewest needed to score at
+# all, and the robust z-score above which a day is flagged
+ANOMALY_WINDOW = 28
+ANOMALY_MIN_WINDOW = 7
+ANOMALY_THRESHOLD = 3.5
+
+def daily_matrix(daily_enrolments):
+    """
+    Pivot the daily series into a (days x districts) count matrix. Days are
+    those on which any district reported, so nationwide gaps in the dumps
+    are not mistaken for drops; a district missing on a reported day counts 0.
+    """
+    series = daily_enrolments[daily_enrolments.index.get_level_values('date').notna()]
+    frame = series.unstack(['state', 'district'], fill_value=0).sort_index()
+    return frame.to_numpy(dtype='float64'), frame.index.to_numpy(dtype='int64'), frame.columns
+
+def robust_anomaly_scores(matrix, window=ANOMALY_WINDOW, threshold=ANOMALY_THRESHOLD):
+    """
+    Score every day of every district against the district's own trailing
+    `window` days in one shot: z = (x - median) / (1.4826 * MAD). Returns
+    the (days x districts) |z| matrix; the first `window` days have no
+    history and score 0.
+    """
+    days, districts = matrix.shape
+    z = np.zeros_like(matrix)
+    if days <= window:
+        return z
+    
+    # history[t] holds days t .. t+window-1, compared against day t+window
+    history = np.lib.stride_tricks.sliding_window_view(matrix[:-1], window, axis=0)
+    median = np.median(history, axis=-1)
+    deviation = np.abs(history - median[..., None])
+    mad = np.median(deviation, axis=-1)
+    
+    # A flat history has MAD 0; fall back to the mean absolute deviation and
+    # never scale below one enrolment so sparse districts are not flagged on noise
+    scale = np.maximum(np.where(mad > 0, 1.4826 * mad, 1.2533 * deviation.mean(axis=-1)), 1.0)
+    z[window:] = np.abs(matrix[window:] - median) / scale
+    return z
+
+def calculate_anomaly_scores(merged_data, daily_enrolments):
+    """
+    Per-district anomaly scores from each district's daily enrolments against
+    its own rolling median/MAD. A district's score is its peak robust z-score
+    scaled to 0-1 (capped at twice the flag threshold), and the days above the
+    threshold are listed in anomaly_dates.
+    """
     print("\nCalculating anomaly scores...")
     
-    # Collect all densities
-    all_densities = []
     for state_districts in merged_data.values():
         for district_data in state_districts.values():
-            all_densities.append(district_data['density'])
+            district_data['anomaly_score'] = 0
+            district_data['anomaly_dates'] = []
     
-    if not all_densities:
+    if daily_enrolments.empty:
         return merged_data
     
-    # Calculate mean and std
-    mean_density = np.mean(all_densities)
-    std_density = np.std(all_densities)
+    matrix, days, columns = daily_matrix(daily_enrolments)
+    window = min(ANOMALY_WINDOW, len(days) - 1)
+    if window < ANOMALY_MIN_WINDOW:
+        print(f"Only {len(days)} reporting days, need {ANOMALY_MIN_WINDOW + 1} to score")
+        return merged_data
     
-    print(f"Mean density: {mean_density:.2f}")
-    print(f"Std deviation: {std_density:.2f}")
+    z = robust_anomaly_scores(matrix, window)
+    scores = np.minimum(z.max(axis=0) / (2 * ANOMALY_THRESHOLD), 1.0)
+    flagged_days, flagged_districts = np.nonzero(z > ANOMALY_THRESHOLD)
     
-    # Calculate anomaly scores (z-score normalized to 0-1)
-    for state in merged_data:
-        for district in merged_data[state]:
-            density = merged_data[state][district]['density']
-            
-            if std_density > 0:
-                z_score = abs((density - mean_density) / std_density)
-                # Normalize to 0-1 range (cap at 3 std devs)
-                anomaly_score = min(z_score / 3, 1.0)
-            else:
-                anomaly_score = 0
-            
-            merged_data[state][district]['anomaly_score'] = round(anomaly_score, 3)
+    flagged = {}
+    labels = format_day_numbers(days[flagged_days]) if len(flagged_days) else []
+    for column, label in zip(flagged_districts.tolist(), labels):
+        flagged.setdefault(column, []).append(label)
+    
+    scored = 0
+    for column, (state, district) in enumerate(columns):
+        district_data = merged_data.get(state, {}).get(district)
+        if district_data is None:
+            continue
+        district_data['anomaly_score'] = round(float(scores[column]), 3)
+        district_data['anomaly_dates'] = sorted(flagged.get(column, []))
+        scored += 1
+    
+    print(f"Scored {scored} districts over {len(days)} reporting days (window {window})")
+    print(f"Flagged {len(flagged_days)} district-days in {len(flagged)} districts")
     
     return merged_data
 
-def main():
+def main(workers=1):
     """Main execution"""
     # Step 1: Calculate centroids
-    district_centroids = calculate_district_centroids()
+    district_centroids = load_district_centroids()
     
     # Step 2: Load enrollment data
-    district_enrollments = load_enrollment_data()
+    district_enrollments, daily_enrolments = load_enrollment_data(workers)
     
     # Step 3: Merge data
     merged_data = merge_data(district_centroids, district_enrollments)
     
     # Step 4: Calculate anomaly scores
-    merged_data = calculate_anomaly_scores(merged_data)
+    merged_data = calculate_anomaly_scores(merged_data, daily_enrolments)
     
     # Step 5: Save output
-    output_path = Path('../aadhaariq/public/assets/district_data.json')
+    output_path = ASSETS_DIR / 'district_data.json'
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
     with open(output_path, 'w') as f:
@@ -272,4 +317,8 @@ def main():
     print(f"  Districts with data: {total_districts}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Build district_data.json from district centroids and enrolment data")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Raw CSV shards reduced in parallel when the cleaned store is missing (0 = all cores)")
+    args = parser.parse_args()
+    main(workers=args.workers or os.cpu_count())
@@ -1,102 +1,107 @@
 import pandas as pd
+import numpy as np
 import json
+import os
+import re
+import sys
+import shutil
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'aadhaariq'))
+from dates import format_day_numbers
+from process_real_data import AadhaarDataProcessor
+from repo_paths import PINCODE_MAPPING_CSV, ASSETS_DIR
+from pincode_index import PincodeIndex, CLASSIFICATIONS
+
 def load_pincode_mapping():
-    """Load pincode mapping and classify as Urban/Rural based on Office Type"""
-    print("Loading pincode mapping...")
-    pincode_df = pd.read_csv('../pincode mapping/pincode_mapping.csv')
-    
-    # Create classification: BO (Branch Office) = Rural, SO/HO = Urban
-    # Also store state information
-    pincode_info = {}
-    
-    for _, row in pincode_df.iterrows():
-        pincode = str(row['pincode']).strip()
-        office_type = str(row['officetype']).strip().upper()
-        state = str(row['statename']).strip()
-        
-        # BO = Branch Office = Rural
-        # SO = Sub Office, HO = Head Office = Urban
-        classification = None
-        if office_type == 'BO':
-            classification = 'Rural'
-        elif office_type in ['SO', 'HO']:
-            classification = 'Urban'
-        
-        if classification:
-            pincode_info[pincode] = {
-                'classification': classification,
-                'state': state
-            }
+    """Open the pincode index, rebuilding it only if the mapping file has changed"""
+    print("Loading pincode index...")
+    pincode_index = PincodeIndex.load_or_build(PINCODE_MAPPING_CSV)
     
-    print(f"Loaded {len(pincode_info)} pincode classifications")
-    urban_count = sum(1 for v in pincode_info.values() if v['classification'] == 'Urban')
-    rural_count = sum(1 for v in pincode_info.values() if v['classification'] == 'Rural')
+    classes = np.asarray(pincode_index.classification)
+    urban_count = int((classes == CLASSIFICATIONS.index('Urban')).sum())
+    rural_count = int((classes == CLASSIFICATIONS.index('Rural')).sum())
+    print(f"Loaded {urban_count + rural_count} pincode classifications")
     print(f"Urban pincodes: {urban_count}, Rural pincodes: {rural_count}")
     
-    return pincode_info
+    return pincode_index
+
+# Enrolment columns the classification reads
+ENROLMENT_COLUMNS = ['date', 'pincode', 'age_0_5', 'age_5_17', 'age_18_greater']
+
+def iter_enrollment_frames():
+    """
+    Yield cleaned enrolment frames from the cleaned store. Without a store
+    the raw CSVs are read in chunks through the store's own cleaning, so the
+    totals are the same whether or not the store has been built. Either way
+    the number of records left out for lacking a valid date is reported.
+    """
+    processor = AadhaarDataProcessor()
+    if processor.store.exists('enrolment'):
+        print(f"Reading cleaned store {processor.store.root}...")
+        yield processor.store.read('enrolment', columns=ENROLMENT_COLUMNS)
+        undated = processor.store.stats('enrolment').get('undated', 0)
+    else:
+        print(f"No enrolment data in cleaned store {processor.store.root}, cleaning the raw CSVs")
+        for chunk in processor.iter_cleaned_chunks('enrolment'):
+            yield chunk[[col for col in ENROLMENT_COLUMNS if col in chunk.columns]]
+        undated = processor.undated_dropped
+    
+    # Records without a date cannot be placed on the date axis, so they are
+    # in neither the series nor the totals
+    if undated:
+        print(f"Left out {undated:,} enrolment records without a valid date")
+
+def classify_enrollments(df, pincode_index):
+    """Look up each enrolment row's pincode in the index and sum per (classification, state, date)"""
+    # Sum all age group columns for total enrollments
+    age_columns = [col for col in df.columns if col.startswith('age_')]
+    rows = pincode_index.lookup(df['pincode'].to_numpy())
+    rows['date'] = df['date'].astype('int64').to_numpy()  # Day number, so keys sort chronologically
+    rows['enrollments'] = df[age_columns].fillna(0).astype('int64').sum(axis=1).to_numpy()
+    
+    # Unknown and unclassified pincodes have no classification
+    rows = rows[rows['classification'].notna()]
+    grouped = rows.groupby(['classification', 'state', 'date'], sort=False, observed=True)['enrollments'].sum()
+    return grouped, len(rows)
 
-def process_enrollment_data(pincode_info):
+def process_enrollment_data(pincode_index):
     """Process enrollment data and aggregate by Urban/Rural for All India and by State"""
     print("\nProcessing enrollment data...")
     
-    # Find all enrollment CSV files
-    enrollment_dir = Path('../api_data_aadhar_enrolment/api_data_aadhar_enrolment')
-    csv_files = list(enrollment_dir.glob('*.csv'))
+    total_processed = 0
+    classified_count = 0
+    partials = []
+    
+    for df in iter_enrollment_frames():
+        total_processed += len(df)
+        grouped, classified = classify_enrollments(df, pincode_index)
+        classified_count += classified
+        partials.append(grouped)
+    
+    # States are listed in the order they were first seen. The keys are categorical,
+    # so only observed combinations are kept, not every state on every date
+    totals = pd.concat(partials).groupby(level=['classification', 'state', 'date'], sort=False, observed=True).sum()
     
     # Storage for All India aggregated data
     all_india_data = {
         'Urban': {},
         'Rural': {}
     }
+    for (classification, date), count in totals.groupby(level=['classification', 'date'], observed=True).sum().items():
+        all_india_data[classification][int(date)] = int(count)
     
     # Storage for state-wise data
     state_data = {}
-    
-    total_processed = 0
-    classified_count = 0
-    
-    for csv_file in csv_files:
-        print(f"Processing {csv_file.name}...")
-        df = pd.read_csv(csv_file)
-        
-        for _, row in df.iterrows():
-            total_processed += 1
-            
-            # Extract data
-            date = str(row['date']).strip()
-            pincode = str(row['pincode']).strip()
-            
-            # Sum all age group columns for total enrollments
-            age_columns = [col for col in df.columns if col.startswith('age_')]
-            total_enrollments = sum([int(row[col]) if pd.notna(row[col]) else 0 for col in age_columns])
-            
-            # Get pincode info
-            if pincode not in pincode_info:
-                continue
-            
-            classification = pincode_info[pincode]['classification']
-            state = pincode_info[pincode]['state']
-            
-            classified_count += 1
-            
-            # Aggregate for All India
-            if date not in all_india_data[classification]:
-                all_india_data[classification][date] = 0
-            all_india_data[classification][date] += total_enrollments
-            
-            # Aggregate by state
-            if state not in state_data:
-                state_data[state] = {
-                    'Urban': {},
-                    'Rural': {}
-                }
-            
-            if date not in state_data[state][classification]:
-                state_data[state][classification][date] = 0
-            state_data[state][classification][date] += total_enrollments
+    for (classification, state, date), count in totals.items():
+        if state not in state_data:
+            state_data[state] = {
+                'Urban': {},
+                'Rural': {}
+            }
+        state_data[state][classification][int(date)] = int(count)
     
     print(f"\nTotal records processed: {total_processed}")
     print(f"Successfully classified: {classified_count} ({classified_count/total_processed*100:.2f}%)")
@@ -109,6 +114,10 @@ def format_velocity_data(velocity_data):
     urban_series = sorted([(date, count) for date, count in velocity_data['Urban'].items()])
     rural_series = sorted([(date, count) for date, count in velocity_data['Rural'].items()])
     
+    # Day numbers sort in time order; format them as dd-mm-yyyy only for output
+    urban_series = list(zip(format_day_numbers([d for d, _ in urban_series], '%d-%m-%Y'), [c for _, c in urban_series]))
+    rural_series = list(zip(format_day_numbers([d for d, _ in rural_series], '%d-%m-%Y'), [c for _, c in rural_series]))
+    
     return {
         'urban': [{'date': date, 'enrollments': count} for date, count in urban_series],
         'rural': [{'date': date, 'enrollments': count} for date, count in rural_series],
@@ -124,18 +133,8 @@ def format_velocity_data(velocity_data):
         }
     }
 
-def main():
-    """Main execution"""
-    print("=" * 60)
-    print("Urban vs Rural Velocity Data Processing")
-    print("=" * 60)
-    
-    # Load pincode classification
-    pincode_info = load_pincode_mapping()
-    
-    # Process enrollment data
-    all_india_data, state_data = process_enrollment_data(pincode_info)
-    
+def combine_velocity(all_india_data, state_data):
+    """The urban_rural_velocity.json document: All India and every state in frontend format"""
     # Format All India data
     print("\nCalculating All India metrics...")
     all_india_output = format_velocity_data(all_india_data)
@@ -150,14 +149,97 @@ def main():
         states_output[state] = format_velocity_data(state_velocity)
     
     # Create combined output
-    combined_output = {
+    return {
         'allIndia': all_india_output,
         'states': states_output,
         'stateList': sorted(list(states_output.keys()))
     }
+
+# Columnar, per-state sharded copy of the velocity output
+VELOCITY_SHARD_DIR = ASSETS_DIR / 'urban_rural'
+
+def state_shard_name(state):
+    """File name of a state's shard, e.g. 'andhra-pradesh.json'"""
+    return re.sub(r'[^a-z0-9]+', '-', state.lower()).strip('-') + '.json'
+
+def has_state_name(state):
+    """Whether a state key names a state; offices without a state name are keyed 'nan'"""
+    return bool(state) and state.strip().lower() not in ('', 'nan')
+
+def columnar_velocity(combined_output):
+    """
+    Split the velocity output into an index and per-state shards. Every
+    series becomes an integer count array aligned to one shared dd-mm-yyyy
+    date axis in the index (null where a series has no point for the date,
+    so a day with a recorded count of 0 is told apart from a missing day).
+    States without a name get no shard and are left out of the state list.
+    """
+    states = {state: velocity for state, velocity in combined_output['states'].items() if has_state_name(state)}
+    state_list = [state for state in combined_output['stateList'] if state in states]
+    series = [combined_output['allIndia'], *states.values()]
+    dates = sorted(
+        {point['date'] for velocity in series for key in ('urban', 'rural') for point in velocity[key]},
+        key=lambda d: datetime.strptime(d, '%d-%m-%Y'),
+    )
+    position = {date: i for i, date in enumerate(dates)}
+    
+    def columns(velocity):
+        counts = {'urban': [None] * len(dates), 'rural': [None] * len(dates)}
+        for key, column in counts.items():
+            for point in velocity[key]:
+                column[position[point['date']]] = point['enrollments']
+        return {**counts, 'summary': velocity['summary']}
+    
+    index = {
+        'dates': dates,
+        'allIndia': columns(combined_output['allIndia']),
+        'stateList': state_list,
+        'shards': {state: f"states/{state_shard_name(state)}" for state in state_list},
+    }
+    shards = {state: {'state': state, **columns(velocity)} for state, velocity in states.items()}
+    return index, shards
+
+def save_velocity_shards(combined_output, output_dir=VELOCITY_SHARD_DIR):
+    """Write index.json and states/*.json, swapping the whole directory in at once"""
+    index, shards = columnar_velocity(combined_output)
+    
+    staging = output_dir.with_name(output_dir.name + '.staging')
+    shutil.rmtree(staging, ignore_errors=True)
+    (staging / 'states').mkdir(parents=True)
+    
+    with open(staging / 'index.json', 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+    for state, shard in shards.items():
+        with open(staging / index['shards'][state], 'w') as f:
+            json.dump(shard, f, separators=(',', ':'))
+    
+    retired = output_dir.with_name(output_dir.name + '.retired')
+    shutil.rmtree(retired, ignore_errors=True)
+    if output_dir.exists():
+        os.replace(output_dir, retired)
+    os.replace(staging, output_dir)
+    shutil.rmtree(retired, ignore_errors=True)
+    
+    index_size = (output_dir / 'index.json').stat().st_size
+    print(f"✅ Saved {output_dir} (index {index_size / 1024:.1f} KB + {len(shards)} state shards)")
+
+def main():
+    """Main execution"""
+    print("=" * 60)
+    print("Urban vs Rural Velocity Data Processing")
+    print("=" * 60)
+    
+    # Load pincode classification
+    pincode_index = load_pincode_mapping()
+    
+    # Process enrollment data
+    all_india_data, state_data = process_enrollment_data(pincode_index)
+    
+    combined_output = combine_velocity(all_india_data, state_data)
+    states_output = combined_output['states']
     
     # Save to file
-    output_path = Path('../aadhaariq/public/assets/urban_rural_velocity.json')
+    output_path = ASSETS_DIR / 'urban_rural_velocity.json'
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
     with open(output_path, 'w') as f:
@@ -166,7 +248,18 @@ def main():
     print(f"\n✅ Successfully saved to {output_path}")
     print(f"   - All India data included")
     print(f"   - {len(states_output)} states included")
+    
+    save_velocity_shards(combined_output)
     print("=" * 60)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Build the urban/rural enrolment velocity outputs")
+    parser.add_argument("--reshard", action="store_true",
+                        help="Only rebuild the columnar shards from the existing urban_rural_velocity.json")
+    args = parser.parse_args()
+    
+    if args.reshard:
+        with open(ASSETS_DIR / 'urban_rural_velocity.json', 'r') as f:
+            save_velocity_shards(json.load(f))
+    else:
+        main()
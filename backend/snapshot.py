@@ -0,0 +1,309 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library encoder is used without it
+    orjson = None
+
+from district_table import DistrictTable
+from spatial_index import DistrictSpatialIndex
+from forecast_cache import ForecastCache, Forecaster
+from state_index import StateIndex, canonical_key
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(REPO_DIR, "aadhaariq", "data")
+ASSETS_DIR = os.path.join(REPO_DIR, "aadhaariq", "public", "assets")
+VELOCITY_DIR = os.path.join(ASSETS_DIR, "urban_rural")
+
+# Asset files served as-is under /api/assets/
+ASSET_FILES = ("district_data.json", "state_centroids.json", "urban_rural_velocity.json")
+
+
+class StateData(BaseModel):
+    state: str
+    enrolments: int
+    updates: int
+    childEnrolments: int
+    enrolment_0_5: int
+    enrolment_5_17: int
+    enrolment_18_plus: int
+    biometricUpdates: int
+    demographicUpdates: int
+    ruralRatio: Optional[float] = None
+    urbanRatio: Optional[float] = None
+
+
+def finite(content):
+    """A copy of a JSON value with NaN and infinities replaced by None, as orjson writes them"""
+    if isinstance(content, float):
+        return content if math.isfinite(content) else None
+    if isinstance(content, dict):
+        return {k: finite(v) for k, v in content.items()}
+    if isinstance(content, (list, tuple)):
+        return [finite(v) for v in content]
+    return content
+
+
+def encode_json(content) -> bytes:
+    """Compact JSON bytes of a response body; NaN and infinities are written as null with either encoder"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(finite(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def static_responses(aadhaar_data: dict, states: List[dict], analytics_report: dict) -> Dict[str, bytes]:
+    """Bodies of the endpoints that only ever serve a snapshot's data as-is, encoded once"""
+    return {
+        'states': encode_json(states),
+        'stats': encode_json(aadhaar_data.get('summary', {})),
+        'clusters': encode_json(analytics_report.get('clustering_results', [])),
+        'rural_urban': encode_json(analytics_report.get('rural_urban_analysis', [])),
+        'recommendations': encode_json(analytics_report.get('state_recommendations', [])),
+    }
+
+
+class SnapshotError(Exception):
+    """Source files that cannot be loaded or fail validation"""
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """
+    Everything the API serves, loaded and indexed from one consistent set of
+    source files. Never mutated once built: a reload builds a new snapshot
+    and swaps it in whole, so a request sees either the old data or the new.
+    """
+
+    version: str
+    loaded_at: float = 0.0
+    modified_at: float = 0.0
+    aadhaar_data: dict = field(default_factory=dict)
+    states: List[dict] = field(default_factory=list)
+    state_index: StateIndex = field(default_factory=lambda: StateIndex([]))
+    time_series: List[dict] = field(default_factory=list)
+    analytics_report: dict = field(default_factory=dict)
+    district_table: Optional[DistrictTable] = None
+    district_index: Optional[DistrictSpatialIndex] = None
+    velocity_index: dict = field(default_factory=dict)
+    velocity_shards: Dict[str, dict] = field(default_factory=dict)
+    forecaster: Optional[Forecaster] = None
+    static: Dict[str, bytes] = field(default_factory=dict)
+    assets: Dict[str, bytes] = field(default_factory=dict)
+
+
+# Served until the first snapshot loads
+EMPTY_SNAPSHOT = DataSnapshot(version="empty", static=static_responses({}, [], {}))
+
+
+def source_files() -> List[str]:
+    """Every file a snapshot is built from that currently exists"""
+    paths = [
+        os.path.join(DATA_DIR, "aadhaar_data.json"),
+        os.path.join(DATA_DIR, "analytics_report.json"),
+    ]
+    paths.extend(os.path.join(ASSETS_DIR, name) for name in ASSET_FILES)
+    if os.path.isdir(VELOCITY_DIR):
+        for root, _, files in os.walk(VELOCITY_DIR):
+            paths.extend(os.path.join(root, name) for name in files if name.endswith(".json"))
+    return sorted(p for p in paths if os.path.isfile(p))
+
+
+def source_stat() -> Tuple[Tuple[str, int, int], ...]:
+    """Sizes and mtimes of the source files; a change means a new snapshot may be due"""
+    stats = []
+    for path in source_files():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        stats.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(stats)
+
+
+def build_snapshot() -> DataSnapshot:
+    """
+    Load, index and validate every source file into a new snapshot. The
+    version is a digest of the bytes read, so unchanged files give the same
+    version. Raises SnapshotError instead of returning partial data.
+    """
+    digest = hashlib.sha256()
+    modified_at = 0.0
+
+    def read_bytes(path, required=True):
+        nonlocal modified_at
+        try:
+            with open(path, "rb") as f:
+                modified_at = max(modified_at, os.fstat(f.fileno()).st_mtime)
+                raw = f.read()
+        except FileNotFoundError:
+            if required:
+                raise SnapshotError(f"Missing {path}")
+            return None
+        digest.update(os.path.relpath(path, REPO_DIR).encode("utf-8") + b"\0" + raw)
+        return raw
+
+    def read_json(path, required=True, raw=None):
+        if raw is None:
+            raw = read_bytes(path, required)
+            if raw is None:
+                return None
+        try:
+            return json.loads(raw)
+        except ValueError as e:
+            raise SnapshotError(f"Invalid JSON in {path}: {e}")
+
+    aadhaar_data = read_json(os.path.join(DATA_DIR, "aadhaar_data.json"))
+    analytics_report = read_json(os.path.join(DATA_DIR, "analytics_report.json"))
+    for key, kind in (("summary", dict), ("states", list), ("districts", list), ("timeSeries", list)):
+        if not isinstance(aadhaar_data.get(key), kind):
+            raise SnapshotError(f"aadhaar_data.json: '{key}' missing or not a {kind.__name__}")
+    if not isinstance(analytics_report, dict):
+        raise SnapshotError("analytics_report.json is not an object")
+
+    states = aadhaar_data["states"]
+    time_series = aadhaar_data["timeSeries"]
+    try:
+        # Validated once here; /api/states serves these dumps without revalidating
+        validated_states = [StateData.model_validate(state).model_dump() for state in states]
+        state_index = StateIndex(states)
+        district_table = DistrictTable(aadhaar_data["districts"])
+    except Exception as e:
+        raise SnapshotError(f"aadhaar_data.json: {e}")
+
+    # Map assets, served byte for byte
+    assets = {}
+    for name in ASSET_FILES:
+        raw = read_bytes(os.path.join(ASSETS_DIR, name), required=False)
+        if raw is not None:
+            assets[name] = raw
+
+    # District centroids with their metrics, as served to the map
+    district_index = None
+    district_geo = None
+    if "district_data.json" in assets:
+        district_geo = read_json(os.path.join(ASSETS_DIR, "district_data.json"), raw=assets["district_data.json"])
+    if district_geo is not None:
+        district_index = DistrictSpatialIndex([
+            {'state': state, 'district': district, **metrics}
+            for state, districts in district_geo.items()
+            for district, metrics in districts.items()
+        ])
+
+    # Columnar urban/rural velocity: index plus one shard per state
+    velocity_index = read_json(os.path.join(VELOCITY_DIR, "index.json"), required=False) or {}
+    velocity_shards = {}
+    for state, shard_file in velocity_index.get('shards', {}).items():
+        velocity_shards[canonical_key(state)] = read_json(os.path.join(VELOCITY_DIR, shard_file))
+
+    try:
+        static = static_responses(aadhaar_data, validated_states, analytics_report)
+    except (TypeError, ValueError) as e:
+        raise SnapshotError(f"Data cannot be encoded as JSON: {e}")
+
+    version = digest.hexdigest()[:16]
+    try:
+        # Every state's forecast is computed once per snapshot
+        forecaster = Forecaster(
+            version, time_series, states, state_index,
+            analytics_report.get('state_recommendations', []),
+            ForecastCache(),
+        )
+        forecaster.precompute()
+    except Exception as e:
+        raise SnapshotError(f"Forecast precomputation failed: {e}")
+
+    return DataSnapshot(
+        version=version,
+        loaded_at=time.time(),
+        modified_at=modified_at,
+        aadhaar_data=aadhaar_data,
+        states=states,
+        state_index=state_index,
+        time_series=time_series,
+        analytics_report=analytics_report,
+        district_table=district_table,
+        district_index=district_index,
+        velocity_index=velocity_index,
+        velocity_shards=velocity_shards,
+        forecaster=forecaster,
+        static=static,
+        assets=assets,
+    )
+
+
+class SnapshotStore:
+    """
+    Holds the current snapshot. Readers take `current` once per request;
+    reload() builds the replacement off the request path and publishes it
+    with a single reference assignment, only after it has validated.
+    """
+
+    def __init__(self):
+        self.current: DataSnapshot = EMPTY_SNAPSHOT
+        self.last_error: Optional[str] = None
+        # Called with each newly swapped-in snapshot, on the reloading thread
+        self.listeners: List[Callable[[DataSnapshot], None]] = []
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def reload(self) -> Tuple[DataSnapshot, bool]:
+        """Build and swap in a new snapshot; returns (current snapshot, whether it changed)"""
+        with self._lock:
+            try:
+                snapshot = build_snapshot()
+            except SnapshotError as e:
+                self.last_error = str(e)
+                print(f"Error loading data, keeping version {self.current.version}: {e}")
+                raise
+            self.last_error = None
+            if snapshot.version == self.current.version:
+                return self.current, False
+            self.current = snapshot
+            print(f"Loaded data version {snapshot.version}")
+            for listener in self.listeners:
+                try:
+                    listener(snapshot)
+                except Exception:
+                    traceback.print_exc()
+            return snapshot, True
+
+    def watch(self, interval: float):
+        """Poll the source files every `interval` seconds and reload when they change"""
+        if self._watcher is not None or interval <= 0:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="snapshot-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self, interval: float):
+        seen = source_stat()
+        while not self._stop.wait(interval):
+            stat = source_stat()
+            if stat == seen:
+                continue
+            # Remember the attempt either way: a failed build (e.g. a file read
+            # mid-write) is retried when the files change again
+            seen = stat
+            try:
+                self.reload()
+            except SnapshotError:
+                pass
+            except Exception:
+                traceback.print_exc()
@@ -0,0 +1,110 @@
+import heapq
+import math
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class DistrictSpatialIndex:
+    """
+    Uniform lat/lng grid over district centroids. Bounding-box queries only
+    visit the cells overlapping the box; nearest-neighbour queries scan rings
+    of cells outward from the query point until no closer district can remain.
+    """
+
+    def __init__(self, records: Sequence[dict], cell_size: float = 0.5):
+        self.cell_size = cell_size
+        self.records = [r for r in records if r.get('lat') is not None and r.get('lng') is not None]
+
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, r in enumerate(self.records):
+            self.cells[self.cell(r['lat'], r['lng'])].append(i)
+        self.cells = dict(self.cells)
+
+        if self.cells:
+            rows = [c[0] for c in self.cells]
+            cols = [c[1] for c in self.cells]
+            self.extent = (min(rows), max(rows), min(cols), max(cols))
+            self.max_abs_lat = max(abs(r['lat']) for r in self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_size), math.floor(lng / self.cell_size))
+
+    def within(self, min_lat: float, max_lat: float, min_lng: float, max_lng: float) -> List[dict]:
+        """Districts whose centroid lies inside the box, in index order"""
+        if not self.cells:
+            return []
+        row0, col0 = self.cell(min_lat, min_lng)
+        row1, col1 = self.cell(max_lat, max_lng)
+        row0, row1 = max(row0, self.extent[0]), min(row1, self.extent[1])
+        col0, col1 = max(col0, self.extent[2]), min(col1, self.extent[3])
+
+        hits = []
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                for i in self.cells.get((row, col), ()):
+                    r = self.records[i]
+                    if min_lat <= r['lat'] <= max_lat and min_lng <= r['lng'] <= max_lng:
+                        hits.append(i)
+        return [self.records[i] for i in sorted(hits)]
+
+    def nearest(self, lat: float, lng: float, k: int) -> List[Tuple[float, dict]]:
+        """The k districts closest to a point as (distance_km, record), nearest first"""
+        if not self.cells or k <= 0:
+            return []
+        row, col = self.cell(lat, lng)
+        max_ring = max(
+            abs(row - self.extent[0]), abs(row - self.extent[1]),
+            abs(col - self.extent[2]), abs(col - self.extent[3]),
+        )
+
+        # Degrees of longitude are shortest at the highest latitude either the
+        # query or a record can be at
+        lng_scale = math.cos(math.radians(min(89.0, max(abs(lat), self.max_abs_lat))))
+
+        # Max-heap of the best k as (-distance, -index)
+        best: List[Tuple[float, int]] = []
+        for ring in range(max_ring + 1):
+            for cell in self._ring(row, col, ring):
+                for i in self.cells.get(cell, ()):
+                    r = self.records[i]
+                    item = (-haversine_km(lat, lng, r['lat'], r['lng']), -i)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+
+            # Anything outside the rings scanned so far is at least this far away
+            # (with 2% slack for great circles cutting inside parallels)
+            bound = 0.98 * ring * self.cell_size * KM_PER_DEGREE * lng_scale
+            if len(best) == k and -best[0][0] <= bound:
+                break
+
+        return [(-d, self.records[-i]) for d, i in sorted(best, reverse=True)]
+
+    @staticmethod
+    def _ring(row: int, col: int, ring: int):
+        """Cells at Chebyshev distance `ring` from (row, col)"""
+        if ring == 0:
+            yield (row, col)
+            return
+        for c in range(col - ring, col + ring + 1):
+            yield (row - ring, c)
+            yield (row + ring, c)
+        for r in range(row - ring + 1, row + ring):
+            yield (r, col - ring)
+            yield (r, col + ring)
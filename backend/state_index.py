@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'aadhaariq'))
+from state_names import STATE_NORMALIZATION
+
+# Map and UI spellings of state names that never occur in the UIDAI dumps, by
+# canonical name. The dump variants come from STATE_NORMALIZATION; case,
+# spacing and "&" versus "and" are folded by name_key() already.
+MAP_ALIASES: Dict[str, List[str]] = {
+    "Andaman and Nicobar Islands": ["Andaman and Nicobar", "Andaman & Nicobar Island"],
+    "Delhi": ["NCT of Delhi", "New Delhi"],
+}
+
+
+def name_key(name: str) -> str:
+    """Lowercase lookup key of a state name with spacing and "&" folded"""
+    return ' '.join(str(name).lower().replace('&', ' and ').split())
+
+
+_ALIAS_KEYS = {name_key(raw): name_key(canonical) for raw, canonical in STATE_NORMALIZATION.items()}
+_ALIAS_KEYS.update(
+    (name_key(alias), name_key(canonical))
+    for canonical, aliases in MAP_ALIASES.items()
+    for alias in aliases
+)
+
+
+def canonical_key(name: str) -> str:
+    """Lookup key of the state a name refers to, resolving known aliases"""
+    key = name_key(name)
+    return _ALIAS_KEYS.get(key, key)
+
+
+class StateIndex:
+    """
+    Records carrying a 'state' field, indexed by canonical_key() for exact
+    O(1) lookups. When two records fold to the same key the first one wins,
+    as it did with the old linear scans.
+    """
+
+    def __init__(self, records: Iterable[dict]):
+        self.records: Dict[str, dict] = {}
+        for record in records:
+            self.records.setdefault(canonical_key(record['state']), record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, name: str) -> bool:
+        return canonical_key(name) in self.records
+
+    def get(self, name: Optional[str]) -> Optional[dict]:
+        """The record of the state a name refers to, or None"""
+        if not name:
+            return None
+        return self.records.get(canonical_key(name))
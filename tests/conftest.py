@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The offline scripts and the backend import their sibling modules by name
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'aadhaariq'))
+sys.path.insert(0, str(REPO_ROOT / 'backend'))
@@ -0,0 +1,92 @@
+import pandas as pd
+
+from process_real_data import AadhaarDataProcessor
+
+ENROLMENT_CSV = """date,state,district,pincode,age_0_5,age_5_17,age_18_greater
+31-12-2025,Karnataka,Bidar,585330,2,3,0
+31-12-2025,Karnataka,Bidar,,6,0,1
+01-01-2026,Karnataka,Bidar,585402,,4,0
+01-01-2026,Orissa,Khordha,751001,1,1,1
+"""
+
+
+def make_processor(tmp_path):
+    enrolment_dir = tmp_path / "api_data_aadhar_enrolment" / "api_data_aadhar_enrolment"
+    enrolment_dir.mkdir(parents=True)
+    (enrolment_dir / "enrolment.csv").write_text(ENROLMENT_CSV)
+    return AadhaarDataProcessor(base_path=tmp_path)
+
+
+def test_build_store_keeps_rows_with_blank_cells(tmp_path):
+    processor = make_processor(tmp_path)
+    processor.build_store()
+
+    stored = processor.store.read('enrolment')
+    assert len(stored) == 4
+    assert stored['pincode'].isna().sum() == 1
+    assert stored['age_0_5'].isna().sum() == 1
+
+
+def test_store_totals_match_csv_totals(tmp_path):
+    processor = make_processor(tmp_path)
+    processor.build_store()
+
+    columns = processor.value_columns['enrolment']
+    from_csv = processor.clean_data(pd.read_csv(processor.enrolment_path / "enrolment.csv"), "enrolment")
+    from_store = processor.load_from_store("enrolment")
+
+    expected = processor.sum_by_state(from_csv, columns).astype('int64')
+    actual = processor.sum_by_state(from_store, columns).astype('int64')
+    pd.testing.assert_frame_equal(actual.sort_index(), expected.sort_index(), check_names=False)
+
+
+def stored_rows(processor):
+    stored = processor.store.read('enrolment')
+    return stored.astype({'state': str, 'district': str}).sort_values(['date', 'state', 'district', 'pincode']).reset_index(drop=True)
+
+
+def test_incremental_build_reuses_unchanged_shards(tmp_path, capsys):
+    processor = make_processor(tmp_path)
+    (processor.enrolment_path / "repeat.csv").write_text(
+        "date,state,district,pincode,age_0_5,age_5_17,age_18_greater\n"
+        "31-12-2025,Karnataka,Bidar,585330,9,9,9\n"
+        "02-01-2026,Goa,North Goa,403001,1,0,0\n"
+    )
+    processor.build_store()
+    expected = stored_rows(processor)
+
+    processor.build_store(incremental=True)
+    assert "(0 unchanged, from cache)" in capsys.readouterr().out
+    processor.build_store(incremental=True)
+    assert "(2 unchanged, from cache)" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(stored_rows(processor), expected)
+
+    # A changed shard is parsed again; records it repeats from an earlier shard still count once
+    (processor.enrolment_path / "repeat.csv").write_text(
+        "date,state,district,pincode,age_0_5,age_5_17,age_18_greater\n"
+        "31-12-2025,Karnataka,Bidar,585330,9,9,9\n"
+        "03-01-2026,Goa,North Goa,403001,5,0,0\n"
+    )
+    processor.build_store(incremental=True)
+    assert "(1 unchanged, from cache)" in capsys.readouterr().out
+    incremental = stored_rows(processor)
+    processor.build_store()
+    pd.testing.assert_frame_equal(incremental, stored_rows(processor))
+    assert len(incremental) == 5
+
+
+def test_build_store_records_rows_left_out(tmp_path):
+    processor = make_processor(tmp_path)
+    (processor.enrolment_path / "undated.csv").write_text(
+        "date,state,district,pincode,age_0_5,age_5_17,age_18_greater\n"
+        "not a date,Goa,North Goa,403001,1,0,0\n"
+        "31-12-2025,Karnataka,Bidar,585330,9,9,9\n"
+    )
+    processor.build_store(incremental=True)
+    expected = {'rows': 6, 'written': 4, 'undated': 1}
+    assert processor.store.stats('enrolment') == expected
+    assert len(processor.store.read('enrolment')) == 4
+
+    processor.build_store(incremental=True)
+    assert processor.store.stats('enrolment') == expected
+    assert processor.store.stats('biometric') == {}
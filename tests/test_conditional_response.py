@@ -0,0 +1,90 @@
+import gzip
+
+import pytest
+
+pytest.importorskip('httpx')
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+
+
+def test_snapshot_bodies_revalidate_with_304():
+    response = client.get('/api/states')
+    assert response.status_code == 200
+    etag = response.headers['etag']
+    assert response.headers['x-data-version'] == main.store.current.version
+
+    revalidated = client.get('/api/states', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['etag'] == etag
+
+
+def test_snapshot_bodies_are_compressed_from_the_cache():
+    response = client.get('/api/states', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['content-encoding'] == 'gzip'
+    snapshot = main.store.current
+    cached = main.compression_cache.get(snapshot.version, response.headers['etag'], 'gzip')
+    assert gzip.decompress(cached) == snapshot.static['states']
+
+
+def test_state_shards_get_validators_only_when_they_exist():
+    assert 'etag' in client.get('/api/urban-rural/andaman and nicobar islands').headers
+
+    missing = client.get('/api/urban-rural/Atlantis', headers={'If-None-Match': '*'})
+    assert missing.status_code == 404
+    assert 'etag' not in missing.headers
+
+
+COMPUTED_REQUESTS = [
+    ('/api/districts', {'limit': 50}),
+    ('/api/districts/bbox', {'min_lat': 5, 'max_lat': 40, 'min_lng': 65, 'max_lng': 100}),
+    ('/api/districts/nearest', {'lat': 25.6, 'lng': 85.1, 'k': 20}),
+    ('/api/ml/forecast', {'state': 'Bihar', 'granularity': 'daily'}),
+    ('/api/ml/pulse', {'state': 'Bihar'}),
+    ('/api/ml/saturation', {}),
+]
+
+
+@pytest.mark.parametrize('path, params', COMPUTED_REQUESTS)
+def test_computed_responses_revalidate_with_304(path, params):
+    response = client.get(path, params=params)
+    assert response.status_code == 200
+    etag = response.headers['etag']
+    assert response.headers['x-data-version'] == main.store.current.version
+
+    revalidated = client.get(path, params=params, headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['etag'] == etag
+    assert revalidated.content == b''
+
+    # Same parameters in another order: same resource, same ETag
+    reordered = dict(reversed(list(params.items())))
+    assert client.get(path, params=reordered).headers['etag'] == etag
+
+
+@pytest.mark.parametrize('path, params', COMPUTED_REQUESTS)
+def test_computed_responses_are_compressed_by_etag(path, params):
+    plain = client.get(path, params=params, headers={'Accept-Encoding': 'identity'})
+    assert 'content-encoding' not in plain.headers
+
+    for _ in range(2):
+        compressed = client.get(path, params=params, headers={'Accept-Encoding': 'gzip'})
+        assert compressed.json() == plain.json()
+        if len(plain.content) >= main.MIN_COMPRESS_SIZE:
+            assert compressed.headers['content-encoding'] == 'gzip'
+            cached = main.compression_cache.get(main.store.current.version, compressed.headers['etag'], 'gzip')
+            assert gzip.decompress(cached) == plain.content
+        else:
+            assert 'content-encoding' not in compressed.headers
+
+
+def test_invalid_parameters_get_their_error_instead_of_304():
+    params = {'min_lat': 30, 'max_lat': 10, 'min_lng': 65, 'max_lng': 100}
+    response = client.get('/api/districts/bbox', params=params, headers={'If-None-Match': '*'})
+    assert response.status_code == 400
+    assert 'etag' not in response.headers
+
+    response = client.get('/api/districts', params={'cursor': 'not-a-cursor'}, headers={'If-None-Match': '*'})
+    assert response.status_code == 400
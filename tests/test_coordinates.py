@@ -0,0 +1,34 @@
+from coordinates import CentroidIndex
+
+CENTROIDS = {
+    "BIHAR": {"AURANGABAD": {"lat": 24.75, "lng": 84.37}, "GAYA": {"lat": 24.79, "lng": 85.0}},
+    "MAHARASHTRA": {"AURANGABAD": {"lat": 19.88, "lng": 75.34}},
+    "ODISHA": {"KHORDHA": {"lat": 20.18, "lng": 85.62}},
+}
+
+
+def test_same_district_name_in_two_states_is_kept_apart():
+    index = CentroidIndex(CENTROIDS)
+    assert index.match("Bihar", "Aurangabad") == (24.75, 84.37, 'exact')
+    assert index.match("Maharashtra", "Aurangabad") == (19.88, 75.34, 'exact')
+
+
+def test_district_is_never_matched_in_another_state():
+    index = CentroidIndex(CENTROIDS)
+    assert index.match("Jharkhand", "Gaya") == (None, None, 'unmatched')
+    assert index.match("Jharkhand", "Aurangabad") == (None, None, 'unmatched')
+
+
+def test_state_spellings_are_canonicalized():
+    index = CentroidIndex(CENTROIDS)
+    assert index.match("Orissa", "Khordha") == (20.18, 85.62, 'exact')
+    assert index.match("ODISHA", "khordha.") == (20.18, 85.62, 'normalized')
+
+
+def test_flat_centroid_file_matches_on_district_name(tmp_path):
+    path = tmp_path / 'district_centroids.json'
+    path.write_text('{"GAYA": {"lat": 24.79, "lng": 85.0}, "KHORDHA": {"lat": 20.18, "lng": 85.62}}')
+    index = CentroidIndex.load(path)
+    assert index.match("Bihar", "Gaya") == (24.79, 85.0, 'name')
+    assert index.match("Orissa", "khordha.") == (20.18, 85.62, 'name')
+    assert index.match("Bihar", "Patna") == (None, None, 'unmatched')
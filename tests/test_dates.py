@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from dates import (
+    parse_day_numbers, datetimes_to_day_numbers, day_numbers_to_datetimes,
+    format_day_numbers, day_numbers_to_months,
+)
+
+
+def test_day_numbers_round_trip_through_raw_strings():
+    raw = pd.Series(['31-12-2025', '01-01-2026', '29-02-2024', '31-12-2025'])
+    days = parse_day_numbers(raw)
+    assert str(days.dtype) == 'Int32'
+    assert days.tolist() == [20453, 20454, 19782, 20453]
+    assert format_day_numbers(days, '%d-%m-%Y') == raw.tolist()
+
+
+def test_day_numbers_sort_chronologically_across_years():
+    raw = ['02-01-2026', '31-12-2025', '15-03-2025']
+    ordered = sorted(parse_day_numbers(raw))
+    assert format_day_numbers(ordered, '%d-%m-%Y') == ['15-03-2025', '31-12-2025', '02-01-2026']
+
+
+def test_unparseable_and_missing_dates_become_na():
+    days = parse_day_numbers(pd.Series(['01-03-2025', 'not a date', None, '2025-03-01']))
+    assert days.isna().tolist() == [False, True, True, True]
+
+
+def test_datetime_columns_convert_directly():
+    stamps = pd.Series(pd.to_datetime(['2025-03-01', None, '2026-01-01']))
+    days = parse_day_numbers(stamps)
+    assert days.isna().tolist() == [False, True, False]
+    assert days.tolist()[0] == datetimes_to_day_numbers(stamps).tolist()[0] == 20148
+    assert day_numbers_to_datetimes([20148])[0] == pd.Timestamp('2025-03-01')
+
+
+def test_month_labels():
+    assert day_numbers_to_months(np.array([20148, 20178, 20454])).tolist() == ['2025-03', '2025-03', '2026-01']
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from dedup import FingerprintSet, record_fingerprints
+
+
+def test_same_identity_with_other_counts_is_a_duplicate():
+    df = pd.DataFrame({
+        'date': [20148, 20148, 20149],
+        'state': ['Bihar', 'Bihar', 'Bihar'],
+        'district': ['Gaya', 'Gaya', 'Gaya'],
+        'pincode': [823001, 823001, 823001],
+        'age_0_5': [1, 7, 1],
+    })
+    fresh = FingerprintSet().add_new(record_fingerprints(df, 'enrolment'))
+    assert fresh.tolist() == [True, False, True]
+
+
+def test_identity_hash_ignores_how_the_chunk_was_parsed():
+    as_int = pd.DataFrame({'date': [20148], 'state': ['Goa'], 'district': ['North Goa'], 'pincode': [403001]})
+    as_float = as_int.astype({'pincode': 'float64'})
+    as_nullable = as_int.astype({'date': 'Int32'})
+    fingerprints = [record_fingerprints(df, 'enrolment')[0] for df in (as_int, as_float, as_nullable)]
+    assert len(set(fingerprints)) == 1
+    assert record_fingerprints(as_int, 'demographic')[0] != fingerprints[0]
+
+
+def test_large_integers_do_not_collide():
+    df = pd.DataFrame({
+        'date': [20148, 20148],
+        'state': ['Goa', 'Goa'],
+        'district': ['North Goa', 'North Goa'],
+        'pincode': np.array([2**53, 2**53 + 1], dtype='int64'),
+    })
+    fingerprints = record_fingerprints(df, 'enrolment')
+    assert fingerprints[0] != fingerprints[1]
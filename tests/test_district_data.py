@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import process_district_data
+from dates import format_day_numbers
+from process_district_data import calculate_anomaly_scores, daily_matrix, robust_anomaly_scores
+from process_real_data import AadhaarDataProcessor
+
+ENROLMENT_SHARDS = {
+    # An exact repeat, a later record for the same identity and a row without a date
+    "enrolment_a.csv": """date,state,district,pincode,age_0_5,age_5_17,age_18_greater
+01-03-2025,Bihar,Gaya,823001,2,3,1
+01-03-2025,Bihar,Gaya,823001,2,3,1
+02-03-2025,Bihar,Gaya,823001,4,0,0
+02-03-2025,Bihar,Gaya,823001,9,9,9
+,Bihar,Gaya,823001,50,50,50
+02-03-2025,Orissa,Khordha,751001,1,1,1
+""",
+    # Repeats records of the first shard under another state spelling
+    "enrolment_b.csv": """date,state,district,pincode,age_0_5,age_5_17,age_18_greater
+01-03-2025,Bihar,Gaya,823001,2,3,1
+02-03-2025,ODISHA,Khordha,751001,7,7,7
+03-03-2025,Bihar,Patna,800001,6,0,2
+""",
+}
+
+DEMOGRAPHIC_SHARDS = {
+    "demographic_a.csv": """date,state,district,pincode,demo_age_5_17,demo_age_17_
+01-03-2025,Bihar,Gaya,823001,10,20
+01-03-2025,Bihar,Gaya,823001,10,20
+""",
+}
+
+BIOMETRIC_SHARDS = {
+    "biometric_a.csv": """date,state,district,pincode,bio_age_5_17,bio_age_17_
+01-03-2025,Bihar,Gaya,823001,1,2
+04-03-2025,Bihar,Patna,800001,3,0
+""",
+}
+
+EXPECTED_ENROLLMENTS = {
+    'BIHAR|GAYA': {'enrollments': 10, 'updates': 33, 'child_enrollments': 6},
+    'ODISHA|KHORDHA': {'enrollments': 3, 'updates': 0, 'child_enrollments': 1},
+    'BIHAR|PATNA': {'enrollments': 8, 'updates': 3, 'child_enrollments': 6},
+}
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    shards = (("enrolment", ENROLMENT_SHARDS), ("demographic", DEMOGRAPHIC_SHARDS), ("biometric", BIOMETRIC_SHARDS))
+    for dataset, files in shards:
+        folder = tmp_path / f"api_data_aadhar_{dataset}" / f"api_data_aadhar_{dataset}"
+        folder.mkdir(parents=True)
+        for name, csv in files.items():
+            (folder / name).write_text(csv)
+    monkeypatch.setattr(process_district_data, 'AadhaarDataProcessor', lambda: AadhaarDataProcessor(tmp_path))
+    return AadhaarDataProcessor(tmp_path)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_raw_shards_are_cleaned_like_the_store(processor, workers):
+    from_raw, daily_from_raw = process_district_data.load_enrollment_data(workers)
+    processor.build_store()
+    from_store, daily_from_store = process_district_data.load_enrollment_data()
+
+    assert from_raw == from_store == EXPECTED_ENROLLMENTS
+    assert daily_from_raw.sort_index().to_dict() == daily_from_store.sort_index().to_dict()
+
+
+def daily_series(counts, start=20148):
+    """Daily enrolments indexed like load_enrollment_data's: {(state, district): [count per day]}"""
+    index, values = [], []
+    for (state, district), series in counts.items():
+        for offset, count in enumerate(series):
+            if count is not None:
+                index.append((state, district, start + offset))
+                values.append(count)
+    return pd.Series(values, index=pd.MultiIndex.from_tuples(index, names=['state', 'district', 'date']), dtype='int64')
+
+
+def merged_districts(*keys):
+    merged = {}
+    for state, district in keys:
+        merged.setdefault(state, {})[district] = {'enrollments': 1, 'anomaly_score': 0}
+    return merged
+
+
+def test_flat_series_scores_zero():
+    matrix = np.full((40, 3), 12.0)
+    assert not robust_anomaly_scores(matrix, window=28).any()
+
+    merged = merged_districts(('BIHAR', 'GAYA'))
+    scored = calculate_anomaly_scores(merged, daily_series({('BIHAR', 'GAYA'): [12] * 40}))
+    assert scored['BIHAR']['GAYA']['anomaly_score'] == 0
+    assert scored['BIHAR']['GAYA']['anomaly_dates'] == []
+
+
+def test_single_spike_is_flagged_on_its_date():
+    rng = np.random.default_rng(3)
+    gaya = (50 + rng.integers(-5, 6, size=40)).tolist()
+    gaya[33] = 400
+    patna = (80 + rng.integers(-5, 6, size=40)).tolist()
+
+    merged = merged_districts(('BIHAR', 'GAYA'), ('BIHAR', 'PATNA'))
+    scored = calculate_anomaly_scores(merged, daily_series({('BIHAR', 'GAYA'): gaya, ('BIHAR', 'PATNA'): patna}))
+    assert scored['BIHAR']['GAYA']['anomaly_dates'] == format_day_numbers([20148 + 33])
+    assert scored['BIHAR']['GAYA']['anomaly_score'] == 1.0
+    assert scored['BIHAR']['PATNA']['anomaly_dates'] == []
+    assert scored['BIHAR']['PATNA']['anomaly_score'] < 0.5
+
+
+def test_zero_mad_falls_back_to_mean_deviation_and_one_enrolment():
+    window = 10
+    # Median absolute deviation 0 but a few off days: scaled by the mean deviation
+    history = [20.0] * 8 + [30.0, 30.0]
+    matrix = np.array([history + [40.0]]).T
+    z = robust_anomaly_scores(matrix, window)
+    assert z[window, 0] == pytest.approx(20 / (1.2533 * 2.0))
+
+    # All-zero history: the scale never drops below one enrolment
+    matrix = np.array([[0.0] * window + [3.0]]).T
+    assert robust_anomaly_scores(matrix, window)[window, 0] == 3.0
+    assert np.isfinite(robust_anomaly_scores(np.zeros((window + 1, 1)), window)).all()
+
+
+def test_short_history_is_not_scored():
+    merged = merged_districts(('GOA', 'NORTH GOA'))
+    short = daily_series({('GOA', 'NORTH GOA'): [1, 1, 1, 1, 1, 1, 90]})
+    scored = calculate_anomaly_scores(merged, short)
+    assert scored['GOA']['NORTH GOA'] == {'enrollments': 1, 'anomaly_score': 0, 'anomaly_dates': []}
+
+
+def test_district_reporting_late_counts_zero_before_its_first_day():
+    matrix, days, columns = daily_matrix(daily_series({
+        ('BIHAR', 'GAYA'): [5, 5, 5, 5],
+        ('BIHAR', 'PATNA'): [None, None, 7, 8],
+    }))
+    assert days.tolist() == [20148, 20149, 20150, 20151]
+    assert list(columns) == [('BIHAR', 'GAYA'), ('BIHAR', 'PATNA')]
+    assert matrix[:, 1].tolist() == [0, 0, 7, 8]
+
+
+def test_aggregate_by_district_matches_hand_computed_sums():
+    df = pd.DataFrame({
+        'state': ['Bihar', 'BIHAR ', 'bihar', 'Goa', None, 'Goa'],
+        'district': ['Gaya', 'gaya', 'Patna', 'North Goa', 'Gaya', None],
+        'date': [20148, 20148, 20149, 20149, 20148, 20148],
+        'age_0_5': [1, 2, 3, 4, 100, 100],
+        'age_5_17': [10, None, 30, 40, 100, 100],
+        # age_18_greater missing entirely: counts as 0
+    })
+    totals = process_district_data.aggregate_by_district(df, 'enrolment')
+    assert totals.sort_index().to_dict('index') == {
+        ('BIHAR', 'GAYA'): {'age_0_5': 3, 'age_5_17': 10, 'age_18_greater': 0},
+        ('BIHAR', 'PATNA'): {'age_0_5': 3, 'age_5_17': 30, 'age_18_greater': 0},
+        ('GOA', 'NORTH GOA'): {'age_0_5': 4, 'age_5_17': 40, 'age_18_greater': 0},
+    }
+
+    daily = process_district_data.aggregate_by_district(df, 'enrolment', by_date=True)
+    assert daily.sum(axis=1).sort_index().to_dict() == {
+        ('BIHAR', 'GAYA', 20148): 13,
+        ('BIHAR', 'PATNA', 20149): 33,
+        ('GOA', 'NORTH GOA', 20149): 44,
+    }
+
+
+def test_merge_keeps_states_without_district_data():
+    centroids = {
+        'BIHAR': {
+            'GAYA': {'lat': 24.8, 'lng': 85.0, 'offices': 4},
+            'PATNA': {'lat': 25.6, 'lng': 85.1, 'offices': 0},
+            'NALANDA': {'lat': 25.1, 'lng': 85.4, 'offices': 2},
+        },
+        'LAKSHADWEEP': {'LAKSHADWEEP': {'lat': 10.6, 'lng': 72.6, 'offices': 1}},
+    }
+    enrollments = {
+        'BIHAR|GAYA': {'enrollments': 10, 'updates': 33, 'child_enrollments': 6},
+        'BIHAR|PATNA': {'enrollments': 8, 'updates': 3, 'child_enrollments': 6},
+        'BIHAR|NALANDA': {'enrollments': 0, 'updates': 5, 'child_enrollments': 0},
+    }
+    merged = process_district_data.merge_data(centroids, enrollments)
+    assert merged == {
+        'BIHAR': {
+            'GAYA': {'lat': 24.8, 'lng': 85.0, 'offices': 4, 'enrollments': 10, 'updates': 33,
+                     'child_enrollments': 6, 'density': 2.5, 'anomaly_score': 0},
+            'PATNA': {'lat': 25.6, 'lng': 85.1, 'offices': 0, 'enrollments': 8, 'updates': 3,
+                      'child_enrollments': 6, 'density': 0, 'anomaly_score': 0},
+        },
+        'LAKSHADWEEP': {},
+    }
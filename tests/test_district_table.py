@@ -0,0 +1,51 @@
+from district_table import DistrictTable
+
+RECORDS = [
+    {'state': 'Odisha', 'district': 'Puri', 'enrolments': 7, 'lat': 19.8, 'lng': 85.8},
+    {'state': 'Bihar', 'district': 'Patna', 'enrolments': 40, 'lat': 25.6, 'lng': 85.1},
+    {'state': 'Orissa', 'district': 'Khordha', 'enrolments': 3, 'lat': None, 'lng': None},
+    {'state': 'Bihar', 'district': 'Gaya', 'enrolments': 12, 'lat': 24.8, 'lng': 85.0},
+    {'state': 'Goa', 'district': 'North Goa', 'enrolments': 5, 'lat': 15.5, 'lng': 73.8},
+]
+
+
+def paginate(table, page_size, first=0, last=None):
+    """Walk the table the way /api/districts does, resuming after each page's last key"""
+    last = len(table) if last is None else last
+    pages, start = [], first
+    while start < last:
+        stop = min(start + page_size, last)
+        pages.append(table.rows(start, stop, ('district',)))
+        start = max(first, table.position_after(table.keys[stop - 1]))
+    return pages
+
+
+def test_rows_sort_by_canonical_state_then_district():
+    table = DistrictTable(RECORDS)
+    assert len(table) == 5
+    assert [(row['state'], row['district']) for row in table.rows(0, len(table), ('state', 'district'))] == [
+        ('Bihar', 'Gaya'), ('Bihar', 'Patna'), ('Goa', 'North Goa'), ('Odisha', 'Puri'), ('Orissa', 'Khordha'),
+    ]
+
+
+def test_cursor_pages_cover_every_row_once():
+    table = DistrictTable(RECORDS)
+    for page_size in (1, 2, 3, 10):
+        districts = [row['district'] for page in paginate(table, page_size) for row in page]
+        assert districts == ['Gaya', 'Patna', 'North Goa', 'Puri', 'Khordha']
+
+
+def test_state_slice_groups_every_spelling_of_a_state():
+    table = DistrictTable(RECORDS)
+    start, stop = table.state_slice('ORISSA')
+    assert table.state_slice('odisha') == (start, stop) == (3, 5)
+    assert [row['district'] for page in paginate(table, 1, start, stop) for row in page] == ['Puri', 'Khordha']
+    assert table.state_slice('Atlantis') is None
+
+
+def test_rows_return_only_requested_fields_with_null_coordinates():
+    table = DistrictTable(RECORDS)
+    assert table.rows(4, 5) == [
+        {'state': 'Orissa', 'district': 'Khordha', 'enrolments': 3, 'lat': None, 'lng': None},
+    ]
+    assert table.rows(0, 1, ('enrolments', 'lat')) == [{'enrolments': 12, 'lat': 24.8}]
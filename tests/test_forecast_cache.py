@@ -0,0 +1,58 @@
+from forecast_cache import ForecastCache, Forecaster, GRANULARITIES, ALL_INDIA
+from state_index import StateIndex
+
+TIME_SERIES = [
+    {'date': '2025-03-01', 'enrolments': 100},
+    {'date': '2025-03-15', 'enrolments': 120},
+    {'date': '2025-04-01', 'enrolments': 90},
+    {'date': '2025-05-02', 'enrolments': 150},
+]
+STATES = [
+    {'state': 'Bihar', 'enrolments': 300},
+    {'state': 'Odisha', 'enrolments': 160},
+]
+
+
+def make_forecaster(cache, version='v1'):
+    return Forecaster(version, TIME_SERIES, STATES, StateIndex(STATES), [], cache)
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = ForecastCache(max_entries=2)
+    cache.put(('v1', 'A', 'daily'), {'a': 1})
+    cache.put(('v1', 'B', 'daily'), {'b': 1})
+    assert cache.get(('v1', 'A', 'daily')) == {'a': 1}
+
+    cache.put(('v1', 'C', 'daily'), {'c': 1})
+    assert len(cache) == 2
+    assert cache.get(('v1', 'B', 'daily')) is None
+    assert cache.get(('v1', 'A', 'daily')) == {'a': 1}
+    assert cache.get(('v1', 'C', 'daily')) == {'c': 1}
+
+
+def test_unknown_granularities_share_the_monthly_entry():
+    cache = ForecastCache()
+    forecaster = make_forecaster(cache)
+    monthly = forecaster.forecast('Bihar', 'monthly')
+    assert forecaster.forecast('Bihar', 'weekly') is monthly
+    assert forecaster.forecast('Bihar', '') is monthly
+    assert forecaster.forecast('Bihar', 'daily') is not monthly
+    assert len(cache) == 2
+
+
+def test_state_aliases_share_one_entry():
+    cache = ForecastCache()
+    forecaster = make_forecaster(cache)
+    assert forecaster.forecast('Orissa', 'daily') is forecaster.forecast('ODISHA', 'daily')
+    assert forecaster.forecast(None, 'daily') is forecaster.forecast(ALL_INDIA, 'daily')
+    assert sorted(key[1] for key in cache.entries) == [ALL_INDIA, 'Odisha']
+
+
+def test_precompute_bounds_the_cache_and_new_versions_miss():
+    cache = ForecastCache()
+    make_forecaster(cache).precompute()
+    assert len(cache) == (len(STATES) + 1) * len(GRANULARITIES)
+
+    cached = cache.get(('v1', 'Bihar', 'monthly'))
+    assert make_forecaster(cache, 'v2').forecast('Bihar', 'monthly') is not cached
+    assert ('v2', 'Bihar', 'monthly') in cache.entries
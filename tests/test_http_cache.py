@@ -0,0 +1,89 @@
+import gzip
+
+import http_cache
+from http_cache import CompressionCache, choose_encoding, http_date, make_etag, not_modified, resource_key
+
+
+def test_resource_key_ignores_query_order():
+    assert resource_key('/api/districts', [('state', 'Goa'), ('limit', '5')]) == \
+        resource_key('/api/districts', [('limit', '5'), ('state', 'Goa')]) == '/api/districts?limit=5&state=Goa'
+    assert resource_key('/api/states', []) == '/api/states'
+
+
+def test_etag_depends_on_version_and_key():
+    etag = make_etag('v1', '/api/states')
+    assert etag.startswith('W/"v1-') and etag == make_etag('v1', '/api/states')
+    assert etag != make_etag('v2', '/api/states')
+    assert etag != make_etag('v1', '/api/states?x=1')
+
+
+def test_not_modified_compares_etags_weakly():
+    etag = make_etag('v1', '/api/states')
+    assert not_modified(etag, None, etag, 0)
+    assert not_modified(etag[2:], None, etag, 0)
+    assert not_modified(f'"other", {etag}', None, etag, 0)
+    assert not_modified('*', None, etag, 0)
+    assert not not_modified('"other"', None, etag, 0)
+    assert not not_modified(None, None, etag, 0)
+
+
+def test_if_none_match_wins_over_if_modified_since():
+    etag = make_etag('v1', '/api/states')
+    modified_at = 1_750_000_000.5
+    assert not_modified(None, http_date(modified_at), etag, modified_at)
+    assert not not_modified(None, http_date(modified_at - 60), etag, modified_at)
+    assert not not_modified(None, 'not a date', etag, modified_at)
+    assert not not_modified('"other"', http_date(modified_at), etag, modified_at)
+
+
+def test_choose_encoding(monkeypatch):
+    monkeypatch.setattr(http_cache, 'brotli', None)
+    assert choose_encoding('gzip, deflate, br') == 'gzip'
+    assert choose_encoding('GZIP;q=0.5') == 'gzip'
+    assert choose_encoding('gzip;q=0, deflate') is None
+    assert choose_encoding('identity') is None
+    assert choose_encoding(None) is None
+
+    monkeypatch.setattr(http_cache, 'brotli', object())
+    assert choose_encoding('gzip, br') == 'br'
+    assert choose_encoding('gzip, br;q=0') == 'gzip'
+
+
+def test_compression_cache_compresses_once_per_version(monkeypatch):
+    calls = []
+    real_compress = http_cache.compress
+    monkeypatch.setattr(http_cache, 'compress', lambda body, encoding, level: calls.append(level) or real_compress(body, encoding, level))
+    cache = CompressionCache()
+    cache.activate('v1')
+    body = b'{"state":"Goa"}' * 100
+
+    first = cache.compressed('v1', '/api/states', 'gzip', body)
+    assert gzip.decompress(first) == body
+    assert cache.compressed('v1', '/api/states', 'gzip', body) is first
+    assert calls == [http_cache.ON_DEMAND_LEVELS['gzip']]
+
+    # Bodies of a version that is not active are neither stored nor served
+    cache.put('v0', '/api/old', 'gzip', b'stale')
+    assert cache.get('v0', '/api/old', 'gzip') is None
+    cache.activate('v2')
+    assert len(cache) == 0 and cache.get('v1', '/api/states', 'gzip') is None
+
+
+def test_compression_cache_evicts_least_recently_used_by_size():
+    cache = CompressionCache(max_bytes=10)
+    cache.activate('v1')
+    cache.put('v1', 'a', 'gzip', b'12345')
+    cache.put('v1', 'b', 'gzip', b'12345')
+    assert cache.get('v1', 'a', 'gzip') == b'12345'
+    cache.put('v1', 'c', 'gzip', b'123')
+    assert cache.get('v1', 'b', 'gzip') is None
+    assert cache.size == 8 and len(cache) == 2
+
+
+def test_precompress_skips_small_bodies():
+    cache = CompressionCache()
+    large = b'x' * http_cache.MIN_COMPRESS_SIZE
+    cache.precompress('v1', [('/api/large', large), ('/api/small', b'{}')])
+    assert cache.version == 'v1'
+    assert gzip.decompress(cache.get('v1', '/api/large', 'gzip')) == large
+    assert cache.get('v1', '/api/small', 'gzip') is None
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from pipeline import STAGES, Stage, check_acyclic, dependencies, run_pipeline
+
+
+def make_stage(tmp_path, name, reads, writes):
+    script = tmp_path / f"{name}.py"
+    script.write_text("")
+    return Stage(name, script, inputs=[tmp_path / f for f in reads], outputs=[tmp_path / f for f in writes])
+
+
+def test_dependency_cycle_is_rejected_before_running(tmp_path):
+    stages = [
+        make_stage(tmp_path, 'a', reads=['b.json'], writes=['a.json']),
+        make_stage(tmp_path, 'b', reads=['c.json'], writes=['b.json']),
+        make_stage(tmp_path, 'c', reads=['a.json'], writes=['c.json']),
+        make_stage(tmp_path, 'd', reads=[], writes=['d.json']),
+    ]
+    with pytest.raises(ValueError, match="cycle"):
+        run_pipeline(stages)
+
+
+def test_chain_without_cycle_is_accepted(tmp_path):
+    stages = [
+        make_stage(tmp_path, 'a', reads=[], writes=['a.json']),
+        make_stage(tmp_path, 'b', reads=['a.json'], writes=['b.json']),
+        make_stage(tmp_path, 'c', reads=['a.json', 'b.json'], writes=['c.json']),
+    ]
+    check_acyclic(dependencies(stages))
+
+
+@pytest.fixture
+def pipeline_cache(tmp_path, monkeypatch):
+    import pipeline
+    monkeypatch.setattr(pipeline, 'STATE_PATH', tmp_path / 'cache' / 'pipeline.json')
+    monkeypatch.setattr(pipeline, 'LOG_DIR', tmp_path / 'cache' / 'logs')
+    monkeypatch.setattr(pipeline, 'CACHE_DIR', tmp_path / 'cache')
+
+
+def script_stage(tmp_path, name, reads, writes, body=None):
+    """A stage whose script appends its name to order.txt and writes its outputs"""
+    stage = make_stage(tmp_path, name, reads, writes)
+    stage.script.write_text(body or (
+        "from pathlib import Path\n"
+        f"with open(Path(__file__).parent / 'order.txt', 'a') as f: f.write({name!r})\n"
+        + "".join(f"(Path(__file__).parent / {w!r}).write_text('out')\n" for w in writes)
+    ))
+    return stage
+
+
+def test_stages_run_after_their_upstream_and_then_skip(tmp_path, pipeline_cache):
+    (tmp_path / 'raw.csv').write_text('a,b\n1,2\n')
+    stages = [
+        script_stage(tmp_path, 'c', reads=['b.json'], writes=['c.json']),
+        script_stage(tmp_path, 'b', reads=['a.json'], writes=['b.json']),
+        script_stage(tmp_path, 'a', reads=['raw.csv'], writes=['a.json']),
+    ]
+    results = run_pipeline(stages)
+    assert {name: status for name, (status, _) in results.items()} == {'a': 'ran', 'b': 'ran', 'c': 'ran'}
+    assert (tmp_path / 'order.txt').read_text() == 'abc'
+
+    assert {status for status, _ in run_pipeline(stages).values()} == {'skipped'}
+
+
+def test_same_size_rewrite_with_the_same_mtime_reruns(tmp_path, pipeline_cache):
+    raw = tmp_path / 'raw.csv'
+    raw.write_text('a,b\n1,2\n')
+    stages = [script_stage(tmp_path, 'a', reads=['raw.csv'], writes=['a.json'])]
+    run_pipeline(stages)
+
+    mtime = raw.stat().st_mtime_ns
+    raw.write_text('a,b\n3,4\n')
+    os.utime(raw, ns=(mtime, mtime))
+    assert run_pipeline(stages)['a'][0] == 'ran'
+
+
+def test_failed_stage_blocks_its_downstream(tmp_path, pipeline_cache):
+    stages = [
+        script_stage(tmp_path, 'a', reads=[], writes=['a.json'], body="raise SystemExit(1)\n"),
+        script_stage(tmp_path, 'b', reads=['a.json'], writes=['b.json']),
+        script_stage(tmp_path, 'c', reads=[], writes=['c.json']),
+    ]
+    results = run_pipeline(stages)
+    assert {name: status for name, (status, _) in results.items()} == {'a': 'failed', 'b': 'blocked', 'c': 'ran'}
+
+
+def test_stage_graph_only_follows_real_inputs():
+    deps = dependencies(STAGES)
+    assert deps['build_store'] == [] and deps['preprocess_geo'] == []
+    assert sorted(deps['process_real_data']) == ['build_store', 'preprocess_geo']
+    assert sorted(deps['process_district_data']) == ['build_store', 'preprocess_geo']
+    assert deps['process_urban_rural'] == ['build_store']
+    assert sorted(deps['analytics_engine']) == ['build_store', 'process_real_data']
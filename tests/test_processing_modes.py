@@ -0,0 +1,69 @@
+import pytest
+
+from process_real_data import AadhaarDataProcessor
+
+ENROLMENT_SHARDS = {
+    # An exact repeat, and a later record for the same identity with other counts
+    "enrolment_a.csv": """date,state,district,pincode,age_0_5,age_5_17,age_18_greater
+01-03-2025,Bihar,Gaya,823001,2,3,1
+01-03-2025,Bihar,Gaya,823001,2,3,1
+02-03-2025,Bihar,Gaya,823001,4,0,0
+02-03-2025,Bihar,Gaya,823001,9,9,9
+02-03-2025,Orissa,Khordha,751001,1,1,1
+03-03-2025,Goa,North Goa,403001,0,5,0
+""",
+    # Overlaps the first shard: its Gaya and Khordha records are already counted there
+    "enrolment_b.csv": """date,state,district,pincode,age_0_5,age_5_17,age_18_greater
+01-03-2025,Bihar,Gaya,823001,2,3,1
+02-03-2025,ODISHA,Khordha,751001,7,7,7
+03-03-2025,Bihar,Patna,800001,6,0,2
+04-03-2025,Goa,North Goa,403001,1,,1
+""",
+}
+
+DEMOGRAPHIC_SHARDS = {
+    "demographic_a.csv": """date,state,district,pincode,demo_age_5_17,demo_age_17_
+01-03-2025,Bihar,Gaya,823001,10,20
+01-03-2025,Bihar,Gaya,823001,10,20
+03-03-2025,Goa,North Goa,403001,3,4
+""",
+    "demographic_b.csv": """date,state,district,pincode,demo_age_5_17,demo_age_17_
+03-03-2025,Goa,North Goa,403001,3,4
+04-03-2025,Bihar,Patna,800001,5,5
+""",
+}
+
+
+@pytest.fixture
+def base_path(tmp_path):
+    for dataset, shards in (("enrolment", ENROLMENT_SHARDS), ("demographic", DEMOGRAPHIC_SHARDS)):
+        folder = tmp_path / f"api_data_aadhar_{dataset}" / f"api_data_aadhar_{dataset}"
+        folder.mkdir(parents=True)
+        for name, csv in shards.items():
+            (folder / name).write_text(csv)
+    return tmp_path
+
+
+def run(base_path, **options):
+    output = AadhaarDataProcessor(base_path).process_all(**options)
+    del output['summary']['lastUpdated']
+    return output
+
+
+@pytest.mark.parametrize("options", [
+    dict(streaming=True, chunksize=2),
+    dict(streaming=True, chunksize=2, workers=2),
+    dict(streaming=True, chunksize=3, incremental=True),
+])
+def test_streaming_and_shard_modes_match_in_memory(base_path, options):
+    expected = run(base_path)
+    assert expected['summary']['totalEnrolments'] == 6 + 4 + 3 + 5 + 8 + 2
+    assert expected['summary']['totalDemographicUpdates'] == 30 + 7 + 10
+
+    assert run(base_path, **options) == expected
+
+
+def test_incremental_rerun_reuses_cached_shards(base_path):
+    expected = run(base_path)
+    assert run(base_path, streaming=True, incremental=True) == expected
+    assert run(base_path, streaming=True, incremental=True, workers=2) == expected
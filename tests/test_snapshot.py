@@ -0,0 +1,41 @@
+import json
+import math
+
+import pytest
+
+import snapshot
+from snapshot import encode_json, static_responses
+
+CONTENT = {
+    'summary': {'ratio': math.nan, 'growth': math.inf, 'total': 12},
+    'states': [{'state': 'Goa', 'ruralRatio': -math.inf, 'values': (1.5, math.nan)}],
+    'name': 'Pondicherry → Puducherry',
+}
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_both_encoders_write_non_finite_floats_as_null(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(snapshot, 'orjson', None)
+
+    assert json.loads(encode_json(CONTENT)) == {
+        'summary': {'ratio': None, 'growth': None, 'total': 12},
+        'states': [{'state': 'Goa', 'ruralRatio': None, 'values': [1.5, None]}],
+        'name': 'Pondicherry → Puducherry',
+    }
+
+
+def test_fallback_encoder_matches_orjson_byte_for_byte(monkeypatch):
+    orjson = pytest.importorskip('orjson')
+    monkeypatch.setattr(snapshot, 'orjson', None)
+    assert encode_json(CONTENT) == orjson.dumps(CONTENT)
+
+
+def test_static_responses_encode_each_endpoint_body():
+    analytics_report = {'clustering_results': [{'cluster': 1, 'score': math.nan}]}
+    static = static_responses({'summary': {'states': 2}}, [{'state': 'Goa'}], analytics_report)
+    assert json.loads(static['stats']) == {'states': 2}
+    assert json.loads(static['clusters']) == [{'cluster': 1, 'score': None}]
+    assert json.loads(static['recommendations']) == []
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from spatial_index import DistrictSpatialIndex, haversine_km
+
+
+def random_districts(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        {'district': f'D{i}', 'lat': rng.uniform(6.0, 36.0), 'lng': rng.uniform(68.0, 97.0)}
+        for i in range(count)
+    ]
+
+
+def brute_force_nearest(records, lat, lng, k):
+    ranked = sorted(
+        (haversine_km(lat, lng, r['lat'], r['lng']), i) for i, r in enumerate(records)
+    )
+    return [(d, records[i]) for d, i in ranked[:k]]
+
+
+@pytest.mark.parametrize('cell_size', [0.25, 0.5, 2.0])
+def test_nearest_matches_brute_force(cell_size):
+    records = random_districts(300)
+    index = DistrictSpatialIndex(records, cell_size=cell_size)
+    rng = random.Random(11)
+    # Queries inside, at the edge of and well outside the indexed extent
+    queries = [(rng.uniform(0.0, 40.0), rng.uniform(60.0, 100.0)) for _ in range(40)] + [(-30.0, 150.0)]
+    for lat, lng in queries:
+        for k in (1, 5, 25):
+            assert index.nearest(lat, lng, k) == brute_force_nearest(records, lat, lng, k)
+
+
+def test_nearest_with_more_neighbours_than_districts():
+    records = random_districts(4)
+    index = DistrictSpatialIndex(records)
+    assert index.nearest(20.0, 80.0, 10) == brute_force_nearest(records, 20.0, 80.0, 10)
+    assert index.nearest(20.0, 80.0, 0) == []
+
+
+def test_within_matches_a_linear_scan():
+    records = random_districts(300)
+    index = DistrictSpatialIndex(records)
+    for box in [(20.0, 25.0, 75.0, 80.0), (6.0, 36.0, 68.0, 97.0), (-10.0, 0.0, 0.0, 10.0), (10.3, 10.4, 70.0, 95.0)]:
+        min_lat, max_lat, min_lng, max_lng = box
+        expected = [r for r in records if min_lat <= r['lat'] <= max_lat and min_lng <= r['lng'] <= max_lng]
+        assert index.within(*box) == expected
+
+
+def test_districts_without_coordinates_are_skipped():
+    records = [
+        {'district': 'Known', 'lat': 25.6, 'lng': 85.1},
+        {'district': 'Unmatched', 'lat': None, 'lng': None},
+    ]
+    index = DistrictSpatialIndex(records)
+    assert len(index) == 1
+    assert [r['district'] for _, r in index.nearest(0.0, 0.0, 5)] == ['Known']
+    assert DistrictSpatialIndex(records[1:]).within(-90, 90, -180, 180) == []
@@ -0,0 +1,26 @@
+from state_index import StateIndex, canonical_key, name_key
+
+
+def test_name_key_folds_case_spacing_and_ampersands():
+    assert name_key('  Jammu &  Kashmir ') == name_key('JAMMU AND KASHMIR') == 'jammu and kashmir'
+
+
+def test_canonical_key_resolves_dump_and_map_aliases():
+    assert canonical_key('ORISSA') == canonical_key('Odisha') == 'odisha'
+    assert canonical_key('Pondicherry') == 'puducherry'
+    assert canonical_key('NCT of Delhi') == canonical_key('delhi')
+    assert canonical_key('Andaman & Nicobar Island') == canonical_key('Andaman and Nicobar Islands')
+    assert canonical_key('Atlantis') == 'atlantis'
+
+
+def test_lookups_by_any_spelling_and_first_record_wins():
+    index = StateIndex([
+        {'state': 'Odisha', 'enrolments': 5},
+        {'state': 'Orissa', 'enrolments': 9},
+        {'state': 'Delhi', 'enrolments': 3},
+    ])
+    assert len(index) == 2
+    assert index.get('ORISSA') == {'state': 'Odisha', 'enrolments': 5}
+    assert index.get('New Delhi')['state'] == 'Delhi'
+    assert 'nct of delhi' in index and 'Goa' not in index
+    assert index.get(None) is None and index.get('') is None
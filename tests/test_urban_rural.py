@@ -0,0 +1,164 @@
+import json
+
+import pandas as pd
+
+import process_urban_rural
+from dates import parse_day_numbers
+from pincode_index import PincodeIndex, OFFICE_CLASSIFICATION
+from process_real_data import AadhaarDataProcessor
+
+PINCODE_MAPPING_CSV = """pincode,officetype,district,statename
+800001,HO,PATNA,BIHAR
+800002,BO,PATNA,BIHAR
+803101,SO,NALANDA,BIHAR
+403001,SO,NORTH GOA,GOA
+682555,BO,LAKSHADWEEP,LAKSHADWEEP
+695001,HO,THIRUVANANTHAPURAM,KERALA
+403002,BO,SOUTH GOA,Goa
+"""
+
+# Every state has data on only some of the dates, and KERALA has none
+ENROLMENT_FRAMES = [
+    """date,pincode,age_0_5,age_5_17,age_18_greater
+01-03-2025,800001,2,3,1
+01-03-2025,800002,4,,0
+15-03-2025,803101,1,1,1
+15-03-2025,999999,5,5,5
+""",
+    """date,pincode,age_0_5,age_5_17,age_18_greater
+20-03-2025,403001,7,0,0
+01-04-2025,682555,0,2,0
+01-04-2025,800002,3,3,3
+02-04-2025,403002,1,1,0
+""",
+]
+
+
+def enrolment_frames():
+    frames = []
+    for csv in ENROLMENT_FRAMES:
+        df = pd.read_csv(pd.io.common.StringIO(csv))
+        df['date'] = parse_day_numbers(df['date'])
+        frames.append(df)
+    return frames
+
+
+def make_index(tmp_path):
+    csv_path = tmp_path / 'pincode_mapping.csv'
+    csv_path.write_text(PINCODE_MAPPING_CSV)
+    return PincodeIndex.from_mapping(csv_path), csv_path
+
+
+def dict_aggregation(csv_path, frames):
+    """The per-row dict aggregation process_urban_rural used before the join"""
+    pincode_info = {}
+    for _, row in pd.read_csv(csv_path).iterrows():
+        classification = OFFICE_CLASSIFICATION.get(str(row['officetype']).strip().upper())
+        if classification:
+            pincode_info[str(row['pincode']).strip()] = {
+                'classification': classification,
+                'state': str(row['statename']).strip(),
+            }
+
+    all_india_data = {'Urban': {}, 'Rural': {}}
+    state_data = {}
+    for df in frames:
+        age_columns = [col for col in df.columns if col.startswith('age_')]
+        for _, row in df.iterrows():
+            pincode = str(row['pincode']).strip()
+            if pincode not in pincode_info:
+                continue
+            date = int(row['date'])
+            total = sum(int(row[col]) if pd.notna(row[col]) else 0 for col in age_columns)
+            classification = pincode_info[pincode]['classification']
+            state = pincode_info[pincode]['state']
+
+            all_india_data[classification][date] = all_india_data[classification].get(date, 0) + total
+            series = state_data.setdefault(state, {'Urban': {}, 'Rural': {}})[classification]
+            series[date] = series.get(date, 0) + total
+    return all_india_data, state_data
+
+
+def test_sparse_state_dates_are_not_zero_filled(tmp_path, monkeypatch):
+    pincode_index, csv_path = make_index(tmp_path)
+    monkeypatch.setattr(process_urban_rural, 'iter_enrollment_frames', lambda: iter(enrolment_frames()))
+
+    all_india_data, state_data = process_urban_rural.process_enrollment_data(pincode_index)
+    expected_all_india, expected_states = dict_aggregation(csv_path, enrolment_frames())
+
+    assert all_india_data == expected_all_india
+    assert state_data == expected_states
+    assert 'KERALA' not in state_data
+    assert process_urban_rural.format_velocity_data(state_data['GOA'])['summary']['urbanDataPoints'] == 1
+    assert state_data['Goa'] == {'Urban': {}, 'Rural': {parse_day_numbers(pd.Series(['02-04-2025']))[0]: 2}}
+
+
+def test_join_output_is_identical_to_the_dict_aggregation(tmp_path, monkeypatch):
+    pincode_index, csv_path = make_index(tmp_path)
+    monkeypatch.setattr(process_urban_rural, 'iter_enrollment_frames', lambda: iter(enrolment_frames()))
+
+    joined = process_urban_rural.combine_velocity(*process_urban_rural.process_enrollment_data(pincode_index))
+    golden = process_urban_rural.combine_velocity(*dict_aggregation(csv_path, enrolment_frames()))
+
+    assert json.dumps(joined, indent=2) == json.dumps(golden, indent=2)
+
+
+def test_index_keeps_state_names_as_spelled_in_the_mapping(tmp_path):
+    csv_path = tmp_path / 'pincode_mapping.csv'
+    csv_path.write_text("pincode,officetype,district,statename\n751001,HO,KHORDHA,ORISSA\n605001,BO,PUDUCHERRY, Pondicherry \n110001,SO,NEW DELHI,\n")
+    pincode_index = PincodeIndex.from_mapping(csv_path)
+
+    assert pincode_index.lookup(751001)['state'] == 'ORISSA'
+    assert pincode_index.lookup(605001)['state'] == 'Pondicherry'
+    assert pincode_index.lookup(110001)['state'] == 'nan'
+
+
+def test_states_without_a_name_get_no_shard():
+    velocity = {'Urban': {20148: 5, 20150: 0}, 'Rural': {20149: 2}}
+    states = {name: process_urban_rural.format_velocity_data(velocity) for name in ('BIHAR', 'nan', '')}
+    combined_output = {
+        'allIndia': process_urban_rural.format_velocity_data(velocity),
+        'states': states,
+        'stateList': sorted(states),
+    }
+    index, shards = process_urban_rural.columnar_velocity(combined_output)
+
+    assert index['stateList'] == ['BIHAR']
+    assert list(index['shards']) == ['BIHAR'] and list(shards) == ['BIHAR']
+    assert index['dates'] == ['01-03-2025', '02-03-2025', '03-03-2025']
+    assert shards['BIHAR']['urban'] == [5, None, 0] and shards['BIHAR']['rural'] == [None, 2, None]
+
+
+RAW_ENROLMENT_SHARDS = {
+    # An exact repeat, a later record for the same identity and a row without a date
+    "enrolment_a.csv": """date,state,district,pincode,age_0_5,age_5_17,age_18_greater
+01-03-2025,Bihar,Patna,800001,2,3,1
+01-03-2025,Bihar,Patna,800001,2,3,1
+15-03-2025,Bihar,Nalanda,803101,1,1,1
+15-03-2025,Bihar,Nalanda,803101,8,8,8
+,Bihar,Patna,800002,50,0,0
+""",
+    "enrolment_b.csv": """date,state,district,pincode,age_0_5,age_5_17,age_18_greater
+01-03-2025,Bihar,Patna,800001,2,3,1
+20-03-2025,Goa,North Goa,403001,7,,0
+01-04-2025,Bihar,Patna,,3,3,3
+""",
+}
+
+
+def test_raw_csvs_are_cleaned_like_the_store(tmp_path, monkeypatch, capsys):
+    pincode_index, _ = make_index(tmp_path)
+    folder = tmp_path / "api_data_aadhar_enrolment" / "api_data_aadhar_enrolment"
+    folder.mkdir(parents=True)
+    for name, csv in RAW_ENROLMENT_SHARDS.items():
+        (folder / name).write_text(csv)
+    monkeypatch.setattr(process_urban_rural, 'AadhaarDataProcessor', lambda: AadhaarDataProcessor(tmp_path))
+
+    from_raw = process_urban_rural.process_enrollment_data(pincode_index)
+    assert "Left out 1 enrolment records without a valid date" in capsys.readouterr().out
+    AadhaarDataProcessor(tmp_path).build_store()
+    from_store = process_urban_rural.process_enrollment_data(pincode_index)
+    assert "Left out 1 enrolment records without a valid date" in capsys.readouterr().out
+
+    assert from_raw == from_store
+    assert from_store[0] == {'Urban': {20148: 6, 20162: 3, 20167: 7}, 'Rural': {}}